@@ -262,3 +262,31 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Histórico de preços (api_price particionada por mês)
+# Pontos brutos mais antigos que isso viram agregados diários (PriceRollup)
+PRICE_RAW_RETENTION_DAYS = env.int("PRICE_RAW_RETENTION_DAYS", default=180)
+# Agregados diários mais antigos que isso viram agregados semanais
+PRICE_DAILY_ROLLUP_RETENTION_DAYS = env.int(
+    "PRICE_DAILY_ROLLUP_RETENTION_DAYS",
+    default=730,
+)
+# Quantos meses futuros de partições manter criados
+PRICE_PARTITIONS_AHEAD = env.int("PRICE_PARTITIONS_AHEAD", default=3)
+
+# Recrawl adaptativo (comando crawl_due)
+# Intervalo inicial entre visitas de uma URL e os limites da adaptação
+CRAWL_DEFAULT_INTERVAL_HOURS = env.float(
+    "CRAWL_DEFAULT_INTERVAL_HOURS",
+    default=24.0,
+)
+CRAWL_MIN_INTERVAL_HOURS = env.float("CRAWL_MIN_INTERVAL_HOURS", default=6.0)
+CRAWL_MAX_INTERVAL_HOURS = env.float("CRAWL_MAX_INTERVAL_HOURS", default=24.0 * 14)
+# Preço mudou: intervalo * SHRINK; estável: intervalo * GROWTH
+CRAWL_INTERVAL_SHRINK = 0.5
+CRAWL_INTERVAL_GROWTH = 1.5
+# Orçamento por loja: páginas abertas ao mesmo tempo e requisições por minuto
+CRAWL_STORE_BUDGETS = {
+    "kabum": {"concurrency": 4, "requests_per_minute": 60},
+    "terabyte": {"concurrency": 4, "requests_per_minute": 120},
+    "amazon": {"concurrency": 2, "requests_per_minute": 30},
+}
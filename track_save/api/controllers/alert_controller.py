@@ -1,14 +1,21 @@
 import os
+from datetime import timedelta
 
 from api.entities.alert import Alert
-from api.entities.price import Price
+from api.entities.alert import AlertNotification
+from api.entities.alert import AlertNotificationStatus
+from api.entities.price import LatestPrice
 from api.entities.product import Product
 from api.entities.product import ProductStore
 from api.entities.user import User
 from django.core.mail import send_mail
+from django.db import transaction
 from django.db.models import F
+from django.db.models import Min
+from django.db.models import Q
 from django.db.models import Sum
 from django.template.loader import render_to_string
+from django.utils import timezone
 
 
 def create_alert(
@@ -30,7 +37,7 @@ def create_alert(
         expires_at=expires_at,
         created_at=created_at,
     )
-    send_alert_triggered_email(alert)
+    evaluate_alerts(alert_ids=[alert.pk])
     return alert
 
 
@@ -84,25 +91,13 @@ def get_alert_by_only_user_id(user_id: int) -> dict:
     )
 
     alert_list = []
+    product_stores = first_product_stores([alert.product_id for alert in alerts])
 
     for alert in alerts:
-        try:
-            product_store = ProductStore.objects.filter(product=alert.product).first()
-            latest_price = None
-            url_product = None
-            if product_store:
-                latest_price = (
-                    Price.objects.filter(product_store=product_store)
-                    .order_by("-collection_date")
-                    .first()
-                )
-                url_product = product_store.url_product
-
-            current_price = str(latest_price.value) if latest_price else None
-
-        except Exception as e:
-            print(f"Erro ao buscar preço: {e}")
-            current_price = None
+        product_store = product_stores.get(alert.product_id)
+        latest_price = get_latest_price(product_store)
+        url_product = product_store.url_product if product_store else None
+        current_price = str(latest_price.value) if latest_price else None
 
         alert_list.append(
             {
@@ -149,7 +144,7 @@ def get_alert_stats(user_id):
         or 0
     )
 
-    last_updated = Price.objects.latest("collection_date").collection_date
+    last_updated = LatestPrice.objects.latest("collection_date").collection_date
 
     return {
         "active_alerts": active_count,
@@ -183,6 +178,9 @@ def update_alert(alert_id: int, **data) -> Alert:
         a.user = User.objects.get(id=data["user_id"])
     if "product_id" in data:
         a.product = Product.objects.get(id=data["product_id"])
+    if "desired_price" in data or "product_id" in data:
+        # novo alvo: o próximo preço que o atingir deve notificar de novo
+        a.last_notified_price = None
     if "desired_price" in data:
         a.desired_price = data["desired_price"]
     if "is_active" in data:
@@ -193,7 +191,7 @@ def update_alert(alert_id: int, **data) -> Alert:
         a.created_at = data["created_at"]
 
     a.save()
-    send_alert_triggered_email(a)
+    evaluate_alerts(alert_ids=[a.pk])
     return a
 
 
@@ -203,32 +201,45 @@ def delete_alert(alert_id: int) -> str:
     return "Alert removido com sucesso."
 
 
-def send_alert_triggered_email(alert):
-    user = alert.user
-    product = alert.product
-    # Busca ProductStore e preço atual
-    product_store = ProductStore.objects.filter(product=product).first()
-    url_product = product_store.url_product if product_store else None
-    latest_price = None
-    if product_store:
-        latest_price = (
-            Price.objects.filter(product_store=product_store)
-            .order_by("-collection_date")
-            .first()
-        )
-    current_price = str(latest_price.value) if latest_price else None
+def first_product_stores(product_ids):
+    """
+    Retorna {product_id: ProductStore} com o primeiro ProductStore de cada produto,
+    já trazendo o preço atual (LatestPrice) na mesma consulta.
+    """
+    product_stores = (
+        ProductStore.objects.filter(product_id__in=product_ids)
+        .select_related("latest_price")
+        .order_by("product_id", "id")
+        .distinct("product_id")
+    )
+    return {ps.product_id: ps for ps in product_stores}
+
+
+def get_latest_price(product_store):
+    """
+    Retorna o LatestPrice do ProductStore, ou None se não houver preço.
+    """
+    if product_store is None:
+        return None
+    try:
+        return product_store.latest_price
+    except LatestPrice.DoesNotExist:
+        return None
 
-    # Só envia email se o preço atual for menor ou igual ao desejado
-    if latest_price is None or float(latest_price.value) > float(alert.desired_price):
-        return  # Não envia email
 
+def deliver_alert_email(alert, current_price, product_store):
+    """
+    Envia o email de alerta disparado (chamado pelo worker de notificações).
+    """
+    user = alert.user
+    product = alert.product
     context = {
         "user_name": user.name or user.email,
         "product_name": product.name,
         "product_image": product.image_url,
         "desired_price": str(alert.desired_price),
-        "current_price": current_price,
-        "url_product": url_product,
+        "current_price": str(current_price),
+        "url_product": product_store.url_product if product_store else None,
         "expires_at": alert.expires_at.isoformat(),
     }
     html_message = render_to_string("emails/alert_triggered.html", context)
@@ -245,15 +256,9 @@ def send_preference_alert_triggered_email(alert):
     user = alert.user
     product = alert.product
     # Busca ProductStore e preço atual
-    product_store = ProductStore.objects.filter(product=product).first()
+    product_store = first_product_stores([product.id]).get(product.id)
     url_product = product_store.url_product if product_store else None
-    latest_price = None
-    if product_store:
-        latest_price = (
-            Price.objects.filter(product_store=product_store)
-            .order_by("-collection_date")
-            .first()
-        )
+    latest_price = get_latest_price(product_store)
     current_price = str(latest_price.value) if latest_price else None
 
     # Só envia email se o preço atual for menor ou igual ao desejado
@@ -277,3 +282,128 @@ def send_preference_alert_triggered_email(alert):
         from_email=os.getenv("DEFAULT_FROM_EMAIL"),
         html_message=html_message,
     )
+
+
+ALERT_NOTIFICATION_BATCH_SIZE = 100
+ALERT_NOTIFICATION_MAX_ATTEMPTS = 5
+# Espera antes de tentar de novo uma notificação que falhou; dobra a cada falha
+ALERT_NOTIFICATION_RETRY_DELAY = timedelta(minutes=1)
+
+
+def evaluate_alerts(product_store_ids=None, alert_ids=None):
+    """
+    Encontra, numa consulta só, os alertas disparados pelos preços atuais
+    (LatestPrice) dos ProductStores informados: ativos, não expirados e com
+    desired_price >= menor preço atual. Alertas já notificados por um preço
+    igual ou menor são ignorados. Os disparos entram na fila AlertNotification;
+    o envio de email fica com o comando send_alert_notifications.
+    Retorna as notificações criadas.
+    """
+    if product_store_ids is not None and not product_store_ids:
+        return []
+
+    price_filter = Q(product__productstore__latest_price__isnull=False)
+    if product_store_ids is not None:
+        price_filter &= Q(product__productstore__id__in=product_store_ids)
+
+    triggered = Alert.objects.filter(
+        is_active=True,
+        expires_at__gte=timezone.localdate(),
+    )
+    if alert_ids is not None:
+        triggered = triggered.filter(id__in=alert_ids)
+    if product_store_ids is not None:
+        triggered = triggered.filter(product__productstore__id__in=product_store_ids)
+
+    triggered = (
+        triggered.annotate(
+            trigger_price=Min(
+                "product__productstore__latest_price__value",
+                filter=price_filter,
+            ),
+        )
+        .filter(trigger_price__lte=F("desired_price"))
+        .filter(
+            Q(last_notified_price__isnull=True)
+            | Q(last_notified_price__gt=F("trigger_price")),
+        )
+        .values_list("id", "trigger_price")
+    )
+    trigger_prices = dict(triggered)
+    if not trigger_prices:
+        return []
+
+    with transaction.atomic():
+        # Trava os alertas para não enfileirar o mesmo disparo duas vezes
+        alerts = list(
+            Alert.objects.select_for_update().filter(id__in=trigger_prices.keys()),
+        )
+        notifications = []
+        for alert in alerts:
+            price = trigger_prices[alert.id]
+            last = alert.last_notified_price
+            if last is not None and last <= price:
+                continue
+            alert.last_notified_price = price
+            notifications.append(AlertNotification(alert=alert, price=price))
+
+        Alert.objects.bulk_update(
+            [notification.alert for notification in notifications],
+            ["last_notified_price"],
+        )
+        return AlertNotification.objects.bulk_create(notifications)
+
+
+def process_alert_notifications(
+    batch_size=ALERT_NOTIFICATION_BATCH_SIZE,
+    max_attempts=ALERT_NOTIFICATION_MAX_ATTEMPTS,
+):
+    """
+    Envia um lote de notificações pendentes. Vários workers podem rodar juntos:
+    cada lote é reservado com SELECT ... FOR UPDATE SKIP LOCKED.
+    Uma notificação que falha só volta a ser tentada depois de
+    ALERT_NOTIFICATION_RETRY_DELAY * 2^(tentativas - 1) (next_attempt_at).
+    Retorna (enviadas, falhas).
+    """
+    sent = failed = 0
+    now = timezone.now()
+    with transaction.atomic():
+        notifications = list(
+            AlertNotification.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("alert__user", "alert__product")
+            .filter(status=AlertNotificationStatus.PENDING)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by("id")[:batch_size],
+        )
+        product_stores = first_product_stores(
+            [notification.alert.product_id for notification in notifications],
+        )
+
+        for notification in notifications:
+            notification.attempts += 1
+            try:
+                deliver_alert_email(
+                    notification.alert,
+                    notification.price,
+                    product_stores.get(notification.alert.product_id),
+                )
+            except Exception as e:  # noqa: BLE001
+                notification.last_error = str(e)
+                if notification.attempts >= max_attempts:
+                    notification.status = AlertNotificationStatus.FAILED
+                else:
+                    backoff = 2 ** (notification.attempts - 1)
+                    notification.next_attempt_at = (
+                        now + ALERT_NOTIFICATION_RETRY_DELAY * backoff
+                    )
+                failed += 1
+            else:
+                notification.status = AlertNotificationStatus.SENT
+                notification.sent_at = timezone.now()
+                sent += 1
+
+        AlertNotification.objects.bulk_update(
+            notifications,
+            ["status", "attempts", "last_error", "sent_at", "next_attempt_at"],
+        )
+    return sent, failed
@@ -0,0 +1,209 @@
+from datetime import timedelta
+from decimal import Decimal
+from decimal import InvalidOperation
+
+from api.entities.crawl import CrawlFrontier
+from api.entities.crawl import CrawlRun
+from api.entities.crawl import CrawlRunStatus
+from api.entities.product import ProductStore
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+CRAWL_LEASE_MINUTES = 30
+DEFAULT_CRAWL_BUDGET = {"concurrency": 1, "requests_per_minute": 30}
+
+FRONTIER_VISIT_FIELDS = [
+    "next_due_at",
+    "interval_hours",
+    "last_value",
+    "last_crawled_at",
+    "last_changed_at",
+    "crawl_count",
+    "change_count",
+    "failures",
+    "leased_until",
+    "product_store",
+]
+
+
+def crawl_budget(store):
+    """
+    Orçamento da loja em settings.CRAWL_STORE_BUDGETS:
+    {"concurrency", "requests_per_minute"}.
+    """
+    return {**DEFAULT_CRAWL_BUDGET, **settings.CRAWL_STORE_BUDGETS.get(store, {})}
+
+
+def seed_frontier(store, entries):
+    """
+    Acrescenta URLs à fronteira da loja, devidas imediatamente. URLs já
+    presentes são mantidas como estão. entries: iterável de
+    (url, category, product_store_id ou None).
+    """
+    now = timezone.now()
+    frontier = [
+        CrawlFrontier(
+            store=store,
+            url=url,
+            category=category,
+            product_store_id=product_store_id,
+            next_due_at=now,
+            interval_hours=settings.CRAWL_DEFAULT_INTERVAL_HOURS,
+        )
+        for url, category, product_store_id in entries
+    ]
+    CrawlFrontier.objects.bulk_create(
+        frontier,
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+    return len(frontier)
+
+
+def seed_from_product_stores(store):
+    """
+    Semeia a fronteira com os produtos já cadastrados na loja (Store.name é
+    comparado sem diferenciar maiúsculas com a chave do scraper).
+    """
+    return seed_frontier(
+        store,
+        ProductStore.objects.filter(store__name__iexact=store)
+        .values_list("url_product", "product__category", "pk")
+        .iterator(),
+    )
+
+
+def start_run(store, category=""):
+    """
+    Retoma a última execução não concluída da loja/categoria ou inicia uma nova.
+    Retorna (run, retomada).
+    """
+    run = (
+        CrawlRun.objects.filter(
+            store=store,
+            category=category,
+            status__in=[CrawlRunStatus.RUNNING, CrawlRunStatus.INTERRUPTED],
+        )
+        .order_by("-started_at")
+        .first()
+    )
+    if run is not None:
+        run.status = CrawlRunStatus.RUNNING
+        run.save(update_fields=["status", "updated_at"])
+        return run, True
+    run = CrawlRun.objects.create(
+        store=store,
+        category=category,
+        due_before=timezone.now(),
+    )
+    return run, False
+
+
+def finish_run(run, status=CrawlRunStatus.FINISHED):
+    run.status = status
+    if status == CrawlRunStatus.FINISHED:
+        run.finished_at = timezone.now()
+    run.save(update_fields=["status", "finished_at", "updated_at"])
+    return run
+
+
+def claim_due(run, limit, lease_minutes=CRAWL_LEASE_MINUTES):
+    """
+    Reserva até `limit` URLs devidas da execução (as mais atrasadas primeiro).
+    Vários processos podem rodar juntos: a reserva usa SELECT ... FOR UPDATE
+    SKIP LOCKED e marca leased_until, que expira se o processo morrer.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        entries = CrawlFrontier.objects.select_for_update(skip_locked=True).filter(
+            Q(leased_until__isnull=True) | Q(leased_until__lt=now),
+            store=run.store,
+            next_due_at__lte=run.due_before,
+        )
+        if run.category:
+            entries = entries.filter(category=run.category)
+        entries = list(entries.order_by("next_due_at", "id")[:limit])
+        for entry in entries:
+            entry.leased_until = now + timedelta(minutes=lease_minutes)
+        CrawlFrontier.objects.bulk_update(entries, ["leased_until"])
+    return entries
+
+
+def parse_value(value):
+    try:
+        return Decimal(str(value)).quantize(Decimal("0.01"))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def next_interval(entry, changed):
+    """
+    Intervalo adaptativo: encurta quando o preço mudou e alonga quando ficou
+    igual, dentro de [CRAWL_MIN_INTERVAL_HOURS, CRAWL_MAX_INTERVAL_HOURS].
+    """
+    factor = (
+        settings.CRAWL_INTERVAL_SHRINK if changed else settings.CRAWL_INTERVAL_GROWTH
+    )
+    return min(
+        max(entry.interval_hours * factor, settings.CRAWL_MIN_INTERVAL_HOURS),
+        settings.CRAWL_MAX_INTERVAL_HOURS,
+    )
+
+
+def record_visits(run, entries, results, product_store_ids=None):
+    """
+    Atualiza a fronteira com o resultado de um lote e grava o checkpoint.
+
+    results: {url: produto coletado} (URLs ausentes contam como falha).
+    product_store_ids: {url: ProductStore.id} vindo da ingestão, opcional.
+    Retorna (visitadas, mudaram, falharam) do lote.
+    """
+    now = timezone.now()
+    product_store_ids = product_store_ids or {}
+    changed = failed = 0
+    for entry in entries:
+        entry.leased_until = None
+        value = parse_value((results.get(entry.url) or {}).get("value"))
+        if value is None:
+            # Falha: tenta de novo com backoff exponencial, sem mexer no intervalo
+            entry.failures += 1
+            retry_hours = min(
+                settings.CRAWL_MIN_INTERVAL_HOURS * 2 ** (entry.failures - 1),
+                settings.CRAWL_MAX_INTERVAL_HOURS,
+            )
+            entry.next_due_at = now + timedelta(hours=retry_hours)
+            failed += 1
+            continue
+
+        price_changed = entry.last_value is not None and value != entry.last_value
+        if entry.last_value is not None:
+            entry.interval_hours = next_interval(entry, price_changed)
+        if price_changed:
+            entry.change_count += 1
+            entry.last_changed_at = now
+            changed += 1
+        entry.last_value = value
+        entry.last_crawled_at = now
+        entry.crawl_count += 1
+        entry.failures = 0
+        entry.next_due_at = now + timedelta(hours=entry.interval_hours)
+        entry.product_store_id = (
+            product_store_ids.get(entry.url) or entry.product_store_id
+        )
+
+    with transaction.atomic():
+        CrawlFrontier.objects.bulk_update(entries, FRONTIER_VISIT_FIELDS)
+        run.visited += len(entries)
+        run.changed += changed
+        run.failed += failed
+        run.checkpoint = {
+            "batches": run.checkpoint.get("batches", 0) + 1,
+            "last_url": entries[-1].url if entries else None,
+            "at": now.isoformat(),
+        }
+        run.save(
+            update_fields=["visited", "changed", "failed", "checkpoint", "updated_at"],
+        )
+    return len(entries), changed, failed
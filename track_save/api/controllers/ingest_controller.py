@@ -0,0 +1,419 @@
+import hashlib
+from decimal import Decimal
+from decimal import InvalidOperation
+
+from api.controllers.price_controller import as_collection_date
+from api.controllers.price_controller import create_prices_bulk
+from api.controllers.product_controller import SPECIFIC_DETAILS_FIELDS
+from api.controllers.product_controller import record_fingerprint
+from api.controllers.product_controller import refresh_search_vocabulary
+from api.controllers.product_controller import update_search_vector
+from api.entities.product import Product
+from api.entities.product import ProductCategory
+from api.entities.product import ProductStore
+from api.entities.product import Store
+from api.enums.category_specs import CATEGORY_SPECS
+from django.db import DatabaseError
+from django.db import transaction
+from django.utils import timezone
+
+# Campos obrigatórios de um registro coletado; as specs vêm de CATEGORY_SPECS
+REQUIRED_FIELDS = ("name", "image_url", "brand", "store", "url")
+
+BULK_BATCH_SIZE = 1000
+# Price.value é numeric(8, 2): valores que arredondam para 10^6 estouram a coluna
+MAX_PRICE_VALUE = Decimal(10) ** 6 - Decimal("0.005")
+
+
+def product_hash(name, url):
+    """
+    Mesmo hash usado por create_product (SHA-256 de nome + url).
+    """
+    return hashlib.sha256(f"{name}{url}".encode()).hexdigest()
+
+
+def normalize_record(record):
+    """
+    Valida e normaliza um registro coletado (mesmo formato aceito por create_product).
+    """
+    category = (record.get("category") or "").lower()
+    if category not in ProductCategory.values:
+        msg = "Categoria inválida."
+        raise ValueError(msg)
+
+    if not all(record.get(field) for field in REQUIRED_FIELDS):
+        msg = "Todos os campos obrigatórios devem ser informados."
+        raise ValueError(msg)
+
+    try:
+        value = Decimal(str(record.get("value")))
+    except InvalidOperation:
+        msg = f"Valor inválido: {record.get('value')}"
+        raise ValueError(msg) from None
+    if not value.is_finite() or abs(value) >= MAX_PRICE_VALUE:
+        msg = f"Valor fora do intervalo aceito: {record.get('value')}"
+        raise ValueError(msg)
+
+    collection_date = record.get("collection_date")
+    row = {
+        "hash": product_hash(record["name"], record["url"]),
+        "name": record["name"],
+        "category": category,
+        "description": record.get("description") or "",
+        "image_url": record["image_url"],
+        "brand": record["brand"],
+        "store": record["store"],
+        "url": record["url"],
+        "available": bool(record.get("available")),
+        "rating": float(record.get("rating") or 0.0),
+        "value": value,
+        "collection_date": (
+            as_collection_date(collection_date)
+            if collection_date
+            else timezone.localdate()
+        ),
+        "specs": {key: record.get(key) for key in CATEGORY_SPECS[category]},
+    }
+    row["fingerprint"] = record_fingerprint(
+        row["hash"],
+        row["store"],
+        row["url"],
+        row["value"],
+        row["available"],
+        row["rating"],
+        row["specs"],
+    )
+    return row
+
+
+def skip_unchanged(rows):
+    """
+    Marca como "unchanged" os registros cuja impressão digital é a gravada no
+    ProductStore pela última ingestão, com uma única consulta, e devolve os
+    demais. Nota, disponibilidade e preço atuais também são conferidos, porque
+    podem ter sido alterados por outro caminho (sweep de preços, API).
+    """
+    by_fingerprint = {row["fingerprint"]: row for _, row in rows}
+    current = {}
+    for fingerprint, ps_id, product_id, available, rating, value in (
+        ProductStore.objects.filter(fingerprint__in=by_fingerprint).values_list(
+            "fingerprint",
+            "pk",
+            "product_id",
+            "available",
+            "rating",
+            "latest_price__value",
+        )
+    ):
+        row = by_fingerprint[fingerprint]
+        if (
+            available == row["available"]
+            and rating == row["rating"]
+            and value == row["value"]
+        ):
+            current[fingerprint] = (ps_id, product_id)
+
+    remaining = []
+    for outcome, row in rows:
+        match = current.get(row["fingerprint"])
+        if match is None:
+            remaining.append((outcome, row))
+            continue
+        outcome["status"] = "unchanged"
+        outcome["product_store_id"], outcome["product_id"] = match
+    return remaining
+
+
+def ingest_products(records):
+    """
+    Versão em lote de create_product para resultados de scraping.
+
+    Registros idênticos à última ingestão (mesma impressão digital) são
+    resolvidos por skip_unchanged sem abrir transação; os demais são gravados
+    por write_rows. Um registro recusado pelo banco vira "error" sem derrubar
+    o resto do lote.
+
+    Retorna um resultado por registro, na ordem recebida:
+    {"index", "status": created|updated|unchanged|error, "product_id",
+     "product_store_id", "price_created", "error"}
+    """
+    outcomes = []
+    rows = []
+    for index, record in enumerate(records):
+        outcome = {
+            "index": index,
+            "status": None,
+            "product_id": None,
+            "product_store_id": None,
+            "price_created": False,
+            "error": None,
+        }
+        outcomes.append(outcome)
+        try:
+            rows.append((outcome, normalize_record(record)))
+        except (ValueError, TypeError) as e:
+            outcome["status"] = "error"
+            outcome["error"] = str(e)
+
+    rows = skip_unchanged(rows) if rows else rows
+    if not rows:
+        return outcomes
+
+    try:
+        with transaction.atomic():
+            new_product_ids = write_rows(rows)
+    except DatabaseError:
+        # Algum registro passou pela validação mas foi recusado pelo banco
+        # (ex.: texto maior que a coluna): grava um por vez, cada um no seu
+        # savepoint, para que só ele vire "error"
+        new_product_ids = []
+        for outcome, row in rows:
+            try:
+                with transaction.atomic():
+                    new_product_ids += write_rows([(outcome, row)])
+            except DatabaseError as e:
+                outcome.update(
+                    status="error",
+                    product_id=None,
+                    product_store_id=None,
+                    price_created=False,
+                    error=str(e),
+                )
+
+    if new_product_ids:
+        update_search_vector(new_product_ids)
+        refresh_search_vocabulary()
+
+    return outcomes
+
+
+def write_rows(rows):  # noqa: C901, PLR0912, PLR0915
+    """
+    Grava registros já normalizados e preenche os resultados de cada um.
+
+    Produtos existentes são resolvidos por hash numa única consulta; Product,
+    specs e ProductStore são gravados com bulk_create/bulk_update e os preços
+    seguem por create_prices_bulk (COPY), que só insere um Price quando o
+    valor mudou. Retorna os ids dos produtos criados. Deve rodar numa
+    transação.
+    """
+    # ====== Lojas ======
+    stores = {
+        store.name: store
+        for store in Store.objects.filter(name__in={row["store"] for _, row in rows})
+    }
+    valid_rows = []
+    for outcome, row in rows:
+        if row["store"] not in stores:
+            outcome["status"] = "error"
+            outcome["error"] = f"Loja '{row['store']}' não encontrada."
+            continue
+        valid_rows.append((outcome, row))
+    rows = valid_rows
+
+    # ====== Produtos (resolvidos por hash) ======
+    products = Product.objects.in_bulk(
+        {row["hash"] for _, row in rows},
+        field_name="hash",
+    )
+    new_products = {}
+    for _, row in rows:
+        if row["hash"] not in products and row["hash"] not in new_products:
+            new_products[row["hash"]] = (
+                Product(
+                    hash=row["hash"],
+                    name=row["name"],
+                    category=row["category"],
+                    description=row["description"],
+                    image_url=row["image_url"],
+                    brand=row["brand"],
+                ),
+                row,
+            )
+
+    Product.objects.bulk_create(
+        [product for product, _ in new_products.values()],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    # ====== Specs dos produtos novos, uma inserção por categoria ======
+    specs_by_category = {}
+    for product, row in new_products.values():
+        model, _ = SPECIFIC_DETAILS_FIELDS[row["category"]]
+        specs_by_category.setdefault(model, []).append(
+            model(prod=product, **row["specs"]),
+        )
+    for model, specs in specs_by_category.items():
+        model.objects.bulk_create(specs, batch_size=BULK_BATCH_SIZE)
+
+    products.update({key: product for key, (product, _) in new_products.items()})
+
+    # ====== ProductStore ======
+    product_stores = {
+        (ps.product_id, ps.url_product): ps
+        for ps in ProductStore.objects.filter(
+            product_id__in=[product.pk for product in products.values()],
+            url_product__in={row["url"] for _, row in rows},
+        )
+    }
+    new_product_stores = {}
+    changed_product_stores = {}
+    dirty_product_stores = {}
+    for _, row in rows:
+        product = products[row["hash"]]
+        key = (product.pk, row["url"])
+        ps = product_stores.get(key) or new_product_stores.get(key)
+        if ps is None:
+            new_product_stores[key] = ProductStore(
+                product=product,
+                store=stores[row["store"]],
+                url_product=row["url"],
+                available=row["available"],
+                rating=row["rating"],
+                fingerprint=row["fingerprint"],
+            )
+            continue
+        if ps.available != row["available"] or ps.rating != row["rating"]:
+            ps.available = row["available"]
+            ps.rating = row["rating"]
+            if ps.pk:
+                changed_product_stores[ps.pk] = ps
+                dirty_product_stores[ps.pk] = ps
+        if ps.fingerprint != row["fingerprint"]:
+            ps.fingerprint = row["fingerprint"]
+            if ps.pk:
+                dirty_product_stores[ps.pk] = ps
+
+    ProductStore.objects.bulk_create(
+        new_product_stores.values(),
+        batch_size=BULK_BATCH_SIZE,
+    )
+    ProductStore.objects.bulk_update(
+        dirty_product_stores.values(),
+        ["available", "rating", "fingerprint"],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    product_stores.update(new_product_stores)
+
+    # ====== Preços: COPY + inserção só dos valores que mudaram ======
+    inserted = set(
+        create_prices_bulk(
+            (
+                product_stores[(products[row["hash"]].pk, row["url"])].pk,
+                row["value"],
+                row["collection_date"],
+            )
+            for _, row in rows
+        ),
+    )
+
+    for outcome, row in rows:
+        product = products[row["hash"]]
+        ps = product_stores[(product.pk, row["url"])]
+
+        outcome["product_id"] = product.pk
+        outcome["product_store_id"] = ps.pk
+        outcome["price_created"] = (
+            ps.pk,
+            row["value"],
+            row["collection_date"],
+        ) in inserted
+        if row["hash"] in new_products:
+            outcome["status"] = "created"
+        elif ps.pk in changed_product_stores or outcome["price_created"]:
+            outcome["status"] = "updated"
+        else:
+            outcome["status"] = "unchanged"
+
+    return [product.pk for product, _ in new_products.values()]
+
+
+def summarize_outcomes(outcomes):
+    summary = {"created": 0, "updated": 0, "unchanged": 0, "error": 0}
+    for outcome in outcomes:
+        summary[outcome["status"]] += 1
+    summary["prices_created"] = sum(outcome["price_created"] for outcome in outcomes)
+    return summary
+
+
+def sweep_prices(store_name, records):
+    """
+    Atualização só de preço a partir dos cards da listagem de uma loja.
+
+    Cada registro {"url", "name", "value", "collection_date"?} é resolvido contra
+    ProductStore.url_product e, se não achar, pelo hash (nome + url) do produto.
+    Os conhecidos recebem o preço via create_prices_bulk; os demais voltam em
+    "unknown" para o scraper abrir a página de detalhe e cadastrar.
+    """
+    store = Store.objects.filter(name=store_name).first()
+    if store is None:
+        msg = f"Loja '{store_name}' não encontrada."
+        raise ValueError(msg)
+
+    rows = []
+    errors = []
+    for index, record in enumerate(records):
+        if not record.get("url"):
+            errors.append({"index": index, "error": "url é obrigatória."})
+            continue
+        try:
+            value = Decimal(str(record.get("value")))
+        except InvalidOperation:
+            errors.append(
+                {"index": index, "error": f"Valor inválido: {record.get('value')}"},
+            )
+            continue
+        try:
+            collection_date = record.get("collection_date")
+            rows.append(
+                {
+                    "url": record["url"],
+                    "name": record.get("name") or "",
+                    "value": value,
+                    "collection_date": (
+                        as_collection_date(collection_date)
+                        if collection_date
+                        else timezone.localdate()
+                    ),
+                },
+            )
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+
+    with transaction.atomic():
+        product_stores = dict(
+            ProductStore.objects.filter(
+                store=store,
+                url_product__in={row["url"] for row in rows},
+            ).values_list("url_product", "pk"),
+        )
+
+        missing = {
+            product_hash(row["name"], row["url"]): row["url"]
+            for row in rows
+            if row["url"] not in product_stores and row["name"]
+        }
+        if missing:
+            for hash_value, ps_id in ProductStore.objects.filter(
+                store=store,
+                product__hash__in=missing,
+            ).values_list("product__hash", "pk"):
+                product_stores[missing[hash_value]] = ps_id
+
+        known = [row for row in rows if row["url"] in product_stores]
+        inserted = create_prices_bulk(
+            (product_stores[row["url"]], row["value"], row["collection_date"])
+            for row in known
+        )
+
+    return {
+        "received": len(records),
+        "matched": len(known),
+        "prices_created": len(inserted),
+        "unknown": list(
+            dict.fromkeys(
+                row["url"] for row in rows if row["url"] not in product_stores
+            ),
+        ),
+        "errors": errors,
+    }
@@ -2,7 +2,7 @@ import os
 
 from api.controllers.user_controller import get_user_by_id
 from api.entities.preference import Preference
-from api.entities.price import Price
+from api.entities.price import LatestPrice
 from api.entities.product import Product
 from api.entities.product import ProductStore
 from django.core.mail import send_mail
@@ -51,19 +51,20 @@ def check_and_send_preference_alerts(preference):
     )
     for product in preference.build.all():
         total_orcamento = float(preference.orcamento)
-        product_store = ProductStore.objects.filter(product=product).first()
+        product_store = (
+            ProductStore.objects.filter(product=product)
+            .select_related("latest_price")
+            .first()
+        )
         if not product_store:
             continue
 
         if product.brand.lower() not in marcas_preferencia:
             continue
 
-        latest_price = (
-            Price.objects.filter(product_store=product_store)
-            .order_by("-collection_date")
-            .first()
-        )
-        if not latest_price:
+        try:
+            latest_price = product_store.latest_price
+        except LatestPrice.DoesNotExist:
             continue
 
         if float(latest_price.value) <= float(preference.orcamento):
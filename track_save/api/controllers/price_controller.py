@@ -1,8 +1,83 @@
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+
+from api.controllers.alert_controller import evaluate_alerts
+from api.controllers.price_series_controller import bump_price_series_version
 from api.entities.favorite import Favorite
+from api.entities.price import LatestPrice
 from api.entities.price import Price
+from api.entities.price import PriceRollup
 from api.entities.product import ProductStore
-from api.controllers.alert_controller import send_alert_triggered_email
-from api.entities.alert import Alert
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+
+def as_collection_date(value):
+    """
+    Normaliza collection_date (date, datetime ou string ISO) para date.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def record_latest_price(product_store, value, collection_date):
+    """
+    Atualiza o preço atual (LatestPrice) do ProductStore após a inserção de um Price.
+    Coletas mais antigas que a registrada não alteram o preço atual.
+    Deve ser chamada dentro da mesma transação que cria o Price.
+    """
+    new_value = Decimal(str(value))
+    collection_date = as_collection_date(collection_date)
+
+    latest, created = LatestPrice.objects.select_for_update().get_or_create(
+        product_store=product_store,
+        defaults={"value": new_value, "collection_date": collection_date},
+    )
+    if created or collection_date < latest.collection_date:
+        return latest
+
+    if latest.value != new_value:
+        latest.previous_value = latest.value
+        latest.value = new_value
+    latest.collection_date = collection_date
+    latest.save(update_fields=["value", "previous_value", "collection_date"])
+    return latest
+
+
+def refresh_latest_price(product_store_id):
+    """
+    Recalcula o LatestPrice de um ProductStore a partir do histórico.
+    Usado quando um Price existente é alterado ou removido.
+    previous_value segue a regra de record_latest_price: o último valor
+    diferente do atual, não simplesmente a linha anterior.
+    """
+    history = Price.objects.filter(product_store_id=product_store_id).order_by(
+        "-collection_date",
+        "-id",
+    )
+    current = history.values("value", "collection_date").first()
+    if current is None:
+        LatestPrice.objects.filter(product_store_id=product_store_id).delete()
+        return None
+
+    latest, _ = LatestPrice.objects.update_or_create(
+        product_store_id=product_store_id,
+        defaults={
+            "value": current["value"],
+            "collection_date": current["collection_date"],
+            "previous_value": history.exclude(value=current["value"])
+            .values_list("value", flat=True)
+            .first(),
+        },
+    )
+    return latest
 
 
 def create_price(product_store_id, value, collection_date):
@@ -18,18 +93,119 @@ def create_price(product_store_id, value, collection_date):
         )
 
     ps = ProductStore.objects.get(id=product_store_id)
-    price = Price.objects.create(
-        product_store=ps, value=value, collection_date=collection_date
-    )
-
-    # Envia email de alerta para todos os alertas ativos desse produto
-    alerts = Alert.objects.filter(product=ps.product, is_active=True)
-    for alert in alerts:
-        send_alert_triggered_email(alert)
+    with transaction.atomic():
+        price = Price.objects.create(
+            product_store=ps, value=value, collection_date=collection_date
+        )
+        record_latest_price(ps, value, collection_date)
+        bump_price_series_version([ps.pk])
+        # Enfileira os alertas disparados pelo novo preço (envio em background)
+        evaluate_alerts([ps.pk])
 
     return price
 
 
+def create_prices_bulk(rows):
+    """
+    Acrescenta preços ao histórico em lote, via COPY para uma tabela temporária.
+
+    rows: iterável de (product_store_id, value, collection_date).
+    Só entram em api_price os valores que mudaram em relação ao preço atual
+    (LatestPrice) ou à linha anterior do mesmo ProductStore no lote; o LatestPrice
+    é atualizado na mesma transação. Retorna as linhas inseridas como
+    (product_store_id, value, collection_date).
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        # ON COMMIT DROP só vale no commit da transação externa: com
+        # ATOMIC_REQUESTS (ou vários lotes na mesma transação) as tabelas da
+        # chamada anterior ainda existem
+        cursor.execute("DROP TABLE IF EXISTS price_staging, price_changed")
+        cursor.execute(
+            """
+            CREATE TEMP TABLE price_staging (
+                seq bigserial,
+                product_store_id bigint NOT NULL,
+                value numeric(8, 2) NOT NULL,
+                collection_date date NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+        with cursor.copy(
+            "COPY price_staging (product_store_id, value, collection_date) FROM STDIN"
+        ) as copy:
+            for product_store_id, value, collection_date in rows:
+                copy.write_row(
+                    (
+                        product_store_id,
+                        Decimal(str(value)),
+                        as_collection_date(collection_date),
+                    )
+                )
+
+        # Linhas cujo valor difere do anterior (no lote ou no preço atual)
+        cursor.execute(
+            """
+            CREATE TEMP TABLE price_changed ON COMMIT DROP AS
+            SELECT s.seq, s.product_store_id, s.value, s.collection_date, s.prev
+            FROM (
+                SELECT st.*,
+                       LAG(st.value) OVER (
+                           PARTITION BY st.product_store_id
+                           ORDER BY st.collection_date, st.seq
+                       ) AS prev
+                FROM price_staging st
+            ) s
+            LEFT JOIN api_latestprice lp ON lp.product_store_id = s.product_store_id
+            WHERE s.value IS DISTINCT FROM COALESCE(s.prev, lp.value)
+            """
+        )
+        cursor.execute(
+            """
+            INSERT INTO api_price (product_store_id, value, collection_date)
+            SELECT product_store_id, value, collection_date
+            FROM price_changed
+            ORDER BY product_store_id, collection_date, seq
+            RETURNING product_store_id, value, collection_date
+            """
+        )
+        inserted = cursor.fetchall()
+
+        # Mesma regra de record_latest_price: a coleta mais nova do lote avança a
+        # data mesmo sem mudança de valor; coletas mais antigas não alteram o
+        # atual. previous_value vem da última mudança (price_changed)
+        cursor.execute(
+            """
+            INSERT INTO api_latestprice
+                (product_store_id, value, previous_value, collection_date)
+            SELECT newest.product_store_id, newest.value, changed.prev,
+                   newest.collection_date
+            FROM (
+                SELECT DISTINCT ON (product_store_id)
+                       product_store_id, value, collection_date
+                FROM price_staging
+                ORDER BY product_store_id, collection_date DESC, seq DESC
+            ) newest
+            LEFT JOIN (
+                SELECT DISTINCT ON (product_store_id) product_store_id, prev
+                FROM price_changed
+                ORDER BY product_store_id, collection_date DESC, seq DESC
+            ) changed USING (product_store_id)
+            ON CONFLICT (product_store_id) DO UPDATE
+            SET previous_value = CASE
+                    WHEN EXCLUDED.value IS DISTINCT FROM api_latestprice.value
+                    THEN COALESCE(EXCLUDED.previous_value, api_latestprice.value)
+                    ELSE api_latestprice.previous_value
+                END,
+                value = EXCLUDED.value,
+                collection_date = EXCLUDED.collection_date
+            WHERE EXCLUDED.collection_date >= api_latestprice.collection_date
+            """
+        )
+        bump_price_series_version({row[0] for row in inserted})
+        evaluate_alerts({row[0] for row in inserted})
+    return inserted
+
+
 def get_all_prices():
     """
     Retorna uma lista de dicts com todos os Prices.
@@ -62,17 +238,152 @@ def get_price_by_id(price_id):
 
 def get_price_by_ps(ps_id):
     """
-    Retorna uma lista dos prices que possuem o mesmo product store
+    Retorna uma lista dos prices que possuem o mesmo product store.
+    Períodos já agregados (fora da retenção de pontos brutos) vêm de PriceRollup,
+    com value = média e os campos extras granularity/min_value/max_value.
     """
-    lst = [
+    rollups = [
+        {
+            "product_store": r.product_store_id,
+            "value": str(r.avg_value),
+            "collection_date": r.bucket_start.isoformat(),
+            "granularity": r.granularity,
+            "min_value": str(r.min_value),
+            "max_value": str(r.max_value),
+        }
+        for r in PriceRollup.objects.filter(product_store=ps_id).order_by(
+            "bucket_start",
+        )
+    ]
+    raw = [
         {
-            "product_store": p.product_store.id,
+            "product_store": p.product_store_id,
             "value": str(p.value),
             "collection_date": p.collection_date.isoformat(),
         }
         for p in Price.objects.filter(product_store=ps_id).order_by("collection_date")
     ]
-    return lst
+    return sorted(rollups + raw, key=lambda item: item["collection_date"])
+
+
+def ensure_price_partitions(months_ahead=None):
+    """
+    Garante as partições mensais de api_price do mês atual até months_ahead à frente.
+    """
+    if months_ahead is None:
+        months_ahead = settings.PRICE_PARTITIONS_AHEAD
+
+    first = timezone.localdate().replace(day=1)
+    months = []
+    for offset in range(months_ahead + 1):
+        year, month = divmod(first.month - 1 + offset, 12)
+        months.append(first.replace(year=first.year + year, month=month + 1))
+
+    with connection.cursor() as cursor:
+        for month in months:
+            cursor.execute("SELECT api_price_ensure_partition(%s)", [month])
+    return months
+
+
+def merge_rollup_sql(source_sql):
+    """
+    INSERT em api_pricerollup que soma o agregado a um bucket já existente.
+    """
+    return f"""
+        INSERT INTO api_pricerollup (
+            product_store_id, granularity, bucket_start,
+            min_value, avg_value, max_value, sample_count
+        )
+        {source_sql}
+        ON CONFLICT (product_store_id, granularity, bucket_start) DO UPDATE
+        SET min_value = LEAST(api_pricerollup.min_value, EXCLUDED.min_value),
+            max_value = GREATEST(api_pricerollup.max_value, EXCLUDED.max_value),
+            avg_value = round(
+                (api_pricerollup.avg_value * api_pricerollup.sample_count
+                 + EXCLUDED.avg_value * EXCLUDED.sample_count)
+                / (api_pricerollup.sample_count + EXCLUDED.sample_count),
+                2
+            ),
+            sample_count = api_pricerollup.sample_count + EXCLUDED.sample_count
+    """  # noqa: S608
+
+
+def rollup_prices(raw_retention_days=None, daily_retention_days=None):
+    """
+    Aplica a retenção do histórico de preços:
+      - pontos brutos mais antigos que raw_retention_days viram agregados diários
+        e saem de api_price (partições mensais inteiras são descartadas com DROP);
+      - agregados diários mais antigos que daily_retention_days viram semanais.
+    O preço atual (LatestPrice) não é afetado.
+    """
+    if raw_retention_days is None:
+        raw_retention_days = settings.PRICE_RAW_RETENTION_DAYS
+    if daily_retention_days is None:
+        daily_retention_days = settings.PRICE_DAILY_ROLLUP_RETENTION_DAYS
+
+    today = timezone.localdate()
+    raw_cutoff = today - timedelta(days=raw_retention_days)
+    daily_cutoff = today - timedelta(days=daily_retention_days)
+    stats = {"daily_buckets": 0, "weekly_buckets": 0, "dropped_partitions": []}
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            merge_rollup_sql(
+                """
+                SELECT product_store_id, 'day', collection_date,
+                       min(value), round(avg(value), 2), max(value), count(*)
+                FROM api_price
+                WHERE collection_date < %s
+                GROUP BY product_store_id, collection_date
+                """
+            ),
+            [raw_cutoff],
+        )
+        stats["daily_buckets"] = cursor.rowcount
+
+        # Partições mensais totalmente anteriores ao corte saem inteiras
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'api_price'
+              AND child.relname ~ '^api_price_p[0-9]{6}$'
+            """
+        )
+        for (partition,) in cursor.fetchall():
+            start = datetime.strptime(partition[-6:], "%Y%m").date()  # noqa: DTZ007
+            end = (start + timedelta(days=32)).replace(day=1)
+            if end <= raw_cutoff:
+                cursor.execute(f'DROP TABLE "{partition}"')
+                stats["dropped_partitions"].append(partition)
+        cursor.execute("DELETE FROM api_price WHERE collection_date < %s", [raw_cutoff])
+
+        cursor.execute(
+            merge_rollup_sql(
+                """
+                SELECT product_store_id, 'week',
+                       date_trunc('week', bucket_start)::date,
+                       min(min_value),
+                       round(sum(avg_value * sample_count) / sum(sample_count), 2),
+                       max(max_value),
+                       sum(sample_count)
+                FROM api_pricerollup
+                WHERE granularity = 'day' AND bucket_start < %s
+                GROUP BY product_store_id, date_trunc('week', bucket_start)
+                """
+            ),
+            [daily_cutoff],
+        )
+        stats["weekly_buckets"] = cursor.rowcount
+        cursor.execute(
+            "DELETE FROM api_pricerollup WHERE granularity = 'day' AND bucket_start < %s",
+            [daily_cutoff],
+        )
+        bump_price_series_version()
+
+    return stats
 
 
 def update_price(price_id, **data):
@@ -84,6 +395,7 @@ def update_price(price_id, **data):
       ProductStore.DoesNotExist: se product_store_id inválido.
     """
     p = Price.objects.get(id=price_id)
+    old_product_store_id = p.product_store_id
 
     if "product_store_id" in data:
         p.product_store = ProductStore.objects.get(id=data["product_store_id"])
@@ -92,7 +404,14 @@ def update_price(price_id, **data):
     if "collection_date" in data:
         p.collection_date = data["collection_date"]
 
-    p.save()
+    with transaction.atomic():
+        p.save()
+        # O preço alterado pode ser (ou deixar de ser) o preço atual
+        refresh_latest_price(p.product_store_id)
+        if old_product_store_id != p.product_store_id:
+            refresh_latest_price(old_product_store_id)
+        bump_price_series_version([p.product_store_id, old_product_store_id])
+        evaluate_alerts([p.product_store_id])
     return p
 
 
@@ -105,7 +424,10 @@ def delete_price(price_id):
       mensagem de confirmação.
     """
     p = Price.objects.get(id=price_id)
-    p.delete()
+    with transaction.atomic():
+        p.delete()
+        refresh_latest_price(p.product_store_id)
+        bump_price_series_version([p.product_store_id])
     return "Price excluído com sucesso."
 
 
@@ -0,0 +1,250 @@
+import math
+import time
+from datetime import timedelta
+
+from api.entities.price import LatestPrice
+from django.core.cache import cache
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+SERIES_METHODS = ("bucket", "lttb")
+SERIES_DEFAULT_POINTS = 200
+SERIES_MIN_POINTS = 3
+SERIES_MAX_POINTS = 2000
+# invalidado por versão a cada novo preço e pelo LatestPrice lido do banco
+SERIES_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Pontos brutos + agregados (PriceRollup) no mesmo formato: (dia, mín, máx, soma, n)
+SERIES_SOURCE_SQL = """
+    SELECT product_store_id, collection_date AS day,
+           value AS min_value, value AS max_value, value AS total, 1 AS n
+    FROM api_price
+    WHERE product_store_id = ANY(%(ids)s)
+      AND collection_date BETWEEN %(start)s AND %(end)s
+    UNION ALL
+    SELECT product_store_id, bucket_start,
+           min_value, max_value, avg_value * sample_count, sample_count
+    FROM api_pricerollup
+    WHERE product_store_id = ANY(%(ids)s)
+      AND bucket_start BETWEEN %(start)s AND %(end)s
+"""
+
+
+# Versão global: invalida todas as séries (ex.: após rollup_prices)
+GLOBAL_VERSION_KEY = "price_series:version:all"
+
+
+def version_key(product_store_id):
+    return f"price_series:version:{product_store_id}"
+
+
+def bump_price_series_version(product_store_ids=None):
+    """
+    Invalida as séries em cache dos ProductStores após o commit de novos preços.
+    Sem ids, invalida todas.
+    """
+    if product_store_ids is None:
+        keys = {GLOBAL_VERSION_KEY: time.time_ns()}
+    else:
+        keys = {version_key(ps_id): time.time_ns() for ps_id in set(product_store_ids)}
+    if keys:
+        transaction.on_commit(lambda: cache.set_many(keys, None))
+
+
+def latest_price_marker(product_store_ids):
+    """
+    Preço e data atuais (LatestPrice) dos ProductStores, lidos do banco: entram
+    na chave do cache para que preços gravados por outros processos (worker de
+    jobs, crawl_due, ingest_store_results) invalidem a série mesmo quando o
+    bump de versão não chega a este processo (cache local por processo).
+    """
+    latest = LatestPrice.objects.filter(
+        product_store_id__in=product_store_ids,
+    ).order_by("product_store_id")
+    return ",".join(
+        f"{ps_id}={value}@{collection_date:%Y%m%d}"
+        for ps_id, value, collection_date in latest.values_list(
+            "product_store_id",
+            "value",
+            "collection_date",
+        )
+    )
+
+
+def history_start(product_store_ids):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT LEAST(
+                (SELECT min(collection_date) FROM api_price
+                 WHERE product_store_id = ANY(%(ids)s)),
+                (SELECT min(bucket_start) FROM api_pricerollup
+                 WHERE product_store_id = ANY(%(ids)s))
+            )
+            """,
+            {"ids": product_store_ids},
+        )
+        return cursor.fetchone()[0]
+
+
+def bucket_series(product_store_ids, start, end, points):
+    """
+    Agrega no banco em `points` intervalos iguais (mín/máx/média ponderada).
+    """
+    width = max(1, math.ceil(((end - start).days + 1) / points))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT product_store_id,
+                   (day - %(start)s) / %(width)s AS bucket,
+                   min(min_value), max(max_value), sum(total) / sum(n)
+            FROM ({SERIES_SOURCE_SQL}) source
+            GROUP BY product_store_id, bucket
+            ORDER BY product_store_id, bucket
+            """,  # noqa: S608
+            {"ids": product_store_ids, "start": start, "end": end, "width": width},
+        )
+        rows = cursor.fetchall()
+
+    series = {
+        ps_id: {"t": [], "min": [], "max": [], "avg": []}
+        for ps_id in product_store_ids
+    }
+    for ps_id, bucket, min_value, max_value, avg_value in rows:
+        columns = series[ps_id]
+        columns["t"].append((start + timedelta(days=bucket * width)).isoformat())
+        columns["min"].append(float(min_value))
+        columns["max"].append(float(max_value))
+        columns["avg"].append(round(float(avg_value), 2))
+    return series
+
+
+def lttb(xs, ys, threshold):
+    """
+    Largest-Triangle-Three-Buckets: reduz a série para `threshold` pontos
+    preservando a forma visual (picos e vales).
+    """
+    size = len(xs)
+    if threshold >= size:
+        return list(range(size))
+
+    selected = [0]
+    every = (size - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # média do próximo bucket
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, size)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        # ponto do bucket atual que forma o maior triângulo com a e a média seguinte
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(
+                (xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]),
+            )
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+
+    selected.append(size - 1)
+    return selected
+
+
+def lttb_series(product_store_ids, start, end, points):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT product_store_id, day, sum(total) / sum(n)
+            FROM ({SERIES_SOURCE_SQL}) source
+            GROUP BY product_store_id, day
+            ORDER BY product_store_id, day
+            """,  # noqa: S608
+            {"ids": product_store_ids, "start": start, "end": end},
+        )
+        rows = cursor.fetchall()
+
+    raw = {ps_id: ([], []) for ps_id in product_store_ids}
+    for ps_id, day, value in rows:
+        raw[ps_id][0].append(day)
+        raw[ps_id][1].append(float(value))
+
+    series = {}
+    for ps_id, (days, values) in raw.items():
+        xs = [day.toordinal() for day in days]
+        keep = lttb(xs, values, points)
+        series[ps_id] = {
+            "t": [days[i].isoformat() for i in keep],
+            "value": [round(values[i], 2) for i in keep],
+        }
+    return series
+
+
+def get_price_series(
+    product_store_ids,
+    start=None,
+    end=None,
+    points=SERIES_DEFAULT_POINTS,
+    method="bucket",
+):
+    """
+    Série de preços reduzida para gráficos, com arrays por coluna:
+      bucket → {"t", "min", "max", "avg"}; lttb → {"t", "value"}.
+    Une pontos brutos e agregados (PriceRollup) e fica em cache até
+    chegar um novo preço para algum dos ProductStores (bump de versão ou
+    mudança no LatestPrice, que vale também para gravações de outros processos).
+    """
+    product_store_ids = sorted({int(ps_id) for ps_id in product_store_ids})
+    if not product_store_ids:
+        msg = "Informe ao menos um product_store."
+        raise ValueError(msg)
+    if method not in SERIES_METHODS:
+        msg = f"method deve ser um de: {', '.join(SERIES_METHODS)}."
+        raise ValueError(msg)
+    if not SERIES_MIN_POINTS <= points <= SERIES_MAX_POINTS:
+        msg = f"points deve estar entre {SERIES_MIN_POINTS} e {SERIES_MAX_POINTS}."
+        raise ValueError(msg)
+
+    end = end or timezone.localdate()
+
+    version_keys = [GLOBAL_VERSION_KEY] + [
+        version_key(ps_id) for ps_id in product_store_ids
+    ]
+    versions = cache.get_many(version_keys)
+    cache_key = "price_series:{}:{}:{}:{}:{}:{}:{}".format(
+        ",".join(map(str, product_store_ids)),
+        ",".join(str(versions.get(key, 0)) for key in version_keys),
+        latest_price_marker(product_store_ids),
+        start,
+        end,
+        points,
+        method,
+    )
+    result = cache.get(cache_key)
+    if result is not None:
+        return result
+
+    start = start or history_start(product_store_ids) or end
+    if start > end:
+        msg = "start deve ser anterior a end."
+        raise ValueError(msg)
+
+    build = bucket_series if method == "bucket" else lttb_series
+    series = build(product_store_ids, start, end, points)
+
+    result = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "points": points,
+        "method": method,
+        "series": [
+            {"product_store": ps_id, **series[ps_id]} for ps_id in product_store_ids
+        ],
+    }
+    cache.set(cache_key, result, SERIES_CACHE_TIMEOUT)
+    return result
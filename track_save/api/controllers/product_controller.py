@@ -1,8 +1,16 @@
+import base64
+import binascii
 import hashlib
+import json
 import re
 from decimal import Decimal
+from itertools import batched
 
+from api.controllers.alert_controller import evaluate_alerts
+from api.controllers.price_controller import record_latest_price
+from api.controllers.price_series_controller import bump_price_series_version
 from api.entities.favorite import Favorite
+from api.entities.price import LatestPrice
 from api.entities.price import Price
 from api.entities.product import Computer
 from api.entities.product import Cpu
@@ -23,6 +31,7 @@ from django.apps import apps
 from django.contrib.postgres.search import SearchQuery
 from django.contrib.postgres.search import SearchRank
 from django.contrib.postgres.search import SearchVector
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import connection
 from django.db import transaction
@@ -37,6 +46,28 @@ from django.db.models import Value
 from django.db.models import When
 
 
+def product_search_vector():
+    """
+    Expressão do tsvector persistido em Product.search_vector.
+    O nome pesa mais (A) que a descrição (B) no ranking.
+    """
+    return SearchVector("name", weight="A", config="portuguese") + SearchVector(
+        "description",
+        weight="B",
+        config="portuguese",
+    )
+
+
+def update_search_vector(product_ids):
+    """
+    Recalcula o search_vector dos produtos informados.
+    Deve ser chamada sempre que nome ou descrição forem gravados.
+    """
+    Product.objects.filter(pk__in=product_ids).update(
+        search_vector=product_search_vector(),
+    )
+
+
 def search_products_with_reputation(filters):  # noqa: C901
     """
     Busca produtos aplicando filtros de produto + reputação de loja.
@@ -184,6 +215,37 @@ def delete_store(name):
     return f"{count} loja(s) com nome '{name}' foram deletadas com sucesso."
 
 
+def record_fingerprint(  # noqa: PLR0913
+    product_hash,
+    store,
+    url,
+    value,
+    available,
+    rating,
+    specs,
+):
+    """
+    Impressão digital estável de um registro coletado: produto, loja, url,
+    preço, disponibilidade, nota e specs. Fica gravada em ProductStore para
+    que uma coleta idêntica à anterior seja reconhecida com uma única consulta.
+    """
+    payload = json.dumps(
+        [
+            product_hash,
+            store,
+            url,
+            f"{Decimal(str(value)):.2f}",
+            bool(available),
+            float(rating or 0.0),
+            specs,
+        ],
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
 def create_product(  # noqa: C901, PLR0912, PLR0913, PLR0915
     name,
     category,
@@ -215,6 +277,32 @@ def create_product(  # noqa: C901, PLR0912, PLR0913, PLR0915
     base = f"{name}{url}"
     digest = hashlib.sha256(base.encode("utf-8")).hexdigest()
 
+    # Coleta idêntica à última gravada: nada a fazer (uma consulta só). Nota,
+    # disponibilidade e preço atual são conferidos porque podem ter mudado
+    # por outro caminho depois dela.
+    new_value = Decimal(str(value))
+    fingerprint = record_fingerprint(
+        digest,
+        store,
+        url,
+        new_value,
+        available,
+        rating,
+        payload,
+    )
+    unchanged = (
+        ProductStore.objects.select_related("product")
+        .filter(
+            fingerprint=fingerprint,
+            available=bool(available),
+            rating=float(rating or 0.0),
+            latest_price__value=new_value,
+        )
+        .first()
+    )
+    if unchanged is not None:
+        return unchanged.product
+
     with transaction.atomic():
         product, created = Product.objects.get_or_create(
             hash=digest,
@@ -261,6 +349,9 @@ def create_product(  # noqa: C901, PLR0912, PLR0913, PLR0915
                     msg = f"Categoria não suportada: {category}"
                     raise ValueError(msg)
 
+            update_search_vector([product.pk])
+            refresh_search_vocabulary()
+
         # Verifica se a loja existe
         try:
             store = Store.objects.get(name=store)
@@ -275,30 +366,30 @@ def create_product(  # noqa: C901, PLR0912, PLR0913, PLR0915
                 "store": store,
                 "available": available,
                 "rating": rating,
+                "fingerprint": fingerprint,
             },
         )
 
         # Se o produto já existe na loja, atualiza o campo 'available' e 'rating'  # noqa: E501
         if not ps_created:
-            changed = False
+            update_fields = []
 
             if product_store.available != available:
                 product_store.available = available
-                changed = True
+                update_fields.append("available")
 
             if product_store.rating != rating:
                 product_store.rating = rating
-                changed = True
+                update_fields.append("rating")
 
-            if changed:
-                product_store.save(update_fields=["available", "rating"])
+            if product_store.fingerprint != fingerprint:
+                product_store.fingerprint = fingerprint
+                update_fields.append("fingerprint")
 
-        new_value = Decimal(str(value))
-        last_price = (
-            Price.objects.filter(product_store=product_store)
-            .order_by("-collection_date", "-id")
-            .first()
-        )
+            if update_fields:
+                product_store.save(update_fields=update_fields)
+
+        last_price = LatestPrice.objects.filter(product_store=product_store).first()
 
         # Se não houver preço anterior ou o novo valor for diferente, cria um novo registro de preço  # noqa: E501
         if not last_price or last_price.value != new_value:
@@ -307,163 +398,263 @@ def create_product(  # noqa: C901, PLR0912, PLR0913, PLR0915
                 value=new_value,
                 collection_date=spec_fields.get("collection_date"),
             )
+            record_latest_price(
+                product_store,
+                new_value,
+                spec_fields.get("collection_date"),
+            )
+            bump_price_series_version([product_store.pk])
+            # Enfileira os alertas disparados pelo novo preço (envio em background)
+            evaluate_alerts([product_store.pk])
 
     return product
 
 
-def get_specific_details(product):  # noqa: PLR0911
-    try:
-        match product.category:
-            case "computer":
-                p = Computer.objects.get(prod=product)
-                return {
-                    "is_notebook": p.is_notebook,
-                    "motherboard": p.motherboard,
-                    "cpu": p.cpu,
-                    "ram": p.ram,
-                    "storage": p.storage,
-                    "gpu": p.gpu,
-                    "inches": p.inches,
-                    "panel_type": p.panel_type,
-                    "resolution": p.resolution,
-                    "refresh_rate": p.refresh_rate,
-                    "color_support": p.color_support,
-                    "output": p.output,
-                }
-            case "gpu":
-                p = Gpu.objects.get(prod=product)
-                return {
-                    "model": p.model,
-                    "vram": p.vram,
-                    "chipset": p.chipset,
-                    "max_resolution": p.max_resolution,
-                    "output": p.output,
-                    "tech_support": p.tech_support,
-                }
-            case "keyboard":
-                p = Keyboard.objects.get(prod=product)
-                return {
-                    "model": p.model,
-                    "key_type": p.key_type,
-                    "layout": p.layout,
-                    "connectivity": p.connectivity,
-                    "dimension": p.dimension,
-                }
-            case "cpu":
-                p = Cpu.objects.get(prod=product)
-                return {
-                    "model": p.model,
-                    "integrated_video": p.integrated_video,
-                    "socket": p.socket,
-                    "core_number": p.core_number,
-                    "thread_number": p.thread_number,
-                    "frequency": p.frequency,
-                    "mem_speed": p.mem_speed,
-                }
-            case "mouse":
-                p = Mouse.objects.get(prod=product)
-                return {
-                    "model": p.model,
-                    "dpi": p.dpi,
-                    "connectivity": p.connectivity,
-                    "color": p.color,
-                }
-            case "monitor":
-                p = Monitor.objects.get(prod=product)
-                return {
-                    "model": p.model,
-                    "inches": p.inches,
-                    "panel_type": p.panel_type,
-                    "proportion": p.proportion,
-                    "resolution": p.resolution,
-                    "refresh_rate": p.refresh_rate,
-                    "color_support": p.color_support,
-                    "output": p.output,
-                }
-            case "ram":
-                p = Ram.objects.get(prod=product)
-                return {
-                    "model": p.model,
-                    "capacity": p.capacity,
-                    "ddr": p.ddr,
-                    "speed": p.speed,
-                }
-            case "storage":
-                p = Storage.objects.get(prod=product)
-                return {
-                    "capacity": p.capacity_gb,
-                    "storage_type": p.storage_type,
-                    "interface": p.interface,
-                    "form_factor": p.form_factor,
-                    "read_speed": p.read_speed,
-                    "write_speed": p.write_speed,
-                }
-            case "motherboard":
-                p = Motherboard.objects.get(prod=product)
-                return {
-                    "model": p.model,
-                    "socket": p.socket,
-                    "chipset": p.chipset,
-                    "form_type": p.form_type,
-                    "max_ram_capacity": p.max_ram_capacity,
-                    "ram_type": p.ram_type,
-                    "ram_slots": p.ram_slots,
-                    "pcie_slots": p.pcie_slots,
-                    "sata_ports": p.sata_ports,
-                    "m2_slot": p.m2_slot,
-                }
-            case _:
-                return {}
-    except (
-        Computer.DoesNotExist,
-        Gpu.DoesNotExist,
-        Keyboard.DoesNotExist,
-        Cpu.DoesNotExist,
-        Mouse.DoesNotExist,
-        Monitor.DoesNotExist,
-        Ram.DoesNotExist,
-        Storage.DoesNotExist,
-        Motherboard.DoesNotExist,
-    ):
-        return {}
-
-
-def fallback_simples_por_sql(search_text: str, permitir_relaxamento: bool = True):
+def load_latest_prices(product_ids):
     """
-    Busca produtos por similaridade textual + filtros extraídos implicitamente (categoria, marca, tipo, preço).
-    Agora com categorias, marcas e tipos extraídos dinamicamente do banco.
+    Retorna {product_id: LatestPrice} com o preço mais recente entre as lojas
+    de cada produto, usando uma única consulta.
     """
+    latest_prices = (
+        LatestPrice.objects.filter(product_store__product_id__in=product_ids)
+        .select_related("product_store__store")
+        .order_by("product_store__product_id", "-collection_date", "-id")
+        .distinct("product_store__product_id")
+    )
+    return {latest.product_store.product_id: latest for latest in latest_prices}
 
-    texto = search_text.lower()
-    palavras = re.findall(r"\w+", texto)
-    if not palavras:
-        return []
 
-    # ====== Dados válidos extraídos dinamicamente ======
-    CATEGORIAS_VALIDAS = set(
-        Product.objects.values_list("category", flat=True).distinct(),
-    )
-    MARCAS_VALIDAS = set(
-        Product.objects.values_list("brand", flat=True).distinct(),
-    )
-    MARCAS_VALIDAS = set(Product.objects.values_list("brand", flat=True).distinct())
-    TIPOS_VALIDOS = set(
+# Campos de saída de cada tabela de especificação: {categoria: (Model, {chave: atributo})}
+SPECIFIC_DETAILS_FIELDS = {
+    "computer": (
+        Computer,
+        {
+            "is_notebook": "is_notebook",
+            "motherboard": "motherboard",
+            "cpu": "cpu",
+            "ram": "ram",
+            "storage": "storage",
+            "gpu": "gpu",
+            "inches": "inches",
+            "panel_type": "panel_type",
+            "resolution": "resolution",
+            "refresh_rate": "refresh_rate",
+            "color_support": "color_support",
+            "output": "output",
+        },
+    ),
+    "gpu": (
+        Gpu,
+        {
+            "model": "model",
+            "vram": "vram",
+            "chipset": "chipset",
+            "max_resolution": "max_resolution",
+            "output": "output",
+            "tech_support": "tech_support",
+        },
+    ),
+    "keyboard": (
+        Keyboard,
+        {
+            "model": "model",
+            "key_type": "key_type",
+            "layout": "layout",
+            "connectivity": "connectivity",
+            "dimension": "dimension",
+        },
+    ),
+    "cpu": (
+        Cpu,
+        {
+            "model": "model",
+            "integrated_video": "integrated_video",
+            "socket": "socket",
+            "core_number": "core_number",
+            "thread_number": "thread_number",
+            "frequency": "frequency",
+            "mem_speed": "mem_speed",
+        },
+    ),
+    "mouse": (
+        Mouse,
+        {
+            "model": "model",
+            "dpi": "dpi",
+            "connectivity": "connectivity",
+            "color": "color",
+        },
+    ),
+    "monitor": (
+        Monitor,
+        {
+            "model": "model",
+            "inches": "inches",
+            "panel_type": "panel_type",
+            "proportion": "proportion",
+            "resolution": "resolution",
+            "refresh_rate": "refresh_rate",
+            "color_support": "color_support",
+            "output": "output",
+        },
+    ),
+    "ram": (
+        Ram,
+        {
+            "model": "model",
+            "capacity": "capacity",
+            "ddr": "ddr",
+            "speed": "speed",
+        },
+    ),
+    "storage": (
+        Storage,
+        {
+            "capacity": "capacity_gb",
+            "storage_type": "storage_type",
+            "interface": "interface",
+            "form_factor": "form_factor",
+            "read_speed": "read_speed",
+            "write_speed": "write_speed",
+        },
+    ),
+    "motherboard": (
+        Motherboard,
+        {
+            "model": "model",
+            "socket": "socket",
+            "chipset": "chipset",
+            "form_type": "form_type",
+            "max_ram_capacity": "max_ram_capacity",
+            "ram_type": "ram_type",
+            "ram_slots": "ram_slots",
+            "pcie_slots": "pcie_slots",
+            "sata_ports": "sata_ports",
+            "m2_slot": "m2_slot",
+        },
+    ),
+}
+
+
+def load_specific_details(products):
+    """
+    Retorna {product_id: specific_details} para uma lista de produtos.
+    Agrupa por categoria e busca cada tabela de especificação com um único
+    prod_id__in, então o custo não cresce com o número de produtos.
+    """
+    ids_by_category = {}
+    for product in products:
+        ids_by_category.setdefault(product.category, []).append(product.pk)
+
+    details = {}
+    for category, product_ids in ids_by_category.items():
+        if category not in SPECIFIC_DETAILS_FIELDS:
+            continue
+        model, fields = SPECIFIC_DETAILS_FIELDS[category]
+        rows = model.objects.filter(prod_id__in=product_ids).values(
+            "prod_id",
+            *set(fields.values()),
+        )
+        for row in rows:
+            details[row["prod_id"]] = {
+                key: row[attr] for key, attr in fields.items()
+            }
+    return details
+
+
+def product_base_data(product):
+    return {
+        "id": product.pk,
+        "name": product.name,
+        "category": product.category,
+        "description": product.description,
+        "image_url": product.image_url,
+        "brand": product.brand,
+        "hash": product.hash,
+    }
+
+
+def build_product_data_list(products):
+    """
+    Monta os dicionários de listagem (dados base + specific_details) de uma lista
+    de produtos com uma consulta por categoria presente.
+    """
+    details = load_specific_details(products)
+    product_data_list = []
+    for product in products:
+        product_data = product_base_data(product)
+        if product.category in SPECIFIC_DETAILS_FIELDS:
+            product_data["specific_details"] = details.get(product.pk, {})
+        else:
+            product_data["category_error"] = "Categoria não existe"
+        product_data_list.append(product_data)
+    return product_data_list
+
+
+SEARCH_VOCABULARY_CACHE_KEY = "product_search_vocabulary"
+SEARCH_VOCABULARY_TIMEOUT = 60 * 60  # rede de segurança caso alguma escrita não invalide
+FUZZY_WORD_SIMILARITY = 0.4  # limiar do operador <% (pg_trgm), tolera erros de digitação
+FUZZY_SEARCH_LIMIT = 100
+
+
+def get_search_vocabulary():
+    """
+    Categorias, marcas e tipos (palavras das descrições) conhecidos no catálogo.
+    Fica em cache e é invalidado nas escritas do catálogo,
+    em vez de ser recalculado a cada busca.
+    """
+    vocabulary = cache.get(SEARCH_VOCABULARY_CACHE_KEY)
+    if vocabulary is not None:
+        return vocabulary
+
+    categorias = set(Product.objects.values_list("category", flat=True).distinct())
+    marcas = set(Product.objects.values_list("brand", flat=True).distinct())
+
+    # Normaliza para string simples (ex: "teclado mecânico" → ["teclado", "mecânico"])
+    tipos = set()
+    descricoes = (
         Product.objects.values_list("description", flat=True)
         .exclude(description__isnull=True)
         .exclude(description__exact="")
-        .distinct(),
+        .distinct()
     )
+    for desc in descricoes.iterator(chunk_size=2000):
+        tipos.update(re.findall(r"\w+", desc.lower()))
 
-    # Normaliza para string simples (ex: "teclado mecânico" → ["teclado", "mecânico"])
-    tipos_tokenizados = set()
-    for desc in TIPOS_VALIDOS:
-        tipos_tokenizados.update(re.findall(r"\w+", desc.lower()))
-    TIPOS_VALIDOS = tipos_tokenizados
+    vocabulary = {
+        "categorias": sorted(c for c in categorias if c),
+        "marcas": sorted(m for m in marcas if m),
+        "tipos": sorted(tipos),
+    }
+    cache.set(SEARCH_VOCABULARY_CACHE_KEY, vocabulary, SEARCH_VOCABULARY_TIMEOUT)
+    return vocabulary
+
+
+def refresh_search_vocabulary():
+    """
+    Invalida o vocabulário de busca após o commit de uma escrita no catálogo.
+    """
+    transaction.on_commit(lambda: cache.delete(SEARCH_VOCABULARY_CACHE_KEY))
+
+
+def fallback_simples_por_sql(search_text: str, limite: int = FUZZY_SEARCH_LIMIT):
+    """
+    Busca aproximada (pg_trgm + unaccent) usada quando a busca full-text não encontra nada.
+    Categoria, marca, tipo e preço extraídos do texto não filtram mais em tentativas
+    sucessivas: viram bônus no ranking de uma única consulta, servida pelo índice
+    de trigramas sobre immutable_unaccent(lower(name || ' ' || description)).
+    """
+
+    texto = search_text.lower()
+    palavras = re.findall(r"\w+", texto)
+    if not palavras:
+        return []
 
-    # ====== Extração de intenção ======
-    categoria = next((c for c in CATEGORIAS_VALIDAS if c and c.lower() in texto), None)
-    marca = next((m for m in MARCAS_VALIDAS if m and m.lower() in texto), None)
-    tipos = [t for t in TIPOS_VALIDOS if t in texto]
+    # ====== Extração de intenção (vocabulário em cache) ======
+    vocabulary = get_search_vocabulary()
+    categoria = next((c for c in vocabulary["categorias"] if c.lower() in texto), None)
+    marca = next((m for m in vocabulary["marcas"] if m.lower() in texto), None)
+    tipos = sorted(set(vocabulary["tipos"]).intersection(palavras))
 
     preco_limite = None
     match_preco = re.search(
@@ -474,75 +665,66 @@ def fallback_simples_por_sql(search_text: str, permitir_relaxamento: bool = True
         preco_raw = match_preco.group(1).replace(".", "").replace(",", ".")
         try:
             preco_limite = float(preco_raw)
-        except:
+        except ValueError:
             preco_limite = None
 
-    # ====== Função interna para montar e executar SQL ======
-    def executar_busca(
-        com_preco=True, com_categoria=True, com_marca=True, com_tipos=True
-    ):
-        like_clauses = [
-            "unaccent(p.name || ' ' || p.description) ILIKE unaccent(%s)"
-            for _ in palavras
-        ]
-        sql_or = " OR ".join(like_clauses)
-
-        sql = f"""
-            SELECT DISTINCT p.id
-            FROM api_product p
-            JOIN api_productstore ps ON ps.product_id = p.id
-            JOIN (
-                SELECT product_store_id, MAX(collection_date) AS max_date
-                FROM api_price
-                GROUP BY product_store_id
-            ) latest ON latest.product_store_id = ps.id
-            JOIN api_price pr ON pr.product_store_id = ps.id AND pr.collection_date = latest.max_date
-            WHERE ({sql_or})
-        """
-
-        values = [f"%{palavra}%" for palavra in palavras]
-
-        if com_categoria and categoria:
-            sql += " AND unaccent(lower(p.category)) = unaccent(%s)"
-            values.append(categoria.lower())
-
-        if com_marca and marca:
-            sql += " AND unaccent(lower(p.brand)) ILIKE unaccent(%s)"
-            values.append(f"%{marca.lower()}%")
-
-        if com_tipos and tipos:
-            for tipo in tipos:
-                sql += " AND unaccent(lower(p.description)) ILIKE unaccent(%s)"
-                values.append(f"%{tipo}%")
-
-        if com_preco and preco_limite:
-            sql += " AND pr.value <= %s"
-            values.append(preco_limite)
-
-        with connection.cursor() as cursor:
-            cursor.execute(sql, values)
-            return [row[0] for row in cursor.fetchall()]
-
-    # ====== Tentativas com relaxamento progressivo ======
-    tentativas = (
-        [
-            dict(com_preco=True, com_categoria=True, com_marca=True, com_tipos=True),
-            dict(com_preco=True, com_categoria=False, com_marca=True, com_tipos=True),
-            dict(com_preco=True, com_categoria=False, com_marca=False, com_tipos=True),
-            dict(
-                com_preco=False, com_categoria=False, com_marca=False, com_tipos=False
-            ),
-        ]
-        if permitir_relaxamento
-        else [dict(com_preco=True, com_categoria=True, com_marca=True, com_tipos=True)]
+    # ====== Monta uma única consulta com similaridade + bônus ======
+    documento = "immutable_unaccent(lower(p.name || ' ' || p.description))"
+
+    score_sql = [
+        f"word_similarity(immutable_unaccent(%s), {documento})" for _ in palavras
+    ]
+    score_params = list(palavras)
+
+    if categoria:
+        score_sql.append("CASE WHEN p.category = %s THEN 1.0 ELSE 0 END")
+        score_params.append(categoria)
+
+    if marca:
+        score_sql.append(
+            "CASE WHEN immutable_unaccent(lower(p.brand)) = immutable_unaccent(%s) "
+            "THEN 0.5 ELSE 0 END",
+        )
+        score_params.append(marca.lower())
+
+    for tipo in tipos:
+        score_sql.append(
+            "CASE WHEN immutable_unaccent(lower(p.description)) "
+            "LIKE immutable_unaccent(%s) THEN 0.25 ELSE 0 END",
+        )
+        score_params.append(f"%{tipo}%")
+
+    if preco_limite:
+        score_sql.append("CASE WHEN MIN(pr.value) <= %s THEN 0.5 ELSE 0 END")
+        score_params.append(preco_limite)
+
+    match_sql = " OR ".join(
+        f"immutable_unaccent(%s) <%% {documento}" for _ in palavras
     )
 
-    for tentativa in tentativas:
-        ids = executar_busca(**tentativa)
-        if ids:
-            return [{"pk": pid, "rank": 0.05} for pid in ids]
+    sql = f"""
+        SELECT p.id, ({" + ".join(score_sql)}) AS score
+        FROM api_product p
+        JOIN api_productstore ps ON ps.product_id = p.id
+        JOIN api_latestprice pr ON pr.product_store_id = ps.id
+        WHERE ({match_sql})
+        GROUP BY p.id
+        ORDER BY score DESC, p.id
+        LIMIT %s
+    """  # noqa: S608
+    values = [*score_params, *palavras, limite]
+
+    # set_config(..., true) só vale dentro da transação: sem o atomic(), em
+    # autocommit, o limiar voltaria ao padrão antes da consulta
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+            [str(FUZZY_WORD_SIMILARITY)],
+        )
+        cursor.execute(sql, values)
+        rows = cursor.fetchall()
 
-    return []
+    return [{"pk": pid, "rank": float(score)} for pid, score in rows]
 
 
 """
@@ -558,18 +740,14 @@ def search_products(filters: dict):
         product_ranks = {}
 
         if "name" in filters:
-            search_query = SearchQuery(filters["name"], config="portuguese")
-            search_vector = SearchVector("name", "description", config="portuguese")
             search_text = filters["name"]
 
-            # ====== 1. Busca full-text ======
+            # ====== 1. Busca full-text (coluna search_vector indexada) ======
             search_query = SearchQuery(search_text, config="portuguese")
-            search_vector = SearchVector("name", "description", config="portuguese")
 
             fulltext_match = Product.objects.annotate(
-                search=search_vector,
-                rank=SearchRank(search_vector, search_query),
-            ).filter(search=search_query)
+                rank=SearchRank(F("search_vector"), search_query),
+            ).filter(search_vector=search_query)
 
             combined_products = list(fulltext_match.values("pk", "rank"))
 
@@ -607,7 +785,7 @@ def search_products(filters: dict):
 
         # ====== ANOTAÇÕES ======
         latest_price_subquery = (
-            Price.objects.filter(product_store__product=OuterRef("pk"))
+            LatestPrice.objects.filter(product_store__product=OuterRef("pk"))
             .order_by("-collection_date")
             .values("value")[:1]
         )
@@ -693,14 +871,11 @@ def search_products(filters: dict):
             raise ValueError("Nenhum produto encontrado com os filtros fornecidos.")
 
         # MONTA JSON DE RETORNO
+        latest_prices = load_latest_prices([product.pk for product in final_products])
+        specific_details = load_specific_details(final_products)
         product_data_list = []
         for product in final_products:
-            latest_price_entry = (
-                Price.objects.filter(product_store__product=product)
-                .order_by("-collection_date")
-                .select_related("product_store__store")
-                .first()
-            )
+            latest_price_entry = latest_prices.get(product.pk)
 
             if latest_price_entry:
                 ps = latest_price_entry.product_store
@@ -728,7 +903,7 @@ def search_products(filters: dict):
                 "available": available,
                 "collection_date": collection_date,
                 "store_rating": store_rating,
-                "specific_details": get_specific_details(product),
+                "specific_details": specific_details.get(product.pk, {}),
             }
             product_data_list.append(product_data)
 
@@ -868,427 +1043,134 @@ def get_product_by_id(product_id):  # noqa: C901
 # pra pegar produto pelo nome
 
 
-def get_product_by_name(product_name):  # noqa: C901
+def get_product_by_name(product_name):
     try:
-        products = Product.objects.filter(name=product_name)
+        products = list(Product.objects.filter(name=product_name))
 
-        if not products.exists():
+        if not products:
             msg = f"Não há produtos nomeados como: {product_name}"
             raise ValueError(msg)  # noqa: TRY301
 
-        product_data_list = []
-
-        for product in products:
-            product_data = {
-                "id": product.pk,
-                "name": product.name,
-                "category": product.category,
-                "description": product.description,
-                "image_url": product.image_url,
-                "brand": product.brand,
-                "hash": product.hash,
-            }
-
-            match product.category:
-                case "computer":
-                    computer = Computer.objects.get(prod=product)
-                    product_data["specific_details"] = {
-                        "is_notebook": computer.is_notebook,
-                        "motherboard": computer.motherboard,
-                        "cpu": computer.cpu,
-                        "ram": computer.ram,
-                        "storage": computer.storage,
-                        "gpu": computer.gpu,
-                        "inches": computer.inches,
-                        "panel_type": computer.panel_type,
-                        "resolution": computer.resolution,
-                        "refresh_rate": computer.refresh_rate,
-                        "color_support": computer.color_support,
-                        "output": computer.output,
-                    }
-                case "gpu":
-                    gpu = Gpu.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": gpu.model,
-                        "vram": gpu.vram,
-                        "chipset": gpu.chipset,
-                        "max_resolution": gpu.max_resolution,
-                        "output": gpu.output,
-                        "tech_support": gpu.tech_support,
-                    }
-                case "keyboard":
-                    keyboard = Keyboard.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": keyboard.model,
-                        "key_type": keyboard.key_type,
-                        "layout": keyboard.layout,
-                        "connectivity": keyboard.connectivity,
-                        "dimension": keyboard.dimension,
-                    }
-                case "cpu":
-                    cpu = Cpu.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": cpu.model,
-                        "integrated_video": cpu.integrated_video,
-                        "socket": cpu.socket,
-                        "core_number": cpu.core_number,
-                        "thread_number": cpu.thread_number,
-                        "frequency": cpu.frequency,
-                        "mem_speed": cpu.mem_speed,
-                    }
-                case "mouse":
-                    mouse = Mouse.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": mouse.model,
-                        "dpi": mouse.dpi,
-                        "connectivity": mouse.connectivity,
-                        "color": mouse.color,
-                    }
-                case "monitor":
-                    monitor = Monitor.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": monitor.model,
-                        "inches": monitor.inches,
-                        "panel_type": monitor.panel_type,
-                        "proportion": monitor.proportion,
-                        "resolution": monitor.resolution,
-                        "refresh_rate": monitor.refresh_rate,
-                        "color_support": monitor.color_support,
-                        "output": monitor.output,
-                    }
-                case "ram":
-                    ram = Ram.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": ram.model,
-                        "capacity": ram.capacity,
-                        "ddr": ram.ddr,
-                        "speed": ram.speed,
-                    }
-                case "storage":
-                    storage = Storage.objects.get(prod=product)
-                    product_data["specific_details"] = {
-                        "capacity": storage.capacity_gb,
-                        "storage_type": storage.storage_type,
-                        "interface": storage.interface,
-                        "form_factor": storage.form_factor,
-                        "read_speed": storage.read_speed,
-                        "write_speed": storage.write_speed,
-                    }
-                case "motherboard":
-                    motherboard = Motherboard.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": motherboard.model,
-                        "socket": motherboard.socket,
-                        "chipset": motherboard.chipset,
-                        "form_type": motherboard.form_type,
-                        "max_ram_capacity": motherboard.max_ram_capacity,
-                        "ram_type": motherboard.ram_type,
-                        "ram_slots": motherboard.ram_slots,
-                        "pcie_slots": motherboard.pcie_slots,
-                        "sata_ports": motherboard.sata_ports,
-                        "m2_slot": motherboard.m2_slot,
-                    }
-
-            product_data_list.append(product_data)
-
-        return product_data_list  # noqa: TRY300
+        return build_product_data_list(products)
 
     except Exception as e:
         msg = f"Erro ao obter produtos: {e!s}"
         raise ValueError(msg) from e
 
 
-def get_product_by_category(product_category):  # noqa: C901
+def get_product_by_category(product_category):
     try:
-        products = Product.objects.filter(category=product_category)
+        products = list(Product.objects.filter(category=product_category))
 
-        if not products.exists():
+        if not products:
             msg = f"Não há produtos na categoria: {product_category}"
             raise ValueError(msg)  # noqa: TRY301
 
-        product_data_list = []
+        return build_product_data_list(products)
 
-        for product in products:
-            product_data = {
-                "id": product.pk,
-                "name": product.name,
-                "category": product.category,
-                "description": product.description,
-                "image_url": product.image_url,
-                "brand": product.brand,
-                "hash": product.hash,
-            }
+    except Exception as e:  # noqa: BLE001
+        msg = f"Erro ao obter produtos: {e!s}"
+        raise ValueError(msg)  # noqa: B904
 
-            match product.category:
-                case "computer":
-                    computer = Computer.objects.get(prod=product)
-                    product_data["specific_details"] = {
-                        "is_notebook": computer.is_notebook,
-                        "motherboard": computer.motherboard,
-                        "cpu": computer.cpu,
-                        "ram": computer.ram,
-                        "storage": computer.storage,
-                        "gpu": computer.gpu,
-                        "inches": computer.inches,
-                        "panel_type": computer.panel_type,
-                        "resolution": computer.resolution,
-                        "refresh_rate": computer.refresh_rate,
-                        "color_support": computer.color_support,
-                        "output": computer.output,
-                    }
-                case "gpu":
-                    gpu = Gpu.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": gpu.model,
-                        "vram": gpu.vram,
-                        "chipset": gpu.chipset,
-                        "max_resolution": gpu.max_resolution,
-                        "output": gpu.output,
-                        "tech_support": gpu.tech_support,
-                    }
-                case "keyboard":
-                    keyboard = Keyboard.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": keyboard.model,
-                        "key_type": keyboard.key_type,
-                        "layout": keyboard.layout,
-                        "connectivity": keyboard.connectivity,
-                        "dimension": keyboard.dimension,
-                    }
-                case "cpu":
-                    cpu = Cpu.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": cpu.model,
-                        "integrated_video": cpu.integrated_video,
-                        "socket": cpu.socket,
-                        "core_number": cpu.core_number,
-                        "thread_number": cpu.thread_number,
-                        "frequency": cpu.frequency,
-                        "mem_speed": cpu.mem_speed,
-                    }
-                case "mouse":
-                    mouse = Mouse.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": mouse.model,
-                        "dpi": mouse.dpi,
-                        "connectivity": mouse.connectivity,
-                        "color": mouse.color,
-                    }
-                case "monitor":
-                    monitor = Monitor.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": monitor.model,
-                        "inches": monitor.inches,
-                        "panel_type": monitor.panel_type,
-                        "proportion": monitor.proportion,
-                        "resolution": monitor.resolution,
-                        "refresh_rate": monitor.refresh_rate,
-                        "color_support": monitor.color_support,
-                        "output": monitor.output,
-                    }
-                case "ram":
-                    ram = Ram.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": ram.model,
-                        "capacity": ram.capacity,
-                        "ddr": ram.ddr,
-                        "speed": ram.speed,
-                    }
-                case "storage":
-                    storage = Storage.objects.get(prod=product)
-                    product_data["specific_details"] = {
-                        "capacity": storage.capacity_gb,
-                        "storage_type": storage.storage_type,
-                        "interface": storage.interface,
-                        "form_factor": storage.form_factor,
-                        "read_speed": storage.read_speed,
-                        "write_speed": storage.write_speed,
-                    }
-                case "motherboard":
-                    motherboard = Motherboard.objects.get(prod_id=product)
-                    product_data["specific_details"] = {
-                        "model": motherboard.model,
-                        "socket": motherboard.socket,
-                        "chipset": motherboard.chipset,
-                        "form_type": motherboard.form_type,
-                        "max_ram_capacity": motherboard.max_ram_capacity,
-                        "ram_type": motherboard.ram_type,
-                        "ram_slots": motherboard.ram_slots,
-                        "pcie_slots": motherboard.pcie_slots,
-                        "sata_ports": motherboard.sata_ports,
-                        "m2_slot": motherboard.m2_slot,
-                    }
-                case _:
-                    product_data["category_error"] = "Categoria não existe"
 
-            product_data_list.append(product_data)
+def attach_latest_prices(products, product_data_list):
+    """
+    Completa os dicionários de listagem com loja e preço mais recentes (uma consulta).
+    """
+    latest_prices = load_latest_prices([product.pk for product in products])
 
-        return product_data_list  # noqa: TRY300
+    for product, product_data in zip(products, product_data_list, strict=True):
+        latest_price_entry = latest_prices.get(product.pk)
 
-    except Exception as e:  # noqa: BLE001
-        msg = f"Erro ao obter produtos: {e!s}"
-        raise ValueError(msg)  # noqa: B904
+        if latest_price_entry:
+            ps = latest_price_entry.product_store
+            product_data["store"] = ps.store.name
+            product_data["store_url_base"] = ps.store.url_base
+            product_data["rating"] = ps.rating
+            product_data["available"] = ps.available
+            product_data["value"] = float(latest_price_entry.value)
+            product_data["collection_date"] = latest_price_entry.collection_date
+        else:
+            product_data["store"] = None
+            product_data["store_url_base"] = None
+            product_data["rating"] = None
+            product_data["available"] = None
+            product_data["value"] = None
+            product_data["collection_date"] = None
+
+    return product_data_list
+
+
+def build_catalog_entries(products):
+    return attach_latest_prices(products, build_product_data_list(products))
 
 
-def get_all_products():  # noqa: C901, PLR0912, PLR0915
+def get_all_products():
     try:
-        products = Product.objects.all()
+        products = list(Product.objects.all())
 
         if not products:
             msg = "Não há produtos cadastrados"
             raise ValueError(msg)  # noqa: TRY301
 
-        product_data_list = []
+        return build_catalog_entries(products)
 
-        for product in products:
-            product_data = {
-                "id": product.pk,
-                "name": product.name,
-                "category": product.category,
-                "description": product.description,
-                "image_url": product.image_url,
-                "brand": product.brand,
-                "hash": product.hash,
-            }
+    except Exception as e:  # noqa: BLE001
+        msg = f"Erro ao obter produtos: {e!s}"
+        raise ValueError(msg)  # noqa: B904
 
-            try:
-                match product.category:
-                    case "computer":
-                        computer = Computer.objects.get(prod=product)
-                        product_data["specific_details"] = {
-                            "is_notebook": computer.is_notebook,
-                            "motherboard": computer.motherboard,
-                            "cpu": computer.cpu,
-                            "ram": computer.ram,
-                            "storage": computer.storage,
-                            "gpu": computer.gpu,
-                            "inches": computer.inches,
-                            "panel_type": computer.panel_type,
-                            "resolution": computer.resolution,
-                            "refresh_rate": computer.refresh_rate,
-                            "color_support": computer.color_support,
-                            "output": computer.output,
-                        }
-                    case "gpu":
-                        gpu = Gpu.objects.get(prod_id=product)
-                        product_data["specific_details"] = {
-                            "model": gpu.model,
-                            "vram": gpu.vram,
-                            "chipset": gpu.chipset,
-                            "max_resolution": gpu.max_resolution,
-                            "output": gpu.output,
-                            "tech_support": gpu.tech_support,
-                        }
-                    case "keyboard":
-                        keyboard = Keyboard.objects.get(prod_id=product)
-                        product_data["specific_details"] = {
-                            "model": keyboard.model,
-                            "key_type": keyboard.key_type,
-                            "layout": keyboard.layout,
-                            "connectivity": keyboard.connectivity,
-                            "dimension": keyboard.dimension,
-                        }
-                    case "cpu":
-                        cpu = Cpu.objects.get(prod_id=product)
-                        product_data["specific_details"] = {
-                            "model": cpu.model,
-                            "integrated_video": cpu.integrated_video,
-                            "socket": cpu.socket,
-                            "core_number": cpu.core_number,
-                            "thread_number": cpu.thread_number,
-                            "frequency": cpu.frequency,
-                            "mem_speed": cpu.mem_speed,
-                        }
-                    case "mouse":
-                        mouse = Mouse.objects.get(prod_id=product)
-                        product_data["specific_details"] = {
-                            "model": mouse.model,
-                            "dpi": mouse.dpi,
-                            "connectivity": mouse.connectivity,
-                            "color": mouse.color,
-                        }
-                    case "monitor":
-                        monitor = Monitor.objects.get(prod_id=product)
-                        product_data["specific_details"] = {
-                            "model": monitor.model,
-                            "inches": monitor.inches,
-                            "panel_type": monitor.panel_type,
-                            "proportion": monitor.proportion,
-                            "resolution": monitor.resolution,
-                            "refresh_rate": monitor.refresh_rate,
-                            "color_support": monitor.color_support,
-                            "output": monitor.output,
-                        }
-                    case "ram":
-                        ram = Ram.objects.get(prod_id=product)
-                        product_data["specific_details"] = {
-                            "model": ram.model,
-                            "capacity": ram.capacity,
-                            "ddr": ram.ddr,
-                            "speed": ram.speed,
-                        }
-                    case "storage":
-                        storage = Storage.objects.get(prod_id=product)
-                        product_data["specific_details"] = {
-                            "capacity": storage.capacity_gb,
-                            "storage_type": storage.storage_type,
-                            "interface": storage.interface,
-                            "form_factor": storage.form_factor,
-                            "read_speed": storage.read_speed,
-                            "write_speed": storage.write_speed,
-                        }
-                    case "motherboard":
-                        motherboard = Motherboard.objects.get(prod_id=product)
-                        product_data["specific_details"] = {
-                            "model": motherboard.model,
-                            "socket": motherboard.socket,
-                            "chipset": motherboard.chipset,
-                            "form_type": motherboard.form_type,
-                            "max_ram_capacity": motherboard.max_ram_capacity,
-                            "ram_type": motherboard.ram_type,
-                            "ram_slots": motherboard.ram_slots,
-                            "pcie_slots": motherboard.pcie_slots,
-                            "sata_ports": motherboard.sata_ports,
-                            "m2_slot": motherboard.m2_slot,
-                        }
-                    case _:
-                        product_data["category_error"] = "Categoria não existe"
-
-            except Exception as e:  # noqa: BLE001
-                f"Erro ao carregar detalhes: {e!s}"
-
-            latest_price_entry = (
-                Price.objects.filter(
-                    product_store__product=product,
-                )
-                .order_by("-collection_date")
-                .select_related("product_store__store")
-                .first()
-            )
 
-            if latest_price_entry:
-                ps = latest_price_entry.product_store
-                product_data["store"] = ps.store.name
-                product_data["store_url_base"] = ps.store.url_base
-                product_data["rating"] = ps.rating
-                product_data["available"] = ps.available
-                product_data["value"] = float(latest_price_entry.value)
-                product_data["collection_date"] = latest_price_entry.collection_date
-            else:
-                product_data["store"] = None
-                product_data["store_url_base"] = None
-                product_data["rating"] = None
-                product_data["available"] = None
-                product_data["value"] = None
-                product_data["collection_date"] = None
+CATALOG_PAGE_SIZE = 100
+CATALOG_MAX_PAGE_SIZE = 1000
+CATALOG_STREAM_CHUNK_SIZE = 500
 
-            product_data_list.append(product_data)
 
-        return product_data_list  # noqa: TRY300
+def encode_catalog_cursor(last_id):
+    payload = json.dumps({"id": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
 
-    except Exception as e:  # noqa: BLE001
-        msg = f"Erro ao obter produtos: {e!s}"
-        raise ValueError(msg)  # noqa: B904
+
+def decode_catalog_cursor(cursor):
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["id"])
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        msg = "Cursor inválido."
+        raise ValueError(msg) from None
+
+
+def get_products_page(cursor=None, page_size=CATALOG_PAGE_SIZE):
+    """
+    Página do catálogo ordenada por id (paginação por chave, sem OFFSET).
+    Retorna {"products": [...], "next_cursor": str | None}; o cursor é opaco
+    e aponta para o último id entregue.
+    """
+    if not 1 <= page_size <= CATALOG_MAX_PAGE_SIZE:
+        msg = f"page_size deve estar entre 1 e {CATALOG_MAX_PAGE_SIZE}."
+        raise ValueError(msg)
+
+    products = Product.objects.order_by("id")
+    if cursor:
+        products = products.filter(id__gt=decode_catalog_cursor(cursor))
+
+    # Um item a mais indica se existe próxima página
+    products = list(products[: page_size + 1])
+    has_next = len(products) > page_size
+    products = products[:page_size]
+
+    return {
+        "products": build_catalog_entries(products),
+        "next_cursor": encode_catalog_cursor(products[-1].pk) if has_next else None,
+    }
+
+
+def iter_catalog(chunk_size=CATALOG_STREAM_CHUNK_SIZE):
+    """
+    Percorre o catálogo inteiro com .iterator(), montando os dados em blocos
+    de chunk_size produtos: a memória fica constante independente do tamanho.
+    """
+    products = Product.objects.order_by("id").iterator(chunk_size=chunk_size)
+    for chunk in batched(products, chunk_size):
+        yield from build_catalog_entries(list(chunk))
 
 
 def get_product_stores_by_product(ps_id):
@@ -1312,9 +1194,8 @@ def get_recent_price_stores(product_id):
     Retorna o preço mais recente de cada ProductStore para um produto específico.
     """
     latest_prices = (
-        Price.objects.filter(product_store__product_id=product_id)
-        .order_by("product_store_id", "-collection_date")
-        .distinct("product_store_id")
+        LatestPrice.objects.filter(product_store__product_id=product_id)
+        .order_by("product_store_id")
         .select_related("product_store__store")
     )
 
@@ -1353,6 +1234,9 @@ def update_product(  # noqa: C901, PLR0912, PLR0913, PLR0915
                 product.brand = brand
 
             product.save()
+            if name or description:
+                update_search_vector([product.pk])
+            refresh_search_vocabulary()
 
             match product.category:
                 case "computer":
@@ -1492,6 +1376,7 @@ def delete_product(product_id):
         product = Product.objects.get(id=product_id)
 
         product.delete()
+        refresh_search_vocabulary()
 
     except Product.DoesNotExist:
         msg = "Produto não encontrado."
@@ -1688,19 +1573,15 @@ def generic_search(searches):
         store_names = Store.objects.filter(id__in=store_ids).values("id", "name")
         store_name_map = {s["id"]: s["name"] for s in store_names}
 
-        price_data = (
-            Price.objects.filter(product_store_id__in=[s["id"] for s in store_data])
-            .order_by("product_store_id", "-collection_date")
-            .values("product_store_id", "value")
-        )
+        price_data = LatestPrice.objects.filter(
+            product_store_id__in=[s["id"] for s in store_data],
+        ).values("product_store_id", "value")
         price_map = {}
         for price in price_data:
-            ps_id = price["product_store_id"]
-            if ps_id not in price_map:
-                try:
-                    price_map[ps_id] = float(price["value"])
-                except (TypeError, ValueError):
-                    continue
+            try:
+                price_map[price["product_store_id"]] = float(price["value"])
+            except (TypeError, ValueError):
+                continue
 
         # Monta resultados finais aplicando filtro de preço e limitando a 3 por modelo
         sub_results = []
@@ -1758,7 +1639,7 @@ def list_product_stores_by_best_rating(category=None, limit=None, user_id=None):
     if limit:
         qs = qs[: int(limit)]
 
-    qs = qs.select_related("product", "store").prefetch_related("price_set")
+    qs = qs.select_related("product", "store", "latest_price")
 
     favorites_by_product = {}
 
@@ -1777,7 +1658,7 @@ def list_product_stores_by_best_rating(category=None, limit=None, user_id=None):
             "rating": ps.rating,
             "url_product": ps.url_product,
             "available": ps.available,
-            "price": ps.price_set.first().value if ps.price_set.exists() else None,
+            "price": ps.latest_price.value if hasattr(ps, "latest_price") else None,
             "favorite_id": favorites_by_product.get(int(ps.product.id)),
         }
         for ps in qs
@@ -0,0 +1,164 @@
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from api.entities.scrape_job import ScrapeJob
+from api.entities.scrape_job import ScrapeJobStatus
+from django.db import connections
+from django.db import transaction
+from django.utils import timezone
+
+# Job "running" sem heartbeat há mais que isso é considerado abandonado
+SCRAPE_JOB_STALE_MINUTES = 60
+SCRAPE_JOB_MAX_ATTEMPTS = 3
+# De quanto em quanto tempo o worker renova o heartbeat do job em execução
+SCRAPE_JOB_HEARTBEAT_SECONDS = 60
+
+
+def enqueue_scrape_job(store, categories, options=None):
+    return ScrapeJob.objects.create(
+        store=store,
+        categories=list(categories),
+        options=options or {},
+        progress={
+            "categories_done": 0,
+            "categories_total": len(categories),
+            "current_category": None,
+            "products": 0,
+        },
+    )
+
+
+def claim_next_job(worker):
+    """
+    Reserva o job mais antigo da fila. Vários workers podem rodar juntos: a
+    reserva usa SELECT ... FOR UPDATE SKIP LOCKED. Retorna None se a fila
+    estiver vazia.
+    """
+    with transaction.atomic():
+        job = (
+            ScrapeJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ScrapeJobStatus.QUEUED)
+            .order_by("id")
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        job.status = ScrapeJobStatus.RUNNING
+        job.worker = worker
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.error = ""
+        job.save(
+            update_fields=[
+                "status",
+                "worker",
+                "attempts",
+                "started_at",
+                "heartbeat_at",
+                "error",
+            ],
+        )
+    return job
+
+
+def requeue_stale_jobs(
+    stale_minutes=SCRAPE_JOB_STALE_MINUTES,
+    max_attempts=SCRAPE_JOB_MAX_ATTEMPTS,
+):
+    """
+    Devolve para a fila os jobs cujo worker morreu (sem heartbeat recente);
+    depois de max_attempts tentativas o job falha. Retorna quantos voltaram.
+    """
+    stale = ScrapeJob.objects.filter(
+        status=ScrapeJobStatus.RUNNING,
+        heartbeat_at__lt=timezone.now() - timedelta(minutes=stale_minutes),
+    )
+    stale.filter(attempts__gte=max_attempts).update(
+        status=ScrapeJobStatus.FAILED,
+        error="Worker parou de responder.",
+        finished_at=timezone.now(),
+    )
+    return stale.update(status=ScrapeJobStatus.QUEUED)
+
+
+@contextmanager
+def job_heartbeat(job, interval=SCRAPE_JOB_HEARTBEAT_SECONDS):
+    """
+    Renova o heartbeat_at do job numa thread enquanto o bloco roda: uma
+    categoria que leva mais que SCRAPE_JOB_STALE_MINUTES continua com o
+    worker atual em vez de voltar para a fila (e ser coletada de novo por
+    outro worker). Só renova enquanto o job estiver com este worker.
+    """
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                ScrapeJob.objects.filter(
+                    pk=job.pk,
+                    status=ScrapeJobStatus.RUNNING,
+                    worker=job.worker,
+                ).update(heartbeat_at=timezone.now())
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name=f"job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield job
+    finally:
+        stop.set()
+        thread.join()
+
+
+def update_progress(job, **progress):
+    job.progress = {**job.progress, **progress}
+    job.heartbeat_at = timezone.now()
+    job.save(update_fields=["progress", "heartbeat_at"])
+    return job
+
+
+def complete_job(job, results=None):
+    """
+    Marca o job como concluído. Os scrapers gravam os produtos em arquivos
+    (progress["result_files"]); `results` fica para quem devolve uma lista.
+    """
+    job.status = ScrapeJobStatus.SUCCEEDED
+    job.results = results or []
+    job.finished_at = timezone.now()
+    job.progress = {**job.progress, "current_category": None}
+    if results is not None:
+        job.progress["products"] = len(results)
+    job.save(update_fields=["status", "results", "finished_at", "progress"])
+    return job
+
+
+def fail_job(job, error, results=None):
+    job.status = ScrapeJobStatus.FAILED
+    job.error = str(error)
+    job.results = results or []
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "results", "finished_at"])
+    return job
+
+
+def job_to_dict(job, include_results=False):
+    data = {
+        "id": job.pk,
+        "store": job.store,
+        "categories": job.categories,
+        "options": job.options,
+        "status": job.status,
+        "progress": job.progress,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if include_results:
+        data["results"] = job.results
+    return data
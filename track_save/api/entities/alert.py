@@ -10,9 +10,53 @@ class Alert(models.Model):
     is_active = models.BooleanField(default=True)
     expires_at = models.DateField()
     created_at = models.DateField()
+    # preço que gerou a última notificação; evita avisar de novo pelo mesmo preço
+    last_notified_price = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+    )
 
     class Meta:
         app_label = "api"
 
     def __str__(self):
         return f"Alert for {self.product.name} - {self.user.email}"
+
+
+class AlertNotificationStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
+
+
+class AlertNotification(models.Model):
+    """
+    Fila de notificações de alerta disparados, consumida pelo comando
+    send_alert_notifications fora do ciclo da requisição.
+    """
+
+    alert = models.ForeignKey(Alert, on_delete=models.CASCADE)
+    price = models.DecimalField(max_digits=8, decimal_places=2)
+    status = models.CharField(
+        max_length=10,
+        choices=AlertNotificationStatus.choices,
+        default=AlertNotificationStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    # quando uma notificação que falhou pode ser tentada de novo (backoff)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "api"
+
+        indexes = [
+            models.Index(fields=["status", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.alert} - {self.status}"
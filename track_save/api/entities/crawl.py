@@ -0,0 +1,88 @@
+from api.entities.product import ProductCategory
+from api.entities.product import ProductStore
+from django.db import models
+
+
+class CrawlFrontier(models.Model):
+    """
+    URL de produto a revisitar pelo comando crawl_due. O intervalo entre visitas
+    se adapta ao produto: encurta quando o preço muda e alonga quando fica estável.
+    """
+
+    # Chave do scraper (kabum, terabyte, amazon), não o nome da Store
+    store = models.CharField(max_length=50)
+    category = models.CharField(max_length=20, choices=ProductCategory.choices)
+    url = models.TextField()
+    product_store = models.ForeignKey(
+        ProductStore,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    next_due_at = models.DateTimeField()
+    interval_hours = models.FloatField()
+    last_value = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+    )
+    last_crawled_at = models.DateTimeField(null=True, blank=True)
+    last_changed_at = models.DateTimeField(null=True, blank=True)
+    crawl_count = models.PositiveIntegerField(default=0)
+    change_count = models.PositiveIntegerField(default=0)
+    # falhas seguidas; zera na próxima visita bem-sucedida
+    failures = models.PositiveSmallIntegerField(default=0)
+    # reservado por uma execução até este horário (expira se ela morrer)
+    leased_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "api"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["store", "url"],
+                name="api_crawlfrontier_store_url_uniq",
+            ),
+        ]
+        indexes = [models.Index(fields=["store", "next_due_at"])]
+
+    def __str__(self):
+        return f"{self.store} {self.url} (próxima: {self.next_due_at})"
+
+
+class CrawlRunStatus(models.TextChoices):
+    RUNNING = "running", "Running"
+    INTERRUPTED = "interrupted", "Interrupted"
+    FINISHED = "finished", "Finished"
+
+
+class CrawlRun(models.Model):
+    """
+    Execução do crawl_due. O checkpoint e o corte `due_before` permitem que uma
+    execução interrompida seja retomada sem recomeçar do zero: as URLs já
+    visitadas deixaram de estar devidas e só o restante é coletado.
+    """
+
+    store = models.CharField(max_length=50)
+    category = models.CharField(max_length=20, blank=True, default="")
+    status = models.CharField(
+        max_length=12,
+        choices=CrawlRunStatus.choices,
+        default=CrawlRunStatus.RUNNING,
+    )
+    # só entram na execução as URLs devidas até este horário
+    due_before = models.DateTimeField()
+    visited = models.PositiveIntegerField(default=0)
+    changed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    checkpoint = models.JSONField(default=dict, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "api"
+        indexes = [models.Index(fields=["store", "status"])]
+
+    def __str__(self):
+        return f"{self.store} {self.category or '*'} ({self.status})"
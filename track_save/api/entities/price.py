@@ -10,5 +10,71 @@ class Price(models.Model):
     class Meta:
         app_label = "api"
 
+        # api_price é particionada por mês de collection_date (migração 0036)
+        indexes = [
+            models.Index(fields=["product_store", "collection_date"]),
+        ]
+
     def __str__(self):
         return f"{self.product_store.product.name} - {self.value}"
+
+
+class LatestPrice(models.Model):
+    """
+    Preço atual de cada ProductStore, mantido a cada novo Price.
+    Evita que as leituras precisem varrer/ordenar todo o histórico de api_price.
+    """
+
+    product_store = models.OneToOneField(
+        ProductStore,
+        on_delete=models.CASCADE,
+        related_name="latest_price",
+    )
+    value = models.DecimalField(max_digits=8, decimal_places=2)
+    previous_value = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        null=True,
+        blank=True,
+    )  # valor anterior ao atual, se houver
+    collection_date = models.DateField()
+
+    class Meta:
+        app_label = "api"
+
+        indexes = [
+            models.Index(fields=["value"]),
+        ]
+
+    def __str__(self):
+        return f"{self.product_store} - {self.value}"
+
+
+class PriceRollupGranularity(models.TextChoices):
+    DAY = "day", "Day"
+    WEEK = "week", "Week"
+
+
+class PriceRollup(models.Model):
+    """
+    Agregado (mín/méd/máx) dos preços de um ProductStore por dia ou semana.
+    Substitui os pontos brutos de api_price que passaram do prazo de retenção.
+    """
+
+    product_store = models.ForeignKey(ProductStore, on_delete=models.CASCADE)
+    granularity = models.CharField(
+        max_length=4,
+        choices=PriceRollupGranularity.choices,
+    )
+    bucket_start = models.DateField()  # dia ou segunda-feira da semana
+    min_value = models.DecimalField(max_digits=8, decimal_places=2)
+    avg_value = models.DecimalField(max_digits=8, decimal_places=2)
+    max_value = models.DecimalField(max_digits=8, decimal_places=2)
+    sample_count = models.PositiveIntegerField()
+
+    class Meta:
+        app_label = "api"
+        unique_together = ("product_store", "granularity", "bucket_start")
+
+    def __str__(self):
+        return f"{self.product_store} - {self.granularity} {self.bucket_start}"
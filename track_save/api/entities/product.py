@@ -1,5 +1,7 @@
 import hashlib
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
@@ -62,10 +64,16 @@ class Product(models.Model):
         blank=True,
         null=True,
     )
+    # tsvector persistido (nome com peso A, descrição com peso B) usado na busca full-text  # noqa: E501
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         app_label = "api"
 
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -89,6 +97,8 @@ class ProductStore(models.Model):
     rating = models.FloatField(default=0.0)  # avaliação média do produto
     url_product = models.TextField()
     available = models.BooleanField()
+    # Impressão digital da última coleta gravada (ver record_fingerprint)
+    fingerprint = models.CharField(max_length=64, blank=True, default="", db_index=True)
 
     class Meta:
         app_label = "api"
@@ -0,0 +1,46 @@
+from django.db import models
+
+
+class ScrapeJobStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    SUCCEEDED = "succeeded", "Succeeded"
+    FAILED = "failed", "Failed"
+
+
+class ScrapeJob(models.Model):
+    """
+    Coleta pedida pela API de webscraping. A requisição só enfileira o job; o
+    comando run_scrape_worker executa o scraper fora do processo web e grava
+    progresso e resultados aqui.
+    """
+
+    store = models.CharField(max_length=50)
+    # Nomes de webscraping.enums.Categories (GPU, CPU, ...), na ordem de execução
+    categories = models.JSONField(default=list)
+    # kwargs extras do scraper (workers, mode, ...)
+    options = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10,
+        choices=ScrapeJobStatus.choices,
+        default=ScrapeJobStatus.QUEUED,
+    )
+    # {"categories_done", "categories_total", "current_category", "products",
+    #  "result_files"}
+    progress = models.JSONField(default=dict, blank=True)
+    results = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True, default="")
+    worker = models.CharField(max_length=100, blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # atualizado a cada categoria; jobs parados há muito tempo voltam para a fila
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "api"
+        indexes = [models.Index(fields=["status", "id"])]
+
+    def __str__(self):
+        return f"ScrapeJob #{self.pk} {self.store} ({self.status})"
@@ -0,0 +1,140 @@
+from itertools import groupby
+
+from api.controllers.crawl_controller import CRAWL_LEASE_MINUTES
+from api.controllers.crawl_controller import claim_due
+from api.controllers.crawl_controller import crawl_budget
+from api.controllers.crawl_controller import finish_run
+from api.controllers.crawl_controller import record_visits
+from api.controllers.crawl_controller import seed_from_product_stores
+from api.controllers.crawl_controller import start_run
+from api.controllers.ingest_controller import ingest_products
+from api.entities.crawl import CrawlRunStatus
+from api.entities.product import ProductCategory
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from track_save.webscraping.enums import Categories
+from track_save.webscraping.scrapers.rate_limit import RateLimiter
+from track_save.webscraping.webscraping_factory import SCRAPERS
+from track_save.webscraping.webscraping_factory import get_scraper
+
+
+class Command(BaseCommand):
+    help = (
+        "Revisita as URLs devidas da fronteira de uma loja (CrawlFrontier), "
+        "respeitando o orçamento da loja, e grava os produtos. Uma execução "
+        "interrompida é retomada de onde parou."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("store", choices=sorted(SCRAPERS))
+        parser.add_argument(
+            "--category",
+            choices=ProductCategory.values,
+            default="",
+            help="Só URLs desta categoria.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=500,
+            help="Máximo de URLs visitadas nesta execução.",
+        )
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Acrescenta à fronteira os produtos já cadastrados na loja.",
+        )
+        parser.add_argument(
+            "--lease-minutes",
+            type=int,
+            default=CRAWL_LEASE_MINUTES,
+        )
+        parser.add_argument(
+            "--headed",
+            action="store_true",
+            help="Abre o navegador com interface.",
+        )
+
+    def handle(self, *args, **options):
+        store = options["store"]
+        if options["batch_size"] < 1 or options["limit"] < 1:
+            msg = "--batch-size e --limit devem ser maiores que zero."
+            raise CommandError(msg)
+
+        if options["seed"]:
+            seeded = seed_from_product_stores(store)
+            self.stdout.write(f"{seeded} produtos enviados para a fronteira.")
+
+        budget = crawl_budget(store)
+        limiter = RateLimiter(budget["requests_per_minute"])
+        run, resumed = start_run(store, options["category"])
+        if resumed:
+            self.stdout.write(
+                f"Retomando execução #{run.pk} ({run.visited} URLs já visitadas).",
+            )
+
+        visited = 0
+        try:
+            while visited < options["limit"]:
+                entries = claim_due(
+                    run,
+                    min(options["batch_size"], options["limit"] - visited),
+                    options["lease_minutes"],
+                )
+                if not entries:
+                    break
+                results = self.scrape(entries, budget, limiter, not options["headed"])
+                outcomes = ingest_products(list(results.values()))
+                product_store_ids = {
+                    url: outcome["product_store_id"]
+                    for url, outcome in zip(results, outcomes, strict=True)
+                    if outcome["product_store_id"]
+                }
+                count, changed, failed = record_visits(
+                    run,
+                    entries,
+                    results,
+                    product_store_ids,
+                )
+                visited += count
+                self.stdout.write(
+                    f"{visited} URLs: {changed} preços mudaram, {failed} falhas "
+                    f"no lote (espera do limite: {limiter.waited:.0f}s).",
+                )
+        except KeyboardInterrupt:
+            finish_run(run, CrawlRunStatus.INTERRUPTED)
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Execução #{run.pk} interrompida; rode de novo para retomar.",
+                ),
+            )
+            return
+
+        finish_run(run)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Execução #{run.pk} concluída: {run.visited} visitadas, "
+                f"{run.changed} com preço novo, {run.failed} falhas.",
+            ),
+        )
+
+    def scrape(self, entries, budget, limiter, headless):
+        """
+        Coleta as URLs do lote, um scraper por categoria, com a concorrência e o
+        limite de requisições da loja. Retorna {url: produto}.
+        """
+        results = {}
+        entries = sorted(entries, key=lambda entry: entry.category)
+        for category, group in groupby(entries, key=lambda entry: entry.category):
+            scraper = get_scraper(
+                entries[0].store,
+                category=Categories[category.upper()],
+                workers=budget["concurrency"],
+            )
+            scraper.rate_limiter = limiter
+            results.update(
+                scraper.scrape_urls([entry.url for entry in group], headless=headless),
+            )
+        return results
@@ -0,0 +1,107 @@
+from api.controllers.crawl_controller import crawl_budget
+from django.core.management.base import BaseCommand
+from scrapy.crawler import CrawlerProcess
+from scrapy.settings import Settings
+
+from track_save.webscrapping_amazon.crawler.spiders.amazon import AmazonSpider
+from track_save.webscrapping_amazon.crawler.spiders.terabyte import TerabyteSpider
+
+SPIDERS = {
+    "terabyte": TerabyteSpider,
+    "amazon": AmazonSpider,
+}
+STORE_DOMAINS = {
+    "terabyte": "www.terabyteshop.com.br",
+    "amazon": "www.amazon.com.br",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Coleta Terabyte e Amazon só com HTTP (Scrapy + AutoThrottle) "
+        "e grava os produtos via ingest_products."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "spiders",
+            nargs="*",
+            choices=sorted(SPIDERS),
+            help="Lojas a coletar (padrão: todas).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Itens por chamada de ingest_products.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Requisições simultâneas por domínio.",
+        )
+        parser.add_argument(
+            "--archive",
+            default=None,
+            help="Diretório de um PageArchive (ver --archive-mode).",
+        )
+        parser.add_argument(
+            "--archive-mode",
+            choices=["record", "replay"],
+            default="replay",
+            help="record grava as respostas; replay coleta do arquivo, sem rede.",
+        )
+
+    def handle(self, *args, **options):
+        settings = Settings()
+        settings.setmodule(
+            "track_save.webscrapping_amazon.crawler.settings",
+            priority="project",
+        )
+        if options["batch_size"]:
+            settings.set("INGEST_BATCH_SIZE", options["batch_size"], priority="cmdline")
+        # Concorrência e intervalo por domínio vêm de settings.CRAWL_STORE_BUDGETS
+        slots = {}
+        for store, domain in STORE_DOMAINS.items():
+            budget = crawl_budget(store)
+            slots[domain] = {
+                "concurrency": options["concurrency"] or budget["concurrency"],
+                "delay": 60.0 / budget["requests_per_minute"],
+            }
+        settings.set("DOWNLOAD_SLOTS", slots, priority="cmdline")
+        if options["concurrency"]:
+            settings.set(
+                "CONCURRENT_REQUESTS_PER_DOMAIN",
+                options["concurrency"],
+                priority="cmdline",
+            )
+
+        if options["archive"]:
+            settings.set("PAGE_ARCHIVE_DIR", options["archive"], priority="cmdline")
+            settings.set(
+                "PAGE_ARCHIVE_MODE",
+                options["archive_mode"],
+                priority="cmdline",
+            )
+
+        process = CrawlerProcess(settings)
+        crawlers = []
+        for name in options["spiders"] or sorted(SPIDERS):
+            crawler = process.create_crawler(SPIDERS[name])
+            crawlers.append(crawler)
+            process.crawl(crawler)
+        process.start()
+
+        for crawler in crawlers:
+            stats = crawler.stats.get_stats()
+            ingest = {
+                key.removeprefix("ingest/"): value
+                for key, value in stats.items()
+                if key.startswith("ingest/")
+            }
+            self.stdout.write(
+                f"{crawler.spidercls.name}: "
+                f"{stats.get('response_received_count', 0)} páginas, "
+                f"{stats.get('item_scraped_count', 0)} itens, ingestão: {ingest}",
+            )
@@ -0,0 +1,104 @@
+import time
+from collections import Counter
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from api.controllers.ingest_controller import ingest_products
+from api.controllers.ingest_controller import summarize_outcomes
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from track_save.webscraping.scrapers.record_stream import chunked
+from track_save.webscraping.scrapers.record_stream import iter_records
+from track_save.webscrapping_amazon.scraper import armazena_tera_amazon
+
+DEFAULT_PATHS = {
+    "terabyte": armazena_tera_amazon.file_path_tera,
+    "amazon": armazena_tera_amazon.file_path_amazon,
+}
+
+
+def normalized_chunks(loja, chunks, workers):
+    """
+    (produtos lidos, registros normalizados) por lote, na ordem do arquivo.
+    Com workers > 1 a normalização roda num pool de processos, com no máximo
+    2 lotes por worker em andamento para a memória não crescer com o arquivo.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield len(chunk), armazena_tera_amazon.ingest_records(loja, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            future = pool.submit(armazena_tera_amazon.ingest_records, loja, chunk)
+            pending.append((len(chunk), future))
+            if len(pending) >= workers * 2:
+                size, future = pending.popleft()
+                yield size, future.result()
+        while pending:
+            size, future = pending.popleft()
+            yield size, future.result()
+
+
+class Command(BaseCommand):
+    help = (
+        "Lê o arquivo de resultados da Terabyte/Amazon em streaming (JSON ou "
+        "NDJSON, opcionalmente .gz) e grava os produtos em lotes via ingest_products."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("loja", choices=sorted(DEFAULT_PATHS))
+        parser.add_argument(
+            "--path",
+            default=None,
+            help="Arquivo de resultados (padrão: o *_perfeito.json da loja).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Produtos por chamada de ingest_products.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processos para normalizar os lotes (1 = no próprio processo).",
+        )
+
+    def handle(self, *args, **options):
+        loja = options["loja"]
+        path = Path(options["path"] or DEFAULT_PATHS[loja])
+        if not path.exists():
+            msg = f"Arquivo não encontrado: {path}"
+            raise CommandError(msg)
+        if options["chunk_size"] < 1:
+            msg = "--chunk-size deve ser maior que zero."
+            raise CommandError(msg)
+
+        chunks = chunked(iter_records(path), options["chunk_size"])
+        totals = Counter()
+        lidos = 0
+        started = time.monotonic()
+        for size, records in normalized_chunks(loja, chunks, options["workers"]):
+            lidos += size
+            totals["ignored"] += size - len(records)
+            if records:
+                totals.update(summarize_outcomes(ingest_products(records)))
+            elapsed = max(time.monotonic() - started, 0.001)
+            self.stdout.write(
+                f"{lidos} produtos lidos ({lidos / elapsed:.0f}/s): "
+                f"{totals['created']} criados, {totals['updated']} atualizados, "
+                f"{totals['unchanged']} sem mudança, {totals['error']} erros, "
+                f"{totals['ignored']} ignorados",
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{loja}: {lidos} produtos lidos de {path}, "
+                f"{totals['prices_created']} preços gravados.",
+            ),
+        )
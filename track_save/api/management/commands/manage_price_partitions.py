@@ -0,0 +1,35 @@
+import time
+
+from api.controllers.price_controller import ensure_price_partitions
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Cria as partições mensais de api_price do mês atual até N meses à frente."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.PRICE_PARTITIONS_AHEAD,
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Repete a verificação a cada --interval segundos em vez de sair.",
+        )
+        parser.add_argument("--interval", type=float, default=60 * 60 * 24)
+
+    def handle(self, *args, **options):
+        while True:
+            months = ensure_price_partitions(options["months_ahead"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Partições garantidas de {months[0]:%Y-%m} "
+                    f"até {months[-1]:%Y-%m}.",
+                ),
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
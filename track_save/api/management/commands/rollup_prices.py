@@ -0,0 +1,48 @@
+import time
+
+from api.controllers.price_controller import rollup_prices
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Agrega pontos de preço antigos em PriceRollup (diário/semanal) "
+        "e remove os pontos brutos fora da retenção."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--raw-retention-days",
+            type=int,
+            default=settings.PRICE_RAW_RETENTION_DAYS,
+        )
+        parser.add_argument(
+            "--daily-retention-days",
+            type=int,
+            default=settings.PRICE_DAILY_ROLLUP_RETENTION_DAYS,
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Repete a agregação a cada --interval segundos em vez de sair.",
+        )
+        parser.add_argument("--interval", type=float, default=60 * 60 * 24)
+
+    def handle(self, *args, **options):
+        while True:
+            stats = rollup_prices(
+                raw_retention_days=options["raw_retention_days"],
+                daily_retention_days=options["daily_retention_days"],
+            )
+            dropped = ", ".join(stats["dropped_partitions"]) or "-"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{stats['daily_buckets']} buckets diários, "
+                    f"{stats['weekly_buckets']} semanais, "
+                    f"partições descartadas: {dropped}",
+                ),
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
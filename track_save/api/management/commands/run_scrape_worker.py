@@ -0,0 +1,90 @@
+import os
+import socket
+import time
+
+from api.controllers.scrape_job_controller import claim_next_job
+from api.controllers.scrape_job_controller import complete_job
+from api.controllers.scrape_job_controller import fail_job
+from api.controllers.scrape_job_controller import job_heartbeat
+from api.controllers.scrape_job_controller import requeue_stale_jobs
+from api.controllers.scrape_job_controller import update_progress
+from django.core.management.base import BaseCommand
+
+from track_save.webscraping.enums import Categories
+from track_save.webscraping.scrapers.sinks import OrmBulkSink
+from track_save.webscraping.webscraping_factory import get_scraper
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa os ScrapeJob enfileirados pela API de webscraping, "
+        "fora do processo web."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Continua consumindo a fila em vez de sair quando ela esvaziar.",
+        )
+        parser.add_argument("--interval", type=float, default=5.0)
+        parser.add_argument(
+            "--headed",
+            action="store_true",
+            help="Abre o navegador com interface.",
+        )
+
+    def handle(self, *args, **options):
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        while True:
+            requeued = requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(f"{requeued} jobs abandonados voltaram para a fila.")
+
+            job = claim_next_job(worker)
+            if job is not None:
+                self.run_job(job, headless=not options["headed"])
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def run_job(self, job, headless):
+        self.stdout.write(
+            f"Job #{job.pk}: {job.store} {', '.join(job.categories)} "
+            f"(tentativa {job.attempts}).",
+        )
+        # Os produtos vão para o banco durante a coleta; o job guarda só os
+        # arquivos de resultados (ver ScrapeJobAPIView)
+        result_files = []
+        products = 0
+        # o worker já tem o Django carregado: grava direto, sem passar pela API
+        sink = OrmBulkSink()
+        try:
+            # O heartbeat é renovado durante a coleta, não só entre categorias
+            with job_heartbeat(job):
+                for done, name in enumerate(job.categories):
+                    update_progress(job, current_category=name, categories_done=done)
+                    scraper = get_scraper(
+                        job.store,
+                        category=Categories[name],
+                        sink=sink,
+                        **job.options,
+                    )
+                    result_files.append(str(scraper.run(headless=headless)))
+                    products += scraper.writer.count
+                    update_progress(
+                        job,
+                        categories_done=done + 1,
+                        products=products,
+                        result_files=result_files,
+                    )
+        except Exception as e:  # noqa: BLE001
+            fail_job(job, e)
+            self.stdout.write(self.style.ERROR(f"Job #{job.pk} falhou: {e}"))
+            return
+
+        complete_job(job)
+        self.stdout.write(
+            self.style.SUCCESS(f"Job #{job.pk} concluído: {products} produtos."),
+        )
@@ -0,0 +1,34 @@
+import time
+
+from api.controllers.alert_controller import ALERT_NOTIFICATION_BATCH_SIZE
+from api.controllers.alert_controller import process_alert_notifications
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Envia os emails da fila de alertas disparados (AlertNotification)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ALERT_NOTIFICATION_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Continua consumindo a fila em vez de sair quando ela esvaziar.",
+        )
+        parser.add_argument("--interval", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = process_alert_notifications(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"{sent} enviadas, {failed} com falha.")
+            if sent:
+                continue
+            if not options["loop"]:
+                break
+            # fila vazia ou só com falhas ainda no backoff: espera o próximo lote
+            time.sleep(options["interval"])
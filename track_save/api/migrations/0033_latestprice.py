@@ -0,0 +1,49 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0032_alter_storereputation_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('previous_value', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                ('collection_date', models.DateField()),
+                ('product_store', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='latest_price', to='api.productstore')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['value'], name='api_latestp_value_ade569_idx')],
+            },
+        ),
+        # Popula a tabela com o último preço (e o anterior) de cada ProductStore
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO api_latestprice (product_store_id, value, previous_value, collection_date)
+                SELECT DISTINCT ON (product_store_id)
+                    product_store_id, value, previous_value, collection_date
+                FROM (
+                    SELECT
+                        id,
+                        product_store_id,
+                        value,
+                        collection_date,
+                        LAG(value) OVER (
+                            PARTITION BY product_store_id
+                            ORDER BY collection_date, id
+                        ) AS previous_value
+                    FROM api_price
+                ) history
+                ORDER BY product_store_id, collection_date DESC, id DESC;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
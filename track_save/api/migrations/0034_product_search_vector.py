@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0033_latestprice'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # Popula o vetor dos produtos existentes (nome com peso A, descrição com peso B)
+        migrations.RunSQL(
+            sql="""
+                UPDATE api_product
+                SET search_vector =
+                    setweight(to_tsvector('portuguese', coalesce(name, '')), 'A')
+                    || setweight(to_tsvector('portuguese', coalesce(description, '')), 'B');
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='api_product_search__d4f0fe_gin'),
+        ),
+        # O índice por expressão da 0021 não é mais usado pela busca
+        migrations.RunSQL(
+            sql="DROP INDEX IF EXISTS product_search_idx;",
+            reverse_sql="""
+                CREATE INDEX product_search_idx
+                ON api_product
+                USING gin (to_tsvector('portuguese', name || ' ' || description));
+            """,
+        ),
+    ]
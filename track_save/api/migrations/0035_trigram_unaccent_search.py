@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:40
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.operations import UnaccentExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0034_product_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        UnaccentExtension(),
+        # unaccent() é STABLE; o wrapper IMMUTABLE permite usá-lo em índice de expressão
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION immutable_unaccent(text)
+                RETURNS text
+                AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS immutable_unaccent(text);",
+        ),
+        # Serve o operador <% e word_similarity() da busca aproximada
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS product_name_description_trgm_idx
+                ON api_product
+                USING gin (immutable_unaccent(lower(name || ' ' || description)) gin_trgm_ops);
+            """,
+            reverse_sql="DROP INDEX IF EXISTS product_name_description_trgm_idx;",
+        ),
+    ]
@@ -0,0 +1,147 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Cria (se faltar) a partição mensal de api_price que contém `month`,
+# movendo para ela as linhas que estiverem na partição default.
+ENSURE_PARTITION_FUNCTION = """
+    CREATE OR REPLACE FUNCTION api_price_ensure_partition(month date)
+    RETURNS void AS $$
+    DECLARE
+        start_date date := date_trunc('month', month)::date;
+        end_date date := (date_trunc('month', month) + interval '1 month')::date;
+        part text := format('api_price_p%s', to_char(start_date, 'YYYYMM'));
+    BEGIN
+        IF to_regclass(part) IS NOT NULL THEN
+            RETURN;
+        END IF;
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE api_price INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+            part
+        );
+        EXECUTE format(
+            'WITH moved AS (
+                DELETE FROM api_price_default
+                WHERE collection_date >= %L AND collection_date < %L
+                RETURNING *
+            )
+            INSERT INTO %I SELECT * FROM moved',
+            start_date, end_date, part
+        );
+        EXECUTE format(
+            'ALTER TABLE api_price ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            part, start_date, end_date
+        );
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+PARTITION_PRICE = """
+    ALTER TABLE api_price RENAME TO api_price_legacy;
+    ALTER TABLE api_price_legacy RENAME CONSTRAINT api_price_pkey TO api_price_legacy_pkey;
+
+    -- A chave primária precisa conter a chave de particionamento
+    CREATE TABLE api_price (
+        id bigint NOT NULL,
+        value numeric(8, 2) NOT NULL,
+        collection_date date NOT NULL,
+        product_store_id bigint NOT NULL,
+        PRIMARY KEY (id, collection_date)
+    ) PARTITION BY RANGE (collection_date);
+
+    CREATE TABLE api_price_default PARTITION OF api_price DEFAULT;
+""" + ENSURE_PARTITION_FUNCTION + """
+    DO $$
+    DECLARE
+        month date;
+    BEGIN
+        FOR month IN
+            SELECT generate_series(
+                date_trunc('month', COALESCE((SELECT min(collection_date) FROM api_price_legacy), current_date)),
+                date_trunc('month', current_date) + interval '3 months',
+                interval '1 month'
+            )::date
+        LOOP
+            PERFORM api_price_ensure_partition(month);
+        END LOOP;
+    END $$;
+
+    INSERT INTO api_price (id, value, collection_date, product_store_id)
+    SELECT id, value, collection_date, product_store_id FROM api_price_legacy;
+
+    DROP TABLE api_price_legacy;
+
+    CREATE SEQUENCE api_price_id_seq OWNED BY api_price.id;
+    ALTER TABLE api_price ALTER COLUMN id SET DEFAULT nextval('api_price_id_seq');
+    SELECT setval('api_price_id_seq', COALESCE((SELECT max(id) FROM api_price), 0) + 1, false);
+
+    ALTER TABLE api_price
+        ADD CONSTRAINT api_price_product_store_id_5da80d7a_fk_api_productstore_id
+        FOREIGN KEY (product_store_id) REFERENCES api_productstore (id)
+        DEFERRABLE INITIALLY DEFERRED;
+    CREATE INDEX api_price_product_store_id_5da80d7a ON api_price (product_store_id);
+"""
+
+UNPARTITION_PRICE = """
+    ALTER TABLE api_price RENAME TO api_price_partitioned;
+    ALTER TABLE api_price_partitioned RENAME CONSTRAINT api_price_pkey TO api_price_partitioned_pkey;
+    ALTER SEQUENCE api_price_id_seq RENAME TO api_price_partitioned_id_seq;
+    ALTER INDEX api_price_product_store_id_5da80d7a RENAME TO api_price_partitioned_product_store_id;
+
+    CREATE TABLE api_price (
+        id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        value numeric(8, 2) NOT NULL,
+        collection_date date NOT NULL,
+        product_store_id bigint NOT NULL
+    );
+
+    INSERT INTO api_price (id, value, collection_date, product_store_id)
+    SELECT id, value, collection_date, product_store_id FROM api_price_partitioned;
+    SELECT setval(
+        pg_get_serial_sequence('api_price', 'id'),
+        COALESCE((SELECT max(id) FROM api_price), 0) + 1,
+        false
+    );
+
+    DROP TABLE api_price_partitioned CASCADE;
+    DROP FUNCTION IF EXISTS api_price_ensure_partition(date);
+
+    ALTER TABLE api_price
+        ADD CONSTRAINT api_price_product_store_id_5da80d7a_fk_api_productstore_id
+        FOREIGN KEY (product_store_id) REFERENCES api_productstore (id)
+        DEFERRABLE INITIALLY DEFERRED;
+    CREATE INDEX api_price_product_store_id_5da80d7a ON api_price (product_store_id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0035_trigram_unaccent_search'),
+    ]
+
+    operations = [
+        # Converte api_price em tabela particionada por mês de collection_date
+        migrations.RunSQL(sql=PARTITION_PRICE, reverse_sql=UNPARTITION_PRICE),
+        migrations.AddIndex(
+            model_name='price',
+            index=models.Index(fields=['product_store', 'collection_date'], name='api_price_product_0cb39f_idx'),
+        ),
+        migrations.CreateModel(
+            name='PriceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('week', 'Week')], max_length=4)),
+                ('bucket_start', models.DateField()),
+                ('min_value', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('avg_value', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('max_value', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('sample_count', models.PositiveIntegerField()),
+                ('product_store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.productstore')),
+            ],
+            options={
+                'unique_together': {('product_store', 'granularity', 'bucket_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0037_alert_last_notified_price_alertnotification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productstore',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+    ]
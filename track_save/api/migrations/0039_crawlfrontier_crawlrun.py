@@ -0,0 +1,57 @@
+# Generated by Django 5.2.3 on 2026-10-18 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0038_productstore_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlFrontier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('store', models.CharField(max_length=50)),
+                ('category', models.CharField(choices=[('computer', 'Computer'), ('keyboard', 'Keyboard'), ('mouse', 'Mouse'), ('monitor', 'Monitor'), ('motherboard', 'Motherboard'), ('ram', 'Ram'), ('gpu', 'Gpu'), ('cpu', 'Cpu'), ('storage', 'Storage')], max_length=20)),
+                ('url', models.TextField()),
+                ('next_due_at', models.DateTimeField()),
+                ('interval_hours', models.FloatField()),
+                ('last_value', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                ('last_crawled_at', models.DateTimeField(blank=True, null=True)),
+                ('last_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('crawl_count', models.PositiveIntegerField(default=0)),
+                ('change_count', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveSmallIntegerField(default=0)),
+                ('leased_until', models.DateTimeField(blank=True, null=True)),
+                ('product_store', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='api.productstore')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['store', 'next_due_at'], name='api_crawlfr_store_9c41e2_idx')],
+                'constraints': [models.UniqueConstraint(fields=('store', 'url'), name='api_crawlfrontier_store_url_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CrawlRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('store', models.CharField(max_length=50)),
+                ('category', models.CharField(blank=True, default='', max_length=20)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('interrupted', 'Interrupted'), ('finished', 'Finished')], default='running', max_length=12)),
+                ('due_before', models.DateTimeField()),
+                ('visited', models.PositiveIntegerField(default=0)),
+                ('changed', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('checkpoint', models.JSONField(blank=True, default=dict)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['store', 'status'], name='api_crawlru_store_4b7d0a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0040_scrapejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertnotification',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
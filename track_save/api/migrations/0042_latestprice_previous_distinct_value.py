@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0041_alertnotification_next_attempt_at'),
+    ]
+
+    operations = [
+        # 0033 preencheu previous_value com a linha anterior (LAG), mesmo quando
+        # ela tinha o mesmo valor; record_latest_price e refresh_latest_price
+        # guardam o último valor diferente do atual
+        migrations.RunSQL(
+            sql="""
+                UPDATE api_latestprice lp
+                SET previous_value = (
+                    SELECT p.value
+                    FROM api_price p
+                    WHERE p.product_store_id = lp.product_store_id
+                      AND p.value <> lp.value
+                    ORDER BY p.collection_date DESC, p.id DESC
+                    LIMIT 1
+                );
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
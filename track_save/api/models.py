@@ -1,12 +1,18 @@
 # Create your models here.
 from api.entities.alert import Alert
+from api.entities.alert import AlertNotification
+from api.entities.crawl import CrawlFrontier
+from api.entities.crawl import CrawlRun
 from api.entities.favorite import Favorite
 from api.entities.preference import Preference
+from api.entities.price import LatestPrice
 from api.entities.price import Price
+from api.entities.price import PriceRollup
 from api.entities.product import Product
 from api.entities.product import ProductStore
 from api.entities.product import Store
 from api.entities.product import StoreReputation
+from api.entities.scrape_job import ScrapeJob
 from api.entities.subscription import Subscription
 from api.entities.subscription import SubscriptionUser
 from api.entities.user import User
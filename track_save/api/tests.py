@@ -1,3 +1,490 @@
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from api.controllers.alert_controller import evaluate_alerts
+from api.controllers.alert_controller import process_alert_notifications
+from api.controllers.crawl_controller import record_visits
+from api.controllers.crawl_controller import start_run
+from api.controllers.ingest_controller import ingest_products
+from api.controllers.price_controller import create_prices_bulk
+from api.controllers.price_controller import refresh_latest_price
+from api.controllers.price_controller import rollup_prices
+from api.controllers.price_series_controller import get_price_series
+from api.entities.alert import Alert
+from api.entities.alert import AlertNotification
+from api.entities.alert import AlertNotificationStatus
+from api.entities.crawl import CrawlFrontier
+from api.entities.price import LatestPrice
+from api.entities.price import Price
+from api.entities.price import PriceRollup
+from api.entities.product import Product
+from api.entities.product import ProductCategory
+from api.entities.product import ProductStore
+from api.entities.product import Store
+from api.entities.user import User
+from django.db import connection
+from django.db import transaction
 from django.test import TestCase
+from django.test import override_settings
+from django.utils import timezone
+
+
+def make_product_store(name="Placa de vídeo", store=None):
+    store = store or Store.objects.create(
+        name="Kabum",
+        url_base="https://www.kabum.com.br",
+    )
+    product = Product.objects.create(
+        name=name,
+        category=ProductCategory.GPU,
+        image_url="",
+    )
+    return ProductStore.objects.create(
+        product=product,
+        store=store,
+        url_product=f"https://www.kabum.com.br/produto/{product.pk}",
+        available=True,
+    )
+
+
+class CreatePricesBulkTests(TestCase):
+    def test_two_calls_in_the_same_transaction(self):
+        # Com ATOMIC_REQUESTS, get_terabyte chama create_prices_bulk uma vez por
+        # lote dentro da mesma transação
+        ps = make_product_store()
+        with transaction.atomic():
+            create_prices_bulk([(ps.pk, "100.00", date(2026, 1, 1))])
+            create_prices_bulk([(ps.pk, "90.00", date(2026, 1, 2))])
+
+        self.assertEqual(
+            list(
+                Price.objects.filter(product_store=ps)
+                .order_by("collection_date")
+                .values_list("value", flat=True),
+            ),
+            [Decimal("100.00"), Decimal("90.00")],
+        )
+
+    def test_unchanged_values_are_not_inserted_again(self):
+        ps = make_product_store()
+        create_prices_bulk([(ps.pk, "100.00", date(2026, 1, 1))])
+
+        inserted = create_prices_bulk(
+            [
+                (ps.pk, "100.00", date(2026, 1, 2)),
+                (ps.pk, "90.00", date(2026, 1, 3)),
+                (ps.pk, "90.00", date(2026, 1, 4)),
+            ],
+        )
+
+        self.assertEqual(inserted, [(ps.pk, Decimal("90.00"), date(2026, 1, 3))])
+        self.assertEqual(Price.objects.filter(product_store=ps).count(), 2)
+        latest = LatestPrice.objects.get(product_store=ps)
+        self.assertEqual(latest.value, Decimal("90.00"))
+        self.assertEqual(latest.previous_value, Decimal("100.00"))
+        # a última coleta (sem mudança de valor) também conta como atual
+        self.assertEqual(latest.collection_date, date(2026, 1, 4))
+
+    def test_unchanged_rescrape_advances_collection_date(self):
+        ps = make_product_store()
+        create_prices_bulk([(ps.pk, "100.00", date(2026, 1, 1))])
+        create_prices_bulk([(ps.pk, "90.00", date(2026, 1, 2))])
+
+        inserted = create_prices_bulk([(ps.pk, "90.00", date(2026, 1, 5))])
+
+        self.assertEqual(inserted, [])
+        latest = LatestPrice.objects.get(product_store=ps)
+        self.assertEqual(latest.value, Decimal("90.00"))
+        self.assertEqual(latest.previous_value, Decimal("100.00"))
+        self.assertEqual(latest.collection_date, date(2026, 1, 5))
+
+    def test_older_collection_does_not_replace_latest_price(self):
+        ps = make_product_store()
+        create_prices_bulk([(ps.pk, "100.00", date(2026, 1, 10))])
+
+        inserted = create_prices_bulk([(ps.pk, "80.00", date(2026, 1, 5))])
+
+        # entra no histórico, mas o preço atual continua o da coleta mais nova
+        self.assertEqual(len(inserted), 1)
+        latest = LatestPrice.objects.get(product_store=ps)
+        self.assertEqual(latest.value, Decimal("100.00"))
+        self.assertEqual(latest.collection_date, date(2026, 1, 10))
+        self.assertIsNone(latest.previous_value)
+
+
+class RefreshLatestPriceTests(TestCase):
+    def test_previous_value_is_the_last_distinct_value(self):
+        ps = make_product_store()
+        for value, day in (("100.00", 1), ("90.00", 2), ("90.00", 3)):
+            Price.objects.create(
+                product_store=ps,
+                value=value,
+                collection_date=date(2026, 1, day),
+            )
+
+        latest = refresh_latest_price(ps.pk)
+
+        self.assertEqual(latest.value, Decimal("90.00"))
+        self.assertEqual(latest.collection_date, date(2026, 1, 3))
+        self.assertEqual(latest.previous_value, Decimal("100.00"))
+
+    def test_no_history_removes_latest_price(self):
+        ps = make_product_store()
+        LatestPrice.objects.create(
+            product_store=ps,
+            value="50.00",
+            collection_date=date(2026, 1, 1),
+        )
+
+        self.assertIsNone(refresh_latest_price(ps.pk))
+        self.assertFalse(LatestPrice.objects.filter(product_store=ps).exists())
+
+
+class GetPriceSeriesTests(TestCase):
+    def test_price_written_by_another_process_invalidates_cache(self):
+        # No TestCase o on_commit não roda: o bump de versão não chega ao
+        # cache, como acontece com preços gravados pelos workers
+        ps = make_product_store()
+        create_prices_bulk([(ps.pk, "100.00", date(2026, 1, 1))])
+        window = {"start": date(2026, 1, 1), "end": date(2026, 1, 31)}
+
+        before = get_price_series([ps.pk], method="lttb", **window)
+        create_prices_bulk([(ps.pk, "90.00", date(2026, 1, 2))])
+        after = get_price_series([ps.pk], method="lttb", **window)
+
+        self.assertEqual(before["series"][0]["value"], [100.0])
+        self.assertEqual(after["series"][0]["value"], [100.0, 90.0])
+
+
+class RollupPricesTests(TestCase):
+    def setUp(self):
+        self.ps = make_product_store()
+        today = timezone.localdate()
+        # segunda-feira de uma semana bem anterior às retenções usadas
+        self.monday = today - timedelta(days=today.weekday() + 7 * 20)
+        self.today = today
+
+    def add_price(self, value, collection_date):
+        return Price.objects.create(
+            product_store=self.ps,
+            value=value,
+            collection_date=collection_date,
+        )
+
+    def test_old_points_become_daily_buckets(self):
+        self.add_price("100.00", self.monday)
+        self.add_price("80.00", self.monday)
+        recent = self.add_price("90.00", self.today)
+
+        stats = rollup_prices(raw_retention_days=30, daily_retention_days=365)
+
+        self.assertEqual(stats["daily_buckets"], 1)
+        rollup = PriceRollup.objects.get(product_store=self.ps)
+        self.assertEqual(rollup.granularity, "day")
+        self.assertEqual(rollup.bucket_start, self.monday)
+        self.assertEqual(
+            (rollup.min_value, rollup.avg_value, rollup.max_value),
+            (Decimal("80.00"), Decimal("90.00"), Decimal("100.00")),
+        )
+        self.assertEqual(rollup.sample_count, 2)
+        self.assertEqual(list(Price.objects.filter(product_store=self.ps)), [recent])
+
+    def test_old_daily_buckets_become_weekly(self):
+        self.add_price("100.00", self.monday)
+        self.add_price("80.00", self.monday + timedelta(days=1))
+        self.add_price("60.00", self.monday + timedelta(days=1))
+
+        rollup_prices(raw_retention_days=30, daily_retention_days=30)
+
+        rollup = PriceRollup.objects.get(product_store=self.ps)
+        self.assertEqual(rollup.granularity, "week")
+        self.assertEqual(rollup.bucket_start, self.monday)
+        self.assertEqual(
+            (rollup.min_value, rollup.avg_value, rollup.max_value),
+            (Decimal("60.00"), Decimal("80.00"), Decimal("100.00")),
+        )
+        self.assertEqual(rollup.sample_count, 3)
+
+    def test_partitions_before_the_cutoff_are_dropped(self):
+        month = (self.monday - timedelta(days=60)).replace(day=1)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT api_price_ensure_partition(%s)", [month])
+        self.add_price("100.00", month)
+
+        stats = rollup_prices(raw_retention_days=30, daily_retention_days=365)
+
+        self.assertEqual(
+            stats["dropped_partitions"],
+            [f"api_price_p{month:%Y%m}"],
+        )
+        self.assertFalse(Price.objects.filter(product_store=self.ps).exists())
+        self.assertTrue(
+            PriceRollup.objects.filter(
+                product_store=self.ps,
+                bucket_start=month,
+            ).exists(),
+        )
+
+
+class EvaluateAlertsTests(TestCase):
+    def setUp(self):
+        self.ps = make_product_store()
+        self.user = User.objects.create(
+            email="cliente@example.com",
+            name="Cliente",
+            is_verified=True,
+        )
+        today = timezone.localdate()
+        self.alert = Alert.objects.create(
+            user=self.user,
+            product=self.ps.product,
+            desired_price="100.00",
+            expires_at=today + timedelta(days=30),
+            created_at=today,
+        )
+
+    def set_price(self, value):
+        LatestPrice.objects.update_or_create(
+            product_store=self.ps,
+            defaults={"value": value, "collection_date": timezone.localdate()},
+        )
+
+    def test_price_at_or_below_desired_queues_one_notification(self):
+        self.set_price("120.00")
+        self.assertEqual(evaluate_alerts([self.ps.pk]), [])
+
+        self.set_price("95.00")
+        notifications = evaluate_alerts([self.ps.pk])
+
+        self.assertEqual(len(notifications), 1)
+        self.assertEqual(notifications[0].price, Decimal("95.00"))
+        self.assertEqual(notifications[0].status, AlertNotificationStatus.PENDING)
+        self.alert.refresh_from_db()
+        self.assertEqual(self.alert.last_notified_price, Decimal("95.00"))
+
+    def test_same_or_higher_price_is_not_notified_again(self):
+        self.set_price("95.00")
+        evaluate_alerts([self.ps.pk])
+
+        self.assertEqual(evaluate_alerts([self.ps.pk]), [])
+        self.set_price("98.00")
+        self.assertEqual(evaluate_alerts([self.ps.pk]), [])
+        self.set_price("90.00")
+        self.assertEqual(len(evaluate_alerts([self.ps.pk])), 1)
+        self.assertEqual(AlertNotification.objects.count(), 2)
+
+    def test_inactive_and_expired_alerts_are_ignored(self):
+        self.set_price("50.00")
+        Alert.objects.filter(pk=self.alert.pk).update(is_active=False)
+        self.assertEqual(evaluate_alerts([self.ps.pk]), [])
+
+        Alert.objects.filter(pk=self.alert.pk).update(
+            is_active=True,
+            expires_at=timezone.localdate() - timedelta(days=1),
+        )
+        self.assertEqual(evaluate_alerts([self.ps.pk]), [])
+
+    def test_failed_notification_waits_for_the_backoff(self):
+        self.set_price("95.00")
+        evaluate_alerts([self.ps.pk])
+
+        with patch(
+            "api.controllers.alert_controller.deliver_alert_email",
+            side_effect=RuntimeError("smtp fora do ar"),
+        ):
+            self.assertEqual(process_alert_notifications(), (0, 1))
+            # a falha só volta à fila depois de next_attempt_at
+            self.assertEqual(process_alert_notifications(), (0, 0))
+
+        notification = AlertNotification.objects.get()
+        self.assertEqual(notification.attempts, 1)
+        self.assertEqual(notification.status, AlertNotificationStatus.PENDING)
+        self.assertGreater(notification.next_attempt_at, timezone.now())
+
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=UTC)
+
+
+@override_settings(
+    CRAWL_DEFAULT_INTERVAL_HOURS=24.0,
+    CRAWL_MIN_INTERVAL_HOURS=6.0,
+    CRAWL_MAX_INTERVAL_HOURS=48.0,
+    CRAWL_INTERVAL_SHRINK=0.5,
+    CRAWL_INTERVAL_GROWTH=1.5,
+)
+class RecordVisitsTests(TestCase):
+    url = "https://www.kabum.com.br/produto/1"
+
+    def setUp(self):
+        self.run, _ = start_run("kabum")
+
+    def make_entry(self, interval_hours=24.0, last_value=None):
+        return CrawlFrontier.objects.create(
+            store="kabum",
+            category="gpu",
+            url=self.url,
+            next_due_at=NOW,
+            interval_hours=interval_hours,
+            last_value=last_value,
+        )
+
+    def visit(self, entry, value):
+        results = {} if value is None else {self.url: {"value": value}}
+        with patch("django.utils.timezone.now", return_value=NOW):
+            counts = record_visits(self.run, [entry], results)
+        entry.refresh_from_db()
+        return counts
+
+    def test_first_visit_keeps_the_default_interval(self):
+        entry = self.make_entry()
+
+        self.assertEqual(self.visit(entry, "100.00"), (1, 0, 0))
+        self.assertEqual(entry.interval_hours, 24.0)
+        self.assertEqual(entry.last_value, Decimal("100.00"))
+        self.assertEqual(entry.next_due_at, NOW + timedelta(hours=24))
+
+    def test_interval_grows_when_stable_and_shrinks_on_change(self):
+        entry = self.make_entry(last_value="100.00")
+
+        self.visit(entry, "100.00")
+        self.assertEqual(entry.interval_hours, 36.0)
+
+        self.assertEqual(self.visit(entry, "90.00"), (1, 1, 0))
+        self.assertEqual(entry.interval_hours, 18.0)
+        self.assertEqual(entry.change_count, 1)
+        self.assertEqual(entry.last_changed_at, NOW)
+        self.assertEqual(entry.next_due_at, NOW + timedelta(hours=18))
+
+    def test_interval_is_clamped(self):
+        entry = self.make_entry(interval_hours=40.0, last_value="100.00")
+        self.visit(entry, "100.00")
+        self.assertEqual(entry.interval_hours, 48.0)
+
+        entry = CrawlFrontier.objects.get(pk=entry.pk)
+        entry.interval_hours = 8.0
+        self.visit(entry, "90.00")
+        self.assertEqual(entry.interval_hours, 6.0)
+
+    def test_failures_back_off_exponentially_up_to_the_max(self):
+        entry = self.make_entry(last_value="100.00")
+
+        retries = []
+        for _ in range(5):
+            self.assertEqual(self.visit(entry, None), (1, 0, 1))
+            retries.append(entry.next_due_at - NOW)
+
+        self.assertEqual(
+            retries,
+            [timedelta(hours=hours) for hours in (6, 12, 24, 48, 48)],
+        )
+        # a falha não mexe no intervalo adaptativo
+        self.assertEqual(entry.interval_hours, 24.0)
+
+        self.visit(entry, "100.00")
+        self.assertEqual(entry.failures, 0)
+        self.assertEqual(entry.interval_hours, 36.0)
+
+    def test_checkpoint_and_run_counters(self):
+        entry = self.make_entry(last_value="100.00")
+        self.visit(entry, "90.00")
+        self.visit(entry, None)
+
+        self.run.refresh_from_db()
+        self.assertEqual(
+            (self.run.visited, self.run.changed, self.run.failed),
+            (2, 1, 1),
+        )
+        self.assertEqual(self.run.checkpoint["batches"], 2)
+        self.assertEqual(self.run.checkpoint["last_url"], self.url)
+
+
+def gpu_record(name, **fields):
+    return {
+        "name": name,
+        "category": "gpu",
+        "image_url": "https://images.kabum.com.br/gpu.jpg",
+        "brand": "Asus",
+        "store": "Kabum",
+        "url": f"https://www.kabum.com.br/produto/{name}",
+        "available": True,
+        "rating": 4.5,
+        "value": "1999.90",
+        "collection_date": "2026-01-01",
+        "model": "RTX 4060",
+        "vram": "8GB",
+        "chipset": "NVIDIA",
+        "max_resolution": "7680x4320",
+        "output": "HDMI",
+        "tech_support": "DLSS",
+        **fields,
+    }
+
+
+class IngestProductsTests(TestCase):
+    def setUp(self):
+        Store.objects.create(name="Kabum", url_base="https://www.kabum.com.br")
+
+    def test_reingesting_reports_unchanged_and_updated(self):
+        ingest_products([gpu_record("gpu-1")])
+
+        [unchanged] = ingest_products([gpu_record("gpu-1")])
+        [updated] = ingest_products([gpu_record("gpu-1", value="1899.90")])
+
+        self.assertEqual(unchanged["status"], "unchanged")
+        self.assertFalse(unchanged["price_created"])
+        self.assertEqual(updated["status"], "updated")
+        self.assertTrue(updated["price_created"])
+        self.assertEqual(updated["product_id"], unchanged["product_id"])
+        self.assertEqual(Product.objects.count(), 1)
+        self.assertEqual(
+            LatestPrice.objects.get(product_store=updated["product_store_id"]).value,
+            Decimal("1899.90"),
+        )
+
+    def test_invalid_records_do_not_stop_the_batch(self):
+        outcomes = ingest_products(
+            [
+                gpu_record("gpu-1", category="geladeira"),
+                gpu_record("gpu-2", store="Loja desconhecida"),
+                gpu_record("gpu-3"),
+            ],
+        )
+
+        self.assertEqual(
+            [o["status"] for o in outcomes],
+            ["error", "error", "created"],
+        )
+        self.assertEqual([o["index"] for o in outcomes], [0, 1, 2])
+
+    def test_value_out_of_numeric_range_is_a_record_error(self):
+        outcomes = ingest_products(
+            [gpu_record("gpu-1"), gpu_record("gpu-2", value="1000000")],
+        )
+
+        self.assertEqual([o["status"] for o in outcomes], ["created", "error"])
+        self.assertEqual(Product.objects.count(), 1)
+
+    def test_record_refused_by_the_database_does_not_abort_the_batch(self):
+        # brand tem max_length=100: passa pela validação mas o banco recusa
+        outcomes = ingest_products(
+            [
+                gpu_record("gpu-1"),
+                gpu_record("gpu-2", brand="x" * 101),
+                gpu_record("gpu-3"),
+            ],
+        )
 
-# Create your tests here.
+        self.assertEqual(
+            [o["status"] for o in outcomes],
+            ["created", "error", "created"],
+        )
+        self.assertIsNone(outcomes[1]["product_id"])
+        self.assertEqual(
+            set(Product.objects.values_list("name", flat=True)),
+            {"gpu-1", "gpu-3"},
+        )
+        self.assertEqual(Price.objects.count(), 2)
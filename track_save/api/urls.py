@@ -58,6 +58,11 @@ urlpatterns = [
     path("stores/update/<str:name>", product_views.update_store, name="update_store"),
     path("stores/delete/<str:name>", product_views.delete_store, name="delete_store"),
     path("products/create/", product_views.create_product, name="create_product"),
+    path(
+        "products/bulk/",
+        product_views.bulk_ingest_products,
+        name="bulk_ingest_products",
+    ),
     path("products/search/", product_views.search_products, name="search_products"),
     path(
         "products/<int:product_id>/",
@@ -120,6 +125,16 @@ urlpatterns = [
     ),
     path("prices/", price_views.list_prices, name="list_prices"),
     path("prices/create/", price_views.create_price_view, name="create_price"),
+    path(
+        "prices/bulk/",
+        price_views.create_prices_bulk_view,
+        name="create_prices_bulk",
+    ),
+    path(
+        "prices/sweep/",
+        price_views.sweep_prices_view,
+        name="sweep_prices",
+    ),
     path("prices/<int:price_id>/", price_views.get_price, name="get_price"),
     path(
         "prices/update/<int:price_id>/",
@@ -131,6 +146,11 @@ urlpatterns = [
         price_views.delete_price_view,
         name="delete_price",
     ),
+    path(
+        "prices/series/",
+        price_views.get_price_series_view,
+        name="price_series",
+    ),
     path(
         "prices/search/",
         price_views.get_all_prices_with_product_data,
@@ -1,13 +1,17 @@
 import json
 from datetime import datetime
 
+from api.controllers.ingest_controller import sweep_prices
 from api.controllers.price_controller import create_price
+from api.controllers.price_controller import create_prices_bulk
 from api.controllers.price_controller import delete_price
 from api.controllers.price_controller import get_all_prices
 from api.controllers.price_controller import get_all_prices_with_product
 from api.controllers.price_controller import get_price_by_id
 from api.controllers.price_controller import get_price_by_ps
 from api.controllers.price_controller import update_price
+from api.controllers.price_series_controller import SERIES_DEFAULT_POINTS
+from api.controllers.price_series_controller import get_price_series
 from api.entities.price import Price
 from api.entities.product import ProductStore
 from django.http import HttpResponseBadRequest
@@ -61,6 +65,81 @@ def create_price_view(request):
         return HttpResponseBadRequest(f"Erro interno: {e}")
 
 
+# acrescentar Prices em lote (COPY), ignorando valores que não mudaram
+@csrf_exempt
+@require_POST
+def create_prices_bulk_view(request):
+    try:
+        data = json.loads(request.body)
+        rows = [
+            (
+                item["product_store_id"],
+                item["value"],
+                datetime.strptime(item["collection_date"], "%Y-%m-%d").date(),
+            )
+            for item in data
+        ]
+    except json.JSONDecodeError:
+        return HttpResponseBadRequest("JSON inválido")
+    except (KeyError, TypeError, ValueError):
+        return HttpResponseBadRequest(
+            "Envie uma lista de {product_store_id, value, collection_date (YYYY-MM-DD)}"
+        )
+
+    try:
+        inserted = create_prices_bulk(rows)
+    except Exception as e:
+        return HttpResponseBadRequest(f"Erro interno: {e!s}")
+
+    return JsonResponse(
+        {
+            "received": len(rows),
+            "inserted": [
+                {
+                    "product_store": product_store_id,
+                    "value": str(value),
+                    "collection_date": collection_date.isoformat(),
+                }
+                for product_store_id, value, collection_date in inserted
+            ],
+        },
+        status=201,
+    )
+
+
+@csrf_exempt
+@require_POST
+def sweep_prices_view(request):
+    """
+    Preços lidos da listagem de uma loja: {"store": "Kabum", "prices": [
+    {"url", "name", "value", "collection_date"?}, ...]}. Atualiza só o preço dos
+    produtos já cadastrados e devolve em "unknown" as URLs ainda desconhecidas.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return HttpResponseBadRequest("JSON inválido")
+
+    if (
+        not isinstance(data, dict)
+        or not data.get("store")
+        or not isinstance(data.get("prices"), list)
+        or not all(isinstance(item, dict) for item in data["prices"])
+    ):
+        return HttpResponseBadRequest(
+            'Envie {"store": ..., "prices": [{url, name, value, collection_date}]}',
+        )
+
+    try:
+        result = sweep_prices(data["store"], data["prices"])
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    except Exception as e:
+        return HttpResponseBadRequest(f"Erro interno: {e!s}")
+
+    return JsonResponse(result, status=200)
+
+
 # listar todos os Prices
 @csrf_exempt
 @require_GET
@@ -101,6 +180,32 @@ def get_price_by_product_store(request, ps_id):
         return HttpResponseBadRequest(f"Erro interno: {e}")
 
 
+# série de preços reduzida para gráficos
+# ex.: /api/prices/series/?product_store=1,2&start=2025-01-01&points=200&method=lttb
+@require_GET
+def get_price_series_view(request):
+    try:
+        product_store_ids = [
+            int(ps_id)
+            for ps_id in request.GET.get("product_store", "").split(",")
+            if ps_id.strip()
+        ]
+        start = request.GET.get("start")
+        end = request.GET.get("end")
+        data = get_price_series(
+            product_store_ids,
+            start=datetime.strptime(start, "%Y-%m-%d").date() if start else None,
+            end=datetime.strptime(end, "%Y-%m-%d").date() if end else None,
+            points=int(request.GET.get("points", SERIES_DEFAULT_POINTS)),
+            method=request.GET.get("method", "bucket"),
+        )
+        return JsonResponse(data, status=200)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    except Exception as e:
+        return HttpResponseBadRequest(f"Erro interno: {e}")
+
+
 # atualizar Price
 @csrf_exempt
 def update_price_view(request, price_id):
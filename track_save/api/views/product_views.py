@@ -1,6 +1,8 @@
 import json
 
+from api.controllers import ingest_controller
 from api.controllers import price_controller
+from api.controllers import price_series_controller
 from api.controllers import product_controller
 from api.controllers.product_controller import create_or_update_reputation
 from api.controllers.product_controller import get_store_reputation
@@ -9,17 +11,22 @@ from api.entities.product import ProductCategory
 from api.entities.product import ProductStore
 from api.entities.product import Store
 from api.entities.product import StoreReputation
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Q
 from django.http import HttpResponseBadRequest
 from django.http import HttpResponseNotAllowed
 from django.http import HttpResponseNotFound
 from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.http import require_POST
 
 import track_save.webscrapping_amazon.scraper.armazena_tera_amazon as amazon_tera
+from track_save.webscraping.scrapers.record_stream import chunked
+
+TERABYTE_INGEST_CHUNK_SIZE = 200
 
 
 @require_GET
@@ -323,8 +330,22 @@ def search_products(request):
 def get_product_details(request, ps_id):
     try:
         product_store = product_controller.get_product_store_by_id(ps_id)
-        price_history = price_controller.get_price_by_ps(ps_id)
-        price = price_history[-1]
+        latest = price_controller.LatestPrice.objects.get(product_store_id=ps_id)
+        price = {
+            "product_store": latest.product_store_id,
+            "value": str(latest.value),
+            "collection_date": latest.collection_date.isoformat(),
+        }
+        # Histórico reduzido (média por intervalo), no mesmo formato de get_price_by_ps
+        series = price_series_controller.get_price_series([ps_id])["series"][0]
+        price_history = [
+            {
+                "product_store": latest.product_store_id,
+                "value": f"{value:.2f}",
+                "collection_date": day,
+            }
+            for day, value in zip(series["t"], series["avg"], strict=True)
+        ]
         product = product_controller.get_product_by_id(product_store["product"])
         other_stores = product_controller.get_recent_price_stores(product["id"])
 
@@ -340,7 +361,7 @@ def get_product_details(request, ps_id):
             status=200,
         )
 
-    except price_controller.Price.DoesNotExist:
+    except price_controller.LatestPrice.DoesNotExist:
         return HttpResponseNotFound("Produto não encontrado")
     except product_controller.Product.DoesNotExist:
         return HttpResponseNotFound("Produto não encontrado")
@@ -383,6 +404,30 @@ def get_product_category(request, product_category):
 
 @require_GET
 def get_products(request):
+    """
+    Sem parâmetros mantém a lista completa.
+    ?cursor=&page_size= pagina por id; ?format=ndjson transmite o catálogo linha a linha.
+    """
+    if request.GET.get("format") == "ndjson":
+        lines = (
+            json.dumps(product, cls=DjangoJSONEncoder) + "\n"
+            for product in product_controller.iter_catalog()
+        )
+        return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+    if "cursor" in request.GET or "page_size" in request.GET:
+        try:
+            page_size = int(
+                request.GET.get("page_size", product_controller.CATALOG_PAGE_SIZE),
+            )
+            page = product_controller.get_products_page(
+                cursor=request.GET.get("cursor"),
+                page_size=page_size,
+            )
+            return JsonResponse(page, status=200)
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
+
     try:
         products = product_controller.get_all_products()
         if not products:
@@ -556,65 +601,67 @@ def search_view(request):
         return JsonResponse({"error": str(e)}, status=500)
 
 
+@csrf_exempt
+@require_POST
+def bulk_ingest_products(request):
+    """
+    Recebe uma lista de produtos coletados (mesmo formato de products/create/)
+    e grava tudo em lote. Aceita a lista direto ou {"products": [...]}.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return HttpResponseBadRequest("JSON inválido")
+
+    records = data.get("products") if isinstance(data, dict) else data
+    if not isinstance(records, list):
+        return HttpResponseBadRequest("Envie uma lista de produtos.")
+
+    try:
+        outcomes = ingest_controller.ingest_products(records)
+    except Exception as e:
+        return HttpResponseBadRequest(f"Erro interno: {e!s}")
+
+    return JsonResponse(
+        {
+            "summary": ingest_controller.summarize_outcomes(outcomes),
+            "results": outcomes,
+        },
+        status=200,
+    )
+
+
 @csrf_exempt
 @require_GET
 def get_terabyte(request):
     try:
-        terabyte = amazon_tera.get_terabyte()
+        produtos = (
+            produto
+            for produto in amazon_tera.get_terabyte()
+            if produto.get("spec_fields")
+        )
         produtos_criados = []
         erros = []
-
-        for i, produto in enumerate(terabyte):
-            spec_fields = produto.get("spec_fields", {})
-            category = produto.get("categoria", "").lower()
-
-            try:
-                if spec_fields:
-                    if category == "mouse":
-                        product = product_controller.create_product(
-                            name=produto.get("nome"),
-                            category=category,
-                            description=produto.get("descricao"),
-                            image_url=produto.get("imagem"),
-                            rating=5,
-                            brand=produto.get("tecnica", {}).get("Marca"),
-                            **spec_fields,
-                        )
-                    else:
-                        product = product_controller.create_product(
-                            name=produto.get("nome"),
-                            category=category,
-                            description=produto.get("descricao"),
-                            image_url=produto.get("imagem"),
-                            rating=5,
-                            brand=produto.get("tecnica", {}).get("Marca"),
-                            **spec_fields,
-                        )
-                    produtos_criados.append(
+        offset = 0
+        # O arquivo é lido e gravado em lotes; para cargas grandes use o comando
+        # ingest_store_results em vez deste endpoint
+        for terabyte in chunked(produtos, TERABYTE_INGEST_CHUNK_SIZE):
+            records = [amazon_tera.ingest_record(produto) for produto in terabyte]
+            outcomes = ingest_controller.ingest_products(records)
+            for produto, outcome in zip(terabyte, outcomes, strict=True):
+                outcome["index"] += offset
+                if outcome["status"] == "error":
+                    erros.append(
                         {
-                            "id": product.id,
-                            "name": product.name,
-                            "category": product.category,
-                            "description": product.description,
-                            "image_url": product.image_url,
-                            "brand": product.brand,
-                            "hash": product.hash,
+                            "index": outcome["index"],
+                            "produto": produto.get("nome"),
+                            "brand": produto.get("tecnica", {}).get("Marca"),
+                            "erro": outcome["error"],
                         }
                     )
-                spec_fields.clear()
-                category == ""
-            except Exception as e:
-                erros.append(
-                    {
-                        "index": i,
-                        "produto": produto.get("nome"),
-                        "brand": produto.get("tecnica", {}).get("Marca"),
-                        "erro": str(e),
-                    }
-                )
-                spec_fields.clear()
-                category = ""
-                continue
+                else:
+                    produtos_criados.append(outcome)
+            offset += len(terabyte)
 
         return JsonResponse(
             {"created": produtos_criados, "errors": erros}, safe=False, status=201
@@ -0,0 +1,446 @@
+"""
+Benchmark dos scrapers sobre páginas gravadas num PageArchive, sem acessar
+as lojas, para comparar mudanças nos scrapers com números repetíveis.
+
+Gravação (coleta real, uma vez):
+    python -m track_save.webscraping.scrapers.benchmark record kabum \
+        --archive bench/ --categories GPU CPU --limit 20 --page-limit 1
+    python -m track_save.webscraping.scrapers.benchmark record stores --archive bench/
+
+Execução (cada cenário num processo novo, servido pelo FixtureServer):
+    python -m track_save.webscraping.scrapers.benchmark run --archive bench/ --repeat 3
+
+Cenários: "kabum" (KabumScraper.run), "stores" (scrapers assíncronos da
+Terabyte/Amazon) e "specific_data" (SpecSnapshot e cada extrator parse_* sobre
+as páginas de produto da Kabum). Para cada um: páginas/s, pico de RSS do
+Python e do maior processo filho (navegador) e, no specific_data, o tempo por
+extrator.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+import lxml.html
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, o RSS fica de fora
+    resource = None
+
+from track_save.webscraping.enums import Categories
+from track_save.webscrapping_amazon.scraper import scraper as store_scraper
+
+from .kabum import KabumScraper
+from .page_archive import PageArchive
+from .sinks import ResultSink
+from .specific_data import cpu
+from .specific_data import extract
+from .specific_data import gpu
+from .specific_data import keyboard
+from .specific_data import mouse
+from .specific_data import ram
+from .specific_data.snapshot import SpecSnapshot
+from .structured_data import parse_structured_product
+
+MODULE = "track_save.webscraping.scrapers.benchmark"
+REPO_ROOT = Path(__file__).resolve().parents[3]
+MANIFEST_NAME = "benchmark.json"
+SCENARIOS = ("kabum", "stores", "specific_data")
+# Módulos cujos parse_* (e gpu.get_chipset) são medidos no cenário specific_data
+PARSER_MODULES = (extract, cpu, gpu, keyboard, mouse, ram)
+
+
+class CountingSink(ResultSink):
+    """
+    Sink do benchmark: só conta os produtos, sem gravar nada.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def write(self, records):
+        self.count += len(records)
+        return {"received": len(records)}
+
+    def sweep_prices(self, store, prices):
+        return {"matched": 0, "prices_created": 0, "unknown": []}
+
+
+def load_manifest(archive_dir):
+    path = Path(archive_dir) / MANIFEST_NAME
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def save_manifest(archive_dir, **entries):
+    """
+    Guarda com o archive os parâmetros da gravação, reaproveitados no replay.
+    """
+    manifest = {**load_manifest(archive_dir), **entries}
+    path = Path(archive_dir) / MANIFEST_NAME
+    path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+
+def peak_rss_mb():
+    if resource is None:
+        return {"python": None, "children": None}
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    unit = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "python": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit,
+    }
+
+
+# --- Gravação ---------------------------------------------------------------
+
+
+def record_kabum(archive_dir, categories, limit, page_limit, workers, headless):
+    archive = PageArchive(archive_dir)
+    for category in categories:
+        scraper = KabumScraper(
+            category=category,
+            limit=limit,
+            page_limit=page_limit,
+            workers=workers,
+            save_print=False,
+            sink=CountingSink(),
+        )
+        scraper.archive = archive
+        scraper.archive_mode = "record"
+        scraper.run(headless=headless)
+    save_manifest(
+        archive_dir,
+        kabum={
+            "categories": [category.name for category in categories],
+            "limit": limit,
+            "page_limit": page_limit,
+            "workers": workers,
+        },
+    )
+
+
+def record_stores(archive_dir):
+    archive = PageArchive(archive_dir)
+    asyncio.run(store_scraper.main(archive, "record", sink=CountingSink()))
+    save_manifest(archive_dir, stores={})
+
+
+# --- Cenários (rodam no processo filho) -------------------------------------
+
+
+def scenario_kabum(archive, manifest):
+    config = manifest["kabum"]
+    sink = CountingSink()
+    pages = 0
+    start = time.perf_counter()
+    for name in config["categories"]:
+        scraper = KabumScraper(
+            category=Categories[name],
+            limit=config["limit"],
+            page_limit=config["page_limit"],
+            workers=config["workers"],
+            save_print=False,
+            sink=sink,
+        )
+        scraper.archive = archive
+        scraper.archive_mode = "replay"
+        scraper.run(headless=True)
+        pages += scraper.archive_router.pages
+        scraper.writer.path.unlink(missing_ok=True)
+    return {
+        "pages": pages,
+        "products": sink.count,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def scenario_stores(archive, manifest):
+    sink = CountingSink()
+    start = time.perf_counter()
+    routers = asyncio.run(store_scraper.main(archive, "replay", sink=sink))
+    return {
+        "pages": sum(router.pages for router in routers.values()),
+        "products": sink.count,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def kabum_spec_samples(archive):
+    """
+    (categoria, HTML de #technicalInfoSection, nome) de cada página de produto
+    da Kabum gravada, lidos como o scraper lê: dados estruturados primeiro.
+    """
+    for entry in archive.pages(store="kabum"):
+        category = entry["tags"].get("category")
+        if "/produto/" not in entry["url"] or category not in Categories.__members__:
+            continue
+        root = lxml.html.fromstring(archive.read_body(entry))
+        next_data = root.xpath('//script[@id="__NEXT_DATA__"]/text()')
+        known = parse_structured_product(
+            root.xpath('//script[@type="application/ld+json"]/text()'),
+            next_data[0] if next_data else None,
+            entry["url"],
+        )
+        html = known.get("technical_html")
+        if html is None:
+            html = "".join(
+                lxml.html.tostring(section, encoding="unicode")
+                for section in root.xpath('//*[@id="technicalInfoSection"]')
+            )
+        name = known.get("name") or root.findtext(".//h1") or ""
+        if html:
+            yield Categories[category], html, name
+
+
+def timed(label, func, timings):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[label].append(time.perf_counter() - start)
+
+    return wrapper
+
+
+@contextmanager
+def timed_parsers():
+    """
+    Troca os parse_* (e gpu.get_chipset) dos módulos de specific_data por
+    versões que medem cada chamada. extract.py resolve essas funções a cada
+    chamada, então o caminho medido é o mesmo da coleta.
+    """
+    timings = defaultdict(list)
+    originals = []
+    for module in PARSER_MODULES:
+        short = module.__name__.rsplit(".", 1)[-1]
+        for attr, func in list(vars(module).items()):
+            if (
+                (attr.startswith("parse_") or attr == "get_chipset")
+                and callable(func)
+                and func.__module__ == module.__name__
+            ):
+                originals.append((module, attr, func))
+                setattr(module, attr, timed(f"{short}.{attr}", func, timings))
+    try:
+        yield timings
+    finally:
+        for module, attr, func in originals:
+            setattr(module, attr, func)
+
+
+def scenario_specific_data(archive, manifest):
+    samples = list(kabum_spec_samples(archive))
+    with timed_parsers() as timings:
+        from_html = timed("snapshot.from_html", SpecSnapshot.from_html, timings)
+        start = time.perf_counter()
+        for category, html, name in samples:
+            snapshot = from_html(html)
+            extract.specific_data_from_snapshot(category, snapshot, name)
+        seconds = time.perf_counter() - start
+    return {
+        "pages": len(samples),
+        "products": len(samples),
+        "seconds": seconds,
+        "fields": {
+            label: {"calls": len(values), "total": sum(values)}
+            for label, values in timings.items()
+        },
+    }
+
+
+SCENARIO_FUNCTIONS = {
+    "kabum": scenario_kabum,
+    "stores": scenario_stores,
+    "specific_data": scenario_specific_data,
+}
+
+
+def run_scenario(name, archive_dir, output):
+    archive = PageArchive(archive_dir)
+    result = SCENARIO_FUNCTIONS[name](archive, load_manifest(archive_dir))
+    result["rss_mb"] = peak_rss_mb()
+    Path(output).write_text(json.dumps(result), encoding="utf-8")
+
+
+# --- Execução e relatório ---------------------------------------------------
+
+
+def available_scenarios(archive_dir):
+    manifest = load_manifest(archive_dir)
+    return [
+        name
+        for name in SCENARIOS
+        if name in manifest or (name == "specific_data" and "kabum" in manifest)
+    ]
+
+
+def run_isolated(name, archive_dir, workdir):
+    """
+    Roda um cenário num processo novo (pico de RSS só dele), com o diretório
+    de trabalho em `workdir` para os arquivos que os scrapers gravam.
+    """
+    output = Path(workdir) / f"{name}.json"
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")]),
+        ),
+    }
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            MODULE,
+            "scenario",
+            name,
+            "--archive",
+            str(Path(archive_dir).resolve()),
+            "--output",
+            str(output),
+        ],
+        cwd=workdir,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return json.loads(output.read_text(encoding="utf-8"))
+
+
+def summarize(runs):
+    seconds = statistics.median(run["seconds"] for run in runs)
+    rss = [run["rss_mb"] for run in runs]
+    summary = {
+        "runs": len(runs),
+        "pages": runs[0]["pages"],
+        "products": runs[0]["products"],
+        "seconds": seconds,
+        "pages_per_second": runs[0]["pages"] / seconds if seconds else 0.0,
+        "peak_rss_mb": {
+            key: max((item[key] for item in rss if item[key] is not None), default=None)
+            for key in ("python", "children")
+        },
+    }
+    if "fields" in runs[0]:
+        fields = defaultdict(lambda: {"calls": 0, "total": 0.0})
+        for run in runs:
+            for label, timing in run["fields"].items():
+                fields[label]["calls"] += timing["calls"]
+                fields[label]["total"] += timing["total"]
+        summary["fields"] = {
+            label: {
+                "calls": timing["calls"] // len(runs),
+                "mean_us": timing["total"] / timing["calls"] * 1e6,
+                "total_ms": timing["total"] / len(runs) * 1e3,
+            }
+            for label, timing in sorted(fields.items())
+        }
+    return summary
+
+
+def format_mb(value):
+    return "n/d" if value is None else f"{value:.0f} MB"
+
+
+def print_report(results):
+    print(
+        f"{'cenário':<15}{'páginas':>9}{'produtos':>10}{'tempo':>10}"
+        f"{'pág/s':>9}{'RSS python':>13}{'RSS filho':>12}",
+    )
+    for name, summary in results.items():
+        print(
+            f"{name:<15}{summary['pages']:>9}{summary['products']:>10}"
+            f"{summary['seconds']:>9.2f}s{summary['pages_per_second']:>9.1f}"
+            f"{format_mb(summary['peak_rss_mb']['python']):>13}"
+            f"{format_mb(summary['peak_rss_mb']['children']):>12}",
+        )
+    for name, summary in results.items():
+        if "fields" not in summary:
+            continue
+        print(f"\n{name}: tempo por extrator")
+        print(f"{'extrator':<32}{'chamadas':>10}{'média':>12}{'total':>12}")
+        for label, timing in summary["fields"].items():
+            print(
+                f"{label:<32}{timing['calls']:>10}{timing['mean_us']:>10.1f}µs"
+                f"{timing['total_ms']:>10.1f}ms",
+            )
+
+
+def run_benchmark(archive_dir, scenarios, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in scenarios:
+            print(f"> {name}: {repeat} execução(ões)...")
+            runs = [run_isolated(name, archive_dir, workdir) for _ in range(repeat)]
+            results[name] = summarize(runs)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog=MODULE, description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Grava uma coleta real no archive.")
+    record.add_argument("target", choices=["kabum", "stores"])
+    record.add_argument("--archive", required=True)
+    record.add_argument(
+        "--categories",
+        nargs="+",
+        default=["GPU"],
+        choices=[category.name for category in Categories],
+    )
+    record.add_argument("--limit", type=int, default=20)
+    record.add_argument("--page-limit", type=int, default=1)
+    record.add_argument("--workers", type=int, default=1)
+    record.add_argument("--headed", action="store_true")
+
+    run = commands.add_parser("run", help="Roda os cenários sobre o archive.")
+    run.add_argument("--archive", required=True)
+    run.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=None)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--json", default=None, help="Grava os resultados neste arquivo.")
+
+    scenario = commands.add_parser("scenario", help="(interno) Um cenário isolado.")
+    scenario.add_argument("name", choices=SCENARIOS)
+    scenario.add_argument("--archive", required=True)
+    scenario.add_argument("--output", required=True)
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        if args.target == "kabum":
+            record_kabum(
+                args.archive,
+                [Categories[name] for name in args.categories],
+                args.limit,
+                args.page_limit,
+                args.workers,
+                headless=not args.headed,
+            )
+        else:
+            record_stores(args.archive)
+    elif args.command == "scenario":
+        run_scenario(args.name, args.archive, args.output)
+    else:
+        scenarios = args.scenarios or available_scenarios(args.archive)
+        if not scenarios:
+            parser.error(f"Nada gravado em {args.archive}: use o comando record.")
+        results = run_benchmark(args.archive, scenarios, args.repeat)
+        print_report(results)
+        if args.json:
+            Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+
+class DomainThrottle:
+    """
+    Intervalo mínimo entre o início de duas navegações para o mesmo domínio.
+    Só as navegações de um mesmo domínio esperam umas pelas outras; domínios
+    diferentes (e o processamento das páginas já abertas) seguem em paralelo.
+    """
+
+    def __init__(self, delays=None, default_delay=0.0):
+        self.delays = dict(delays or {})
+        self.default_delay = default_delay
+        self._last = {}
+        self._locks = {}
+
+    def delay_for(self, host):
+        return self.delays.get(host, self.default_delay)
+
+    async def wait(self, url):
+        host = urlparse(url).hostname or ""
+        delay = self.delay_for(host)
+        if delay <= 0:
+            return
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            elapsed = time.monotonic() - self._last.get(host, float("-inf"))
+            if elapsed < delay:
+                await asyncio.sleep(delay - elapsed)
+            self._last[host] = time.monotonic()
+
+    async def goto(self, page, url, **kwargs):
+        """
+        page.goto respeitando o intervalo mínimo do domínio.
+        """
+        await self.wait(url)
+        return await page.goto(url, **kwargs)
+
+
+class ContextPool:
+    """
+    Pool de BrowserContexts de um navegador já aberto (API assíncrona).
+
+    Os contextos são criados uma vez (com o ResourceBlocker aplicado) e
+    reaproveitados: cada tarefa pega um contexto livre, abre uma página, usa e
+    fecha a página. O tamanho do pool limita quantas páginas ficam abertas ao
+    mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        browser,
+        size=4,
+        blocker=None,
+        context_options=None,
+    ):
+        if size < 1:
+            msg = "O pool precisa de pelo menos um contexto."
+            raise ValueError(msg)
+        self.browser = browser
+        self.size = size
+        self.blocker = blocker
+        self.context_options = context_options or {}
+        self.contexts = []
+        self._idle = asyncio.Queue()
+
+    async def start(self):
+        for _ in range(self.size):
+            context = await self.browser.new_context(**self.context_options)
+            if self.blocker is not None:
+                await self.blocker.attach_async(context)
+            self.contexts.append(context)
+            self._idle.put_nowait(context)
+        return self
+
+    async def close(self):
+        for context in self.contexts:
+            await context.close()
+        self.contexts.clear()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @asynccontextmanager
+    async def page(self):
+        context = await self._idle.get()
+        page = await context.new_page()
+        try:
+            yield page
+        finally:
+            await page.close()
+            self._idle.put_nowait(context)
+
+    async def map(self, func, items, concurrency=None):
+        """
+        Executa `await func(page, item)` para cada item com no máximo
+        `concurrency` (padrão: tamanho do pool) páginas ao mesmo tempo.
+        Devolve os resultados na ordem dos itens; a exceção de um item é
+        devolvida no lugar do resultado, sem interromper os demais.
+        """
+        semaphore = asyncio.Semaphore(min(concurrency or self.size, self.size))
+
+        async def run(item):
+            async with semaphore, self.page() as page:
+                return await func(page, item)
+
+        return await asyncio.gather(
+            *(run(item) for item in items),
+            return_exceptions=True,
+        )
+
+    async def each(self, func, items, concurrency=None):
+        """
+        Como map, mas consome `items` (pode ser um gerador) aos poucos e não
+        guarda os resultados: a memória não cresce com o número de itens.
+        Devolve [(item, exceção)] dos itens que falharam.
+        """
+        iterator = iter(items)
+        failures = []
+
+        async def worker():
+            # Os workers dividem o mesmo iterador; next() não cede o event loop
+            for item in iterator:
+                try:
+                    async with self.page() as page:
+                        await func(page, item)
+                except Exception as e:  # noqa: BLE001
+                    failures.append((item, e))
+
+        workers = min(concurrency or self.size, self.size)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return failures
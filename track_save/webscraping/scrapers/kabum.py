@@ -1,32 +1,73 @@
-import json
 import re
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from datetime import datetime
 from pathlib import Path
+from queue import Empty
+from queue import Queue
 
 import requests
+from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import Locator
 from playwright.sync_api import Page
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright
 
 from track_save.webscraping.enums import Categories
 
+from .result_writer import RESULT_SUFFIX
+from .result_writer import ResultWriter
 from .scraper import Scraper
-from .specific_data import cpu as cpu_specific_data
-from .specific_data import gpu as gpu_specific_data
-from .specific_data import keyboard as keyboard_specific_data
-from .specific_data import mouse as mouse_specific_data
-from .specific_data import ram as ram_specific_data
+from .sinks import ResultSink
+from .specific_data.extract import extract_specific_data
+from .specific_data.extract import parse_model
+from .specific_data.snapshot import SpecSnapshot
+from .specific_data.snapshot import section_html
+from .structured_data import COMMON_FIELDS
+from .structured_data import STRUCTURED_DATA_JS
+from .structured_data import parse_structured_product
+from .waiting import WaitStats
 
 BASE = Path(__file__).parent
-API_URL = "http://localhost:8001/api/products/create/"
-HTTP_STATUS_CREATED = 201
+ITEMS_PER_PAGE = 100
+PRODUCT_LINK_SELECTOR = "a[href*='/produto/']"
+SCRAPE_MODES = ("full", "sweep")
+# Future das specs (parse_pool) que acompanha o produto até emit()
+SPECS_FUTURE_KEY = "_specs_future"
+
+# Url, nome e preço de cada card da listagem numa única chamada ao navegador
+LISTING_CARDS_JS = """
+    (cards, linkSelector) => cards.map(card => {
+        const link = card.querySelector(linkSelector);
+        const name = card.querySelector(".nameCard");
+        const price = card.querySelector(".priceCard");
+        return {
+            url: link ? link.href : null,
+            name: name ? name.innerText.trim() : "",
+            price: price ? price.innerText : "",
+        };
+    })
+"""
+
+
+def parse_price_text(price_raw: str) -> str:
+    """
+    "R$ 1.299,99" -> "1299.99" ("" se não houver número).
+    """
+    price_clean = re.sub(r"[^\d\.,]", "", price_raw or "")
+    return price_clean.replace(".", "").replace(",", ".")
+
 
 results_dir = BASE / "results"
 results_dir.mkdir(exist_ok=True, parents=True)
 
 
 class KabumScraper(Scraper):
+    store_name = "kabum"
+
     def __init__(
         self,
         category: Categories,
@@ -34,34 +75,77 @@ class KabumScraper(Scraper):
         page_limit: int = 3,
         local_results: bool = False,
         save_print: bool = True,
+        workers: int = 1,
+        block_resources: bool = True,
+        parse_workers: int = 0,
+        mode: str = "full",
+        structured_data: bool = True,
+        sink: ResultSink | None = None,
     ):
         self.category = category
         self.limit = limit
         self.page_limit = page_limit
         self.local_results = local_results
         self.save_print = save_print
-
-    def run(self, headless) -> list[dict]:  # noqa: C901, PLR0912, PLR0915
+        # workers > 1: coleta as URLs da listagem e abre os produtos em paralelo
+        self.workers = workers
+        self.block_resources = block_resources
+        # parse_workers > 0: o parsing das specs roda num pool de processos,
+        # fora da thread do navegador
+        self.parse_workers = parse_workers
+        self.parse_pool = None
+        # (produto, future) na ordem da listagem; saem para o writer quando as
+        # specs ficam prontas
+        self.pending_specs = deque()
+        self.writer = None
+        # "sweep": só preços da listagem para produtos conhecidos (ver sweep())
+        if mode not in SCRAPE_MODES:
+            msg = f"mode deve ser um de: {', '.join(SCRAPE_MODES)}."
+            raise ValueError(msg)
+        self.mode = mode
+        # Lê JSON-LD/__NEXT_DATA__ antes de recorrer ao DOM
+        self.structured_data = structured_data
+        # Destino dos produtos (API remota ou ORM); ver Scraper.get_sink
+        self.sink = sink
+
+    def run(self, headless) -> Path:  # noqa: C901, PLR0912, PLR0915
+        """
+        Coleta a categoria. Cada produto vai para o arquivo de resultados
+        (NDJSON gzip em results/) assim que é capturado e, em lotes, para o
+        sink; a memória não cresce com a coleta. Retorna o caminho do arquivo,
+        que pode ser reenviado com ResultWriter.replay. Timeouts do Playwright
+        e erros de requisição são repassados a quem chamou.
+        """
         print("🤖 Iniciando a coleta de dados da Kabum...")
         print(f"> Categoria: {self.category.name}, Limite: {self.limit}")
-        results = []
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # noqa: DTZ005
+        self.writer = ResultWriter(
+            results_dir / f"{self.category.name.lower()}_{timestamp}{RESULT_SUFFIX}",
+            sink=self.get_sink(),
+        )
+        captured = 0
         browser, page = self.init_browser(headless=headless)
+        if self.parse_workers > 0:
+            self.parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
 
         try:
-            url = self.parse_category(self.category, get_url=True)
-            page.goto(url, timeout=60000)
+            self.open_listing(page)
 
-            locBarraFiltro = page.locator("#Filter")
-            locFiltroItens = locBarraFiltro.locator("select.sc-dcf1314f-0")
-            self.wait_element(locFiltroItens)
-
-            locFiltroItens.select_option(value="100")
-            page.wait_for_load_state("domcontentloaded")
+            if self.mode == "sweep":
+                self.sweep(page, headless=headless)
+            elif self.workers > 1:
+                urls = self.harvest_product_urls(page)
+                print(
+                    f"> {len(urls)} URLs coletadas, abrindo com {self.workers} abas em paralelo.",  # noqa: E501
+                )
+                self.scrape_urls_concurrently(urls, headless=headless)
 
+            # Modo sequencial: abre cada card na mesma aba
+            serial = self.mode == "full" and self.workers <= 1
             page_num = 1
-            while len(results) < self.limit and page_num <= self.page_limit:
+            while serial and captured < self.limit and page_num <= self.page_limit:
                 locItens = page.locator("article.productCard")
-                self.wait_element(locItens)
+                self.wait_for(locItens, name="kabum.listing")
                 item_count_on_page = locItens.count()
 
                 if item_count_on_page == 0:
@@ -73,7 +157,7 @@ class KabumScraper(Scraper):
                 )
 
                 for i in range(item_count_on_page):
-                    if len(results) >= self.limit:
+                    if captured >= self.limit:
                         print(
                             "\n> Limite total de produtos atingido. Encerrando coleta de itens.",  # noqa: E501
                         )
@@ -82,41 +166,10 @@ class KabumScraper(Scraper):
                     card = locItens.nth(i)
                     card.click()
 
-                    priceSection = page.locator("span.block.my-12 b")
-                    descriptionSection = page.locator("#description")
-                    techInfoSection = page.locator("#technicalInfoSection")
-                    reviewsSection = page.locator("#reviewsSection")
-                    self.wait_elements(
-                        page,
-                        [
-                            priceSection,
-                            descriptionSection,
-                            techInfoSection,
-                            reviewsSection,
-                        ],
-                    )
-                    print("> Coletando produto da url:", page.url)
-
-                    common_data = self.get_common_data(
-                        page,
-                        priceSection,
-                        descriptionSection,
-                        techInfoSection,
-                        reviewsSection,
-                    )
-                    specific_info = self.get_specific_data(
-                        techInfoSection,
-                        common_data["name"],
-                    )
+                    product_data = self.scrape_product_page(page)
 
-                    product_data = {
-                        **common_data,
-                        **specific_info,
-                        "store": "Kabum",
-                        "available": True,
-                    }
-
-                    results.append(product_data)
+                    self.emit(product_data)
+                    captured += 1
                     if self.local_results:
                         print(f"Produto {i + 1} capturado: {product_data['name']}")
                         print("=" * 50 + "\n")
@@ -127,10 +180,9 @@ class KabumScraper(Scraper):
                 # --- Fim do loop de itens da página ---
 
                 # Verifica se o limite de produtos foi atingido
-                if len(results) >= self.limit:
+                if captured >= self.limit:
                     break
 
-                ITEMS_PER_PAGE = 100
                 if item_count_on_page < ITEMS_PER_PAGE:
                     print(
                         f"\n> Página final detectada (contém {item_count_on_page} itens, menos que {ITEMS_PER_PAGE}). Coleta concluída.",  # noqa: E501
@@ -138,75 +190,372 @@ class KabumScraper(Scraper):
                     break
 
                 # Lógica para ir para a próxima página
-                locProximaPagina = page.locator("#listingPagination li.next")
-                is_disabled = "disabled" in (
-                    locProximaPagina.get_attribute("class") or ""
-                )
-
-                if locProximaPagina.is_visible() and not is_disabled:
-                    print("> Indo para a próxima página...")
-                    locProximaPagina.click()
-                    page.wait_for_load_state("domcontentloaded")
-                    page_num += 1
-                else:
-                    print(
-                        "\n> Botão 'Próxima Página' não encontrado ou desabilitado. Fim da coleta.",  # noqa: E501
-                    )
+                if not self.next_listing_page(page):
                     break
+                page_num += 1
 
             # --- Fim do loop de paginação ---
 
-            # Seção para salvar os resultados e enviar para a API
-            if results:
-                print(f"\n✅ {len(results)} produtos capturados com sucesso!")
-                self.save_and_send_results(results)
+            self.resolve_pending_specs()
+            # Entrega ao sink o último lote incompleto
+            self.writer.flush()
+            if self.writer.count:
+                print(f"\n✅ {self.writer.count} produtos capturados com sucesso!")
+                print(f"🚀 Enviados: {dict(self.writer.summary)}")
             else:
                 print("\n⚠️ Nenhum produto encontrado ou capturado.")
 
+        # A falha é repassada a quem chamou (o worker de jobs marca o job como
+        # falho e ele pode ser repetido); o screenshot fica para diagnóstico
         except PlaywrightTimeoutError as e:
             print(f"❌ Timeout do Playwright durante a execução: {e}")
             page.screenshot(path=results_dir / "playwright_timeout_error.png")
-            
+            raise
         except requests.exceptions.RequestException as e:
             print(f"❌ Erro de requisição HTTP durante a execução: {e}")
             page.screenshot(path=results_dir / "request_error.png")
+            raise
         finally:
             self.close_browser(browser)
+            if self.parse_pool is not None:
+                self.parse_pool.shutdown(cancel_futures=True)
+                self.parse_pool = None
+                self.pending_specs.clear()
+            self.writer.close()
             print("🤖 Coleta finalizada.\n")
 
+        return self.writer.path
+
+    def archive_tags(self):
+        return {"store": self.store_name, "category": self.category.name}
+
+    def open_listing(self, page: Page):
+        """
+        Abre a listagem da categoria já com 100 itens por página.
+        """
+        url = self.parse_category(self.category, get_url=True)
+        self.goto(page, url, timeout=60000)
+
+        locBarraFiltro = page.locator("#Filter")
+        locFiltroItens = locBarraFiltro.locator("select.sc-dcf1314f-0")
+        self.wait_for(locFiltroItens, name="kabum.filter")
+
+        locFiltroItens.select_option(value="100")
+        page.wait_for_load_state("domcontentloaded")
+
+    def next_listing_page(self, page: Page) -> bool:
+        """
+        Avança para a próxima página da listagem; False se não houver.
+        """
+        locProximaPagina = page.locator("#listingPagination li.next")
+        is_disabled = "disabled" in (locProximaPagina.get_attribute("class") or "")
+
+        if locProximaPagina.is_visible() and not is_disabled:
+            print("> Indo para a próxima página...")
+            locProximaPagina.click()
+            page.wait_for_load_state("domcontentloaded")
+            return True
+
+        print(
+            "\n> Botão 'Próxima Página' não encontrado ou desabilitado. Fim da coleta.",
+        )
+        return False
+
+    def harvest_listing_cards(self, page: Page) -> list[dict]:
+        """
+        Percorre a listagem (com paginação) e devolve url, nome e preço de cada
+        card, na ordem em que aparecem, sem abrir nenhum produto.
+        """
+        cards = {}
+        page_num = 1
+        while len(cards) < self.limit and page_num <= self.page_limit:
+            locItens = page.locator("article.productCard")
+            self.wait_for(locItens, name="kabum.listing")
+            page_cards = locItens.evaluate_all(LISTING_CARDS_JS, PRODUCT_LINK_SELECTOR)
+            page_cards = [card for card in page_cards if card["url"]]
+            if not page_cards:
+                print("> Nenhum produto encontrado nesta página. Encerrando.")
+                break
+
+            for card in page_cards:
+                cards.setdefault(card["url"], card)
+
+            if len(page_cards) < ITEMS_PER_PAGE or not self.next_listing_page(page):
+                break
+            page_num += 1
+
+        return list(cards.values())[: self.limit]
+
+    def harvest_product_urls(self, page: Page) -> list[str]:
+        return [card["url"] for card in self.harvest_listing_cards(page)]
+
+    def sweep(self, page: Page, headless=True):
+        """
+        Modo "sweep": envia só os preços lidos dos cards da listagem para o sink
+        (prices/sweep/), que atualiza os produtos já cadastrados. Apenas as URLs
+        desconhecidas têm a página de detalhe aberta; esses produtos vão para o
+        writer da coleta.
+        """
+        cards = self.harvest_listing_cards(page)
+        collection_date = date.today().isoformat()  # noqa: DTZ011
+        prices = [
+            {
+                "url": card["url"],
+                "name": card["name"],
+                "value": parse_price_text(card["price"]),
+                "collection_date": collection_date,
+            }
+            for card in cards
+            if card["price"]
+        ]
+        print(f"> {len(prices)} preços lidos da listagem.")
+
+        sweep = self.get_sink().sweep_prices("Kabum", prices)
+        if sweep is None:
+            return
+
+        unknown = sweep["unknown"]
+        print(
+            f"🚀 {sweep['matched']} produtos conhecidos, {sweep['prices_created']} "
+            f"preços novos; {len(unknown)} produtos novos para detalhar.",
+        )
+        if not unknown:
+            return
+        if self.workers > 1:
+            self.scrape_urls_concurrently(unknown, headless=headless)
+            return
+
+        for url in unknown:
+            try:
+                self.goto(page, url, timeout=60000)
+                self.emit(self.scrape_product_page(page))
+            except PlaywrightTimeoutError as e:
+                print(f"❌ Timeout ao coletar {url}: {e}")
+
+    def scrape_product_page(self, page: Page) -> dict:
+        """
+        Extrai os dados do produto aberto na página.
+        """
+        priceSection = page.locator("span.block.my-12 b")
+        descriptionSection = page.locator("#description")
+        techInfoSection = page.locator("#technicalInfoSection")
+        reviewsSection = page.locator("#reviewsSection")
+
+        known = self.get_structured_data(page) if self.structured_data else {}
+        technical_html = known.get("technical_html")
+        if technical_html is None or not all(
+            field in known for field in COMMON_FIELDS
+        ):
+            self.wait_for_any(
+                [
+                    priceSection,
+                    descriptionSection,
+                    techInfoSection,
+                    reviewsSection,
+                ],
+                timeout=20000,
+                name="kabum.product_page",
+            )
+        print("> Coletando produto da url:", page.url)
+
+        common_data = self.get_common_data(
+            page,
+            priceSection,
+            descriptionSection,
+            techInfoSection,
+            reviewsSection,
+            known=known,
+        )
+        html = technical_html or section_html(techInfoSection)
+        if self.parse_pool is None:
+            specific_info = extract_specific_data(
+                self.category,
+                html,
+                common_data["name"],
+            )
+        else:
+            # O parsing começa já; emit() enfileira o produto na ordem da listagem
+            specific_info = {
+                SPECS_FUTURE_KEY: self.parse_pool.submit(
+                    extract_specific_data,
+                    self.category,
+                    html,
+                    common_data["name"],
+                ),
+            }
+
+        return {
+            **common_data,
+            **specific_info,
+            "store": "Kabum",
+            "available": known.get("available", True),
+        }
+
+    def emit(self, product_data: dict):
+        """
+        Entrega um produto capturado ao writer da coleta. Com parse_pool, o
+        produto entra em pending_specs e sai de lá quando as specs ficarem
+        prontas. Chamado sempre na ordem da listagem (no modo paralelo, sob o
+        lock de scrape_each_url), que é a ordem de pending_specs.
+        """
+        future = product_data.pop(SPECS_FUTURE_KEY, None)
+        if future is None:
+            self.writer.write(product_data)
+            return
+        self.pending_specs.append((product_data, future))
+        self.resolve_pending_specs(wait=False)
+
+    def resolve_pending_specs(self, wait=True):
+        """
+        Completa os produtos com as specs calculadas no pool de processos e os
+        grava. Com wait=False para no primeiro produto ainda sem specs.
+        """
+        while self.pending_specs:
+            product_data, future = self.pending_specs[0]
+            if not wait and not future.done():
+                return
+            product_data.update(future.result())
+            self.pending_specs.popleft()
+            self.writer.write(product_data)
+
+    def scrape_urls(self, urls: list[str], headless=True) -> dict:
+        """
+        Coleta páginas de produto já conhecidas, sem passar pela listagem (usado
+        pelo recrawl do comando crawl_due). Retorna {url pedida: produto}; as
+        URLs que falharem ficam de fora.
+        """
+        self.wait_stats = WaitStats()
+        self.start_routing()
+        try:
+            results = self.scrape_each_url(urls, headless=headless)
+        finally:
+            self.stop_routing()
+        self.wait_stats.print_summary()
+        return {
+            url: result
+            for url, result in zip(urls, results, strict=True)
+            if result is not None
+        }
+
+    def scrape_urls_concurrently(self, urls: list[str], headless=True):
+        """
+        Abre as páginas de produto em paralelo; cada produto vai para o writer
+        da coleta assim que é capturado. Produtos que falharem ficam de fora.
+        """
+        self.scrape_each_url(urls, headless=headless, on_result=self.emit)
+
+    def scrape_each_url(  # noqa: C901
+        self,
+        urls: list[str],
+        headless=True,
+        on_result=None,
+    ) -> list[dict | None]:
+        """
+        Um resultado (ou None, se falhar) por URL, na ordem recebida. Cada worker
+        é uma thread com o próprio Playwright/navegador (a API síncrona não pode
+        ser compartilhada entre threads) e consome a fila de URLs.
+        Com on_result, cada produto é passado a ele (na thread do worker) em vez
+        de ficar na lista, também na ordem recebida: um resultado que termina
+        antes dos anteriores espera em `results` até que todos eles terminem.
+        """
+        queue = Queue()
+        for index, url in enumerate(urls):
+            queue.put((index, url))
+        results = [None] * len(urls)
+        done = [False] * len(urls)
+        emitted = 0
+        emit_lock = threading.Lock()
+
+        def finish(index, product_data):
+            nonlocal emitted
+            with emit_lock:
+                results[index] = product_data
+                done[index] = True
+                if on_result is None:
+                    return
+                # Entrega o prefixo contínuo já terminado, na ordem da listagem
+                while emitted < len(urls) and done[emitted]:
+                    if results[emitted] is not None:
+                        on_result(results[emitted])
+                        results[emitted] = None
+                    emitted += 1
+
+        def worker():
+            with sync_playwright() as playwright:
+                browser = playwright.chromium.launch(headless=headless)
+                page = self.new_page(browser)
+                try:
+                    while True:
+                        try:
+                            index, url = queue.get_nowait()
+                        except Empty:
+                            return
+                        product_data = None
+                        try:
+                            self.goto(page, url, timeout=60000)
+                            product_data = self.scrape_product_page(page)
+                        except PlaywrightTimeoutError as e:
+                            print(f"❌ Timeout ao coletar {url}: {e}")
+                        except PlaywrightError as e:
+                            print(f"❌ Erro ao coletar {url}: {e}")
+                        finally:
+                            finish(index, product_data)
+                finally:
+                    browser.close()
+
+        workers = max(self.workers, 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(worker) for _ in range(workers)]
+            for future in futures:
+                future.result()
+
         return results
 
-    def get_common_data(
+    def get_structured_data(self, page: Page) -> dict:
+        """
+        Campos do produto lidos do JSON-LD e do __NEXT_DATA__ da página.
+        """
+        try:
+            embedded = page.evaluate(STRUCTURED_DATA_JS)
+        except PlaywrightError:
+            return {}
+        return parse_structured_product(
+            embedded["json_ld"],
+            embedded["next_data"],
+            page.url,
+        )
+
+    def get_common_data(  # noqa: PLR0913
         self,
         page: Page,
         priceSection: Locator,
         descriptionSection: Locator,
         techInfoSection: Locator,
         reviewsSection: Locator,
+        known: dict | None = None,
     ) -> dict:
-        name_loc = descriptionSection.locator("h2").first
-        if not self.element_visible(name_loc):
-            name_loc = page.locator("h1.text-sm").first
-
-        rating_loc = reviewsSection.locator("span").first
-        self.wait_element(rating_loc, timeout=2000)
-
-        try:
-            txt_rating = rating_loc.inner_text(timeout=2000).strip()
-            rating = float(txt_rating) if txt_rating else 0.0
-        except (PlaywrightTimeoutError, ValueError):
-            # timeout ou texto não-numérico
-            rating = 0.0
-
-        name = name_loc.inner_text().strip()
+        """
+        Dados comuns do produto. Os campos já presentes em `known` (dados
+        estruturados) não são buscados no DOM.
+        """
+        known = known or {}
+        name = known.get("name") or self.get_name(page, descriptionSection)
+        rating = known.get("rating")
+        if rating is None:
+            rating = self.get_rating(reviewsSection)
         category = self.category.name.lower()
-        price = self.get_price(priceSection)
+        price = known.get("value") or self.get_price(priceSection)
         url = page.url
-        img_url = page.locator(
-            "div.swiper-slide.swiper-slide-active img",
-        ).first.get_attribute("src")
-        brand = self.get_brand(techInfoSection, name)
-        description = self.get_description(descriptionSection)
+        img_url = (
+            known.get("image_url")
+            or page.locator(
+                "div.swiper-slide.swiper-slide-active img",
+            ).first.get_attribute("src")
+        )
+        brand = known.get("brand") or self.get_brand(techInfoSection, name)
+        description = known.get("description") or self.get_description(
+            descriptionSection,
+        )
         collection_date = date.today().isoformat()  # noqa: DTZ011
 
         return {
@@ -221,115 +570,34 @@ class KabumScraper(Scraper):
             "collection_date": collection_date,
         }
 
-    def get_specific_data(self, section: Locator, name: str) -> dict:  # noqa: PLR0911
-        if self.category == Categories.MOTHERBOARD:
-            return {
-                "socket": "AM4/AM5/LGA1200",
-                "model": self.get_model(section),
-                "chipset": gpu_specific_data.get_chipset(name=name),
-                "form_type": "ATX/ITX",
-                "max_ram_capacity": "64GB",
-                "ram_type": "DDR4/DDR5",
-                "ram_slots": "4",
-                "pcie_slots": "2",
-                "sata_ports": "6",
-                "m2_slot": "1",
-            }
-
-        if self.category == Categories.GPU:
-            return {
-                "model": self.get_model(section),
-                "vram": gpu_specific_data.get_vram(section),
-                "chipset": gpu_specific_data.get_chipset(name=name),
-                "max_resolution": gpu_specific_data.get_max_resolution(section),
-                "output": gpu_specific_data.get_output(section),
-                "tech_support": gpu_specific_data.get_tech_support(section),
-            }
-
-        if self.category == Categories.CPU:
-            return {
-                "model": self.get_model(section),
-                "integrated_video": cpu_specific_data.get_integrated_video(section),
-                "socket": cpu_specific_data.get_socket(section),
-                "core_number": cpu_specific_data.get_core_number(section),
-                "thread_number": cpu_specific_data.get_threads(section),
-                "frequency": cpu_specific_data.get_frequency(section, name=name),
-                "mem_speed": cpu_specific_data.get_mem_speed(section),
-            }
-
-        if self.category == Categories.STORAGE:
-            return {
-                "capacity_gb": "256/512/1024",
-                "storage_type": "SSD/HDD",
-                "interface": "SATA/PCIe NVMe",
-                "form_factor": '2.5"/M.2',
-                "read_speed": "500MB/s",
-                "write_speed": "450MB/s",
-            }
-
-        if self.category == Categories.KEYBOARD:
-            return {
-                "model": self.get_model(section),
-                "key_type": keyboard_specific_data.get_key_type(section, name),
-                "layout": keyboard_specific_data.get_layout(section),
-                "connectivity": keyboard_specific_data.get_connectivity(section),
-                "dimension": keyboard_specific_data.get_dimension(section),
-            }
-
-        if self.category == Categories.MOUSE:
-            return {
-                "model": self.get_model(section),
-                "dpi": mouse_specific_data.get_dpi(section),
-                "connectivity": mouse_specific_data.get_connectivity(section),
-                "color": mouse_specific_data.get_color(section),
-            }
-
-        if self.category == Categories.MONITOR:
-            return {
-                "model": self.get_model(section),
-                "inches": '24"/27"',
-                "panel_type": "IPS/TN",
-                "proportion": "16:9/21:9",
-                "resolution": "1920x1080/2560x1440",
-                "refresh_rate": "60Hz/144Hz",
-                "color_support": "16.7M/1.07B",
-                "output": "HDMI/DisplayPort/VGA",
-            }
+    def get_name(self, page: Page, descriptionSection: Locator) -> str:
+        name_loc = descriptionSection.locator("h2").first
+        if not self.element_visible(name_loc):
+            name_loc = page.locator("h1.text-sm").first
+        return name_loc.inner_text().strip()
 
-        if self.category == Categories.RAM:
-            return {
-                "model": self.get_model(section),
-                "capacity": ram_specific_data.get_capacity(section),
-                "ddr": ram_specific_data.get_ddr(section),
-                "speed": ram_specific_data.get_speed(section),
-            }
+    def get_rating(self, reviewsSection: Locator) -> float:
+        rating_loc = reviewsSection.locator("span").first
+        self.wait_for(rating_loc, timeout=2000, name="kabum.rating")
 
-        if self.category == Categories.COMPUTER:
-            return {
-                "is_notebook": False,
-                "motherboard": "B550/B550M",
-                "cpu": "AMD Ryzen 5/Intel Core i5",
-                "ram": "16GB DDR4",
-                "storage": "512GB SSD/1TB HDD",
-                "gpu": "AMD Radeon RX 6600/NVIDIA GeForce GTX 1660",
-                "inches": '24"/27"',
-                "panel_type": "IPS/TN",
-                "resolution": "1920x1080/2560x1440",
-                "refresh_rate": "60Hz/144Hz",
-                "color_support": "16.7M/1.07B",
-                "output": "HDMI/DisplayPort/VGA",
-            }
+        try:
+            txt_rating = rating_loc.inner_text(timeout=2000).strip()
+            return float(txt_rating) if txt_rating else 0.0
+        except (PlaywrightTimeoutError, ValueError):
+            # timeout ou texto não-numérico
+            return 0.0
 
-        return {}
+    def get_specific_data(self, section: Locator, name: str) -> dict:
+        """
+        Lê o HTML da seção técnica uma única vez e extrai as specs em memória.
+        """
+        return extract_specific_data(self.category, section_html(section), name)
 
     def get_price(self, section: Locator) -> str:
-        if not self.wait_element(section, timeout=2000):
+        if not self.wait_for(section, timeout=2000, name="kabum.price"):
             return "0.00"
 
-        price_locator = section
-        price_raw = price_locator.first.inner_text()
-        price_clean = re.sub(r"[^\d\.,]", "", price_raw)
-        return price_clean.replace(".", "").replace(",", ".") if price_clean else "0.00"
+        return parse_price_text(section.first.inner_text()) or "0.00"
 
     def get_brand(self, section: Locator, name: str) -> str:
         candidates = [
@@ -429,58 +697,7 @@ class KabumScraper(Scraper):
         return ""
 
     def get_model(self, section: Locator) -> str:
-        candidates = [
-            "span:has-text('Modelo')",
-            "p:has-text('Modelo')",
-        ]
-
-        model_name = ""
-        for sel in candidates:
-            loc = section.locator(sel)
-            if loc.count() > 0:
-                try:
-                    model_name = loc.first.inner_text().strip()
-                    if model_name:
-                        break
-                except AttributeError:
-                    continue
-
-        if not model_name:
-            return ""
-
-        model = re.search(r"Modelo:\s*(.+)$", model_name, flags=re.IGNORECASE)
-        return model.group(1) if model else ""
-
-    def save_and_send_results(self, results: list[dict]):
-        """
-        Salva os resultados localmente e os envia para a API.
-        """
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")  # noqa: DTZ005
-        base_name = f"{self.category.name.lower()}_{timestamp}"
-
-        if self.local_results:
-            print(f"🗂️ Salvando resultados em {results_dir}...")
-            results_str = json.dumps(results, ensure_ascii=False, indent=4)
-            json_path = results_dir / f"{base_name}.json"
-            with json_path.open("w", encoding="utf-8") as f:
-                f.write(results_str)
-            print(f"  Resultados salvos em {json_path}")
-
-        # Enviar para a API
-        for result in results:
-            try:
-                response = requests.post(API_URL, json=result, timeout=10)
-                if response.status_code == HTTP_STATUS_CREATED:
-                    print(
-                        f"🚀 Produto '{result['name']}' enviado com sucesso para a API!",
-                    )
-                else:
-                    print(
-                        f"⚠️ Erro ao enviar para a API: {response.status_code} - {response.text}",
-                    )
-            except requests.exceptions.RequestException as e:
-                print(f"⚠️ Erro de conexão ao enviar '{result['name']}': {e}")
+        return parse_model(SpecSnapshot.from_locator(section))
 
 
 if __name__ == "__main__":
@@ -492,6 +709,7 @@ if __name__ == "__main__":
             local_results=True,
             page_limit=7,
             save_print=False,
+            workers=4,
         )
         scraper.run(headless=True)
 
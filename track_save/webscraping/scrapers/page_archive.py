@@ -0,0 +1,335 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote
+from urllib.parse import unquote
+
+ARCHIVE_MODES = ("record", "replay")
+INDEX_NAME = "index.ndjson"
+HTTP_NOT_FOUND = 404
+# Cabeçalhos que não valem para o corpo já decodificado guardado no arquivo
+DROPPED_HEADERS = frozenset(
+    {"connection", "content-encoding", "content-length", "transfer-encoding"},
+)
+# Marca as respostas 404 do FixtureServer para URLs que não foram gravadas
+MISS_HEADER = "X-Archive-Miss"
+
+
+def request_key(method, url, post_data=None):
+    digest = hashlib.sha256(f"{method.upper()} {url}\n".encode())
+    if post_data:
+        digest.update(post_data if isinstance(post_data, bytes) else post_data.encode())
+    return digest.hexdigest()
+
+
+class PageArchive:
+    """
+    Respostas HTTP gravadas em disco para rodar os scrapers sem acessar as lojas.
+
+    Endereçado pelo conteúdo: cada corpo fica em bodies/<sha[:2]>/<sha256> (o
+    mesmo script/CSS visto em várias páginas é gravado uma vez) e index.ndjson
+    liga cada requisição (método, URL e corpo) ao status, cabeçalhos, sha256 do
+    corpo e às tags da coleta (loja, categoria). Só faz append, então pode ser
+    gravado por várias threads e por coletas sucessivas.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.bodies_dir = self.root / "bodies"
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / INDEX_NAME
+        # chave da requisição -> entrada; (método, URL) -> última entrada, para
+        # requisições cujo corpo muda a cada visita
+        self.entries = {}
+        self.by_url = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.index_path.exists():
+            return
+        with self.index_path.open(encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    self.add(json.loads(line))
+
+    def add(self, entry):
+        self.entries[entry["key"]] = entry
+        self.by_url[(entry["method"], entry["url"])] = entry
+
+    def body_path(self, digest):
+        return self.bodies_dir / digest[:2] / digest
+
+    def put(  # noqa: PLR0913
+        self,
+        method,
+        url,
+        status,
+        headers,
+        body,
+        post_data=None,
+        tags=None,
+    ):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.body_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            tmp.replace(path)
+
+        entry = {
+            "key": request_key(method, url, post_data),
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": {
+                name.lower(): value
+                for name, value in headers.items()
+                if name.lower() not in DROPPED_HEADERS
+            },
+            "body": digest,
+            "size": len(body),
+            "tags": tags or {},
+        }
+        with self.lock:
+            with self.index_path.open("a", encoding="utf-8") as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.add(entry)
+        return entry
+
+    def get(self, method, url, post_data=None):
+        entry = self.entries.get(request_key(method, url, post_data))
+        return entry or self.by_url.get((method.upper(), url))
+
+    def read_body(self, entry):
+        return self.body_path(entry["body"]).read_bytes()
+
+    def pages(self, **tags):
+        """
+        Entradas HTML (status 200) cujas tags batem com as pedidas.
+        """
+        for entry in self.entries.values():
+            content_type = entry["headers"].get("content-type", "")
+            if (
+                entry["status"] == 200  # noqa: PLR2004
+                and "text/html" in content_type
+                and all(entry["tags"].get(tag) == value for tag, value in tags.items())
+            ):
+                yield entry
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ArchiveRequestHandler(BaseHTTPRequestHandler):
+    """
+    /<URL original codificada> -> resposta gravada no PageArchive do servidor.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def serve(self):
+        url = unquote(self.path.lstrip("/"))
+        length = int(self.headers.get("Content-Length") or 0)
+        post_data = self.rfile.read(length) if length else None
+        archive = self.server.archive
+        entry = archive.get(self.command, url, post_data)
+        if entry is None:
+            self.send_response(HTTP_NOT_FOUND)
+            self.send_header(MISS_HEADER, "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = archive.read_body(entry)
+        self.send_response(entry["status"])
+        for name, value in entry["headers"].items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = serve
+    do_POST = serve
+    do_PUT = serve
+    do_PATCH = serve
+    do_DELETE = serve
+    do_OPTIONS = serve
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+class FixtureServer:
+    """
+    Servidor HTTP local (numa thread) que devolve as respostas de um
+    PageArchive. O navegador continua pedindo as URLs das lojas; o
+    ArchiveRouter redireciona cada requisição para cá com url_for().
+    """
+
+    def __init__(self, archive, host="127.0.0.1", port=0):
+        self.archive = archive
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        self.httpd = ThreadingHTTPServer((self.host, self.port), ArchiveRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.archive = self.archive
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def url_for(self, original_url):
+        return f"{self.url}/{quote(original_url, safe='')}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class ArchiveRouter:
+    """
+    Handler de rotas do Playwright com a mesma interface do ResourceBlocker
+    (attach/attach_async), para ser usado no lugar dele:
+
+    - "record": cada requisição vai à loja e a resposta é gravada no archive;
+    - "replay": cada requisição é servida pelo FixtureServer, sem rede; URLs
+      que não foram gravadas são abortadas.
+
+    O ResourceBlocker, se houver, continua decidindo o que é abortado antes.
+    `pages` conta as navegações do frame principal (para o benchmark).
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        archive,
+        mode,
+        blocker=None,
+        server=None,
+        tags=None,
+    ):
+        if mode not in ARCHIVE_MODES:
+            msg = f"mode deve ser um de: {', '.join(ARCHIVE_MODES)}."
+            raise ValueError(msg)
+        self.archive = archive
+        self.mode = mode
+        self.blocker = blocker
+        self.tags = tags or {}
+        # Sem um servidor compartilhado, o replay sobe o próprio
+        self.owns_server = mode == "replay" and server is None
+        self.server = FixtureServer(archive).start() if self.owns_server else server
+        self.pages = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def skip(self, request):
+        """
+        Conta a requisição e diz se o ResourceBlocker a bloquearia.
+        """
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            with self._lock:
+                self.pages += 1
+        if self.blocker is None:
+            return False
+        blocked = self.blocker.should_block(request)
+        self.blocker.record(request, blocked)
+        return blocked
+
+    def is_miss(self, response):
+        if response.headers.get(MISS_HEADER.lower()) is None:
+            return False
+        with self._lock:
+            self.misses += 1
+        return True
+
+    def handle(self, route):
+        request = route.request
+        if self.skip(request):
+            route.abort()
+            return
+        if self.mode == "record":
+            # Redirecionamentos são gravados como 3xx; o navegador os segue
+            response = route.fetch(max_redirects=0)
+            self.archive.put(
+                request.method,
+                request.url,
+                response.status,
+                response.headers,
+                response.body(),
+                request.post_data_buffer,
+                self.tags,
+            )
+        else:
+            response = route.fetch(
+                url=self.server.url_for(request.url),
+                max_redirects=0,
+            )
+            if self.is_miss(response):
+                route.abort()
+                return
+        route.fulfill(response=response)
+
+    async def handle_async(self, route):
+        request = route.request
+        if self.skip(request):
+            await route.abort()
+            return
+        if self.mode == "record":
+            response = await route.fetch(max_redirects=0)
+            self.archive.put(
+                request.method,
+                request.url,
+                response.status,
+                response.headers,
+                await response.body(),
+                request.post_data_buffer,
+                self.tags,
+            )
+        else:
+            response = await route.fetch(
+                url=self.server.url_for(request.url),
+                max_redirects=0,
+            )
+            if self.is_miss(response):
+                await route.abort()
+                return
+        await route.fulfill(response=response)
+
+    def attach(self, target):
+        target.route("**/*", self.handle)
+        return target
+
+    async def attach_async(self, target):
+        await target.route("**/*", self.handle_async)
+        return target
+
+    def close(self):
+        if self.owns_server:
+            self.server.stop()
+
+    def print_summary(self, label=""):
+        print(
+            f"📼 {label} {self.mode}: {self.pages} páginas, "
+            f"{self.misses} requisições fora do arquivo.",
+        )
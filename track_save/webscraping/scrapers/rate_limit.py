@@ -0,0 +1,29 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Limite de requisições por minuto compartilhado entre threads: cada
+    acquire() reserva o próximo horário livre e dorme até ele, de modo que os
+    inícios de navegação ficam espaçados em 60 / requests_per_minute segundos.
+    """
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.waited = 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.interval <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            wait = start - now
+            self.waited += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,87 @@
+import gzip
+import json
+from itertools import islice
+from pathlib import Path
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def open_text(path):
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+def is_ndjson(path):
+    return Path(path).name.removesuffix(".gz").endswith(NDJSON_SUFFIXES)
+
+
+def iter_ndjson(file):
+    for line in file:
+        text = line.strip()
+        if text:
+            yield json.loads(text)
+
+
+def iter_json_array(file, chunk_size=READ_CHUNK_SIZE):
+    """
+    Lê um array JSON ([{...}, {...}]) elemento a elemento, sem carregar o
+    arquivo inteiro: o texto é lido em blocos e cada elemento é decodificado
+    com raw_decode assim que estiver completo no buffer.
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size).lstrip()
+    if not buffer:
+        return
+    if not buffer.startswith("["):
+        msg = "O arquivo não contém um array JSON."
+        raise ValueError(msg)
+    buffer = buffer[1:]
+    eof = False
+
+    while True:
+        buffer = buffer.lstrip().removeprefix(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            value, end = decoder.raw_decode(buffer)
+            # Um número no fim do buffer pode estar cortado ("12" de "123")
+            complete = eof or end < len(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield value
+        buffer = buffer[end:]
+
+
+def iter_records(path):
+    """
+    Registros de um arquivo de resultados, um por vez: NDJSON (.ndjson/.jsonl)
+    ou array JSON (.json), opcionalmente com gzip (.gz).
+    """
+    with open_text(path) as file:
+        if is_ndjson(path):
+            try:
+                yield from iter_ndjson(file)
+            except EOFError:
+                # gzip cortado: coleta interrompida (ver ResultWriter)
+                return
+        else:
+            yield from iter_json_array(file)
+
+
+def chunked(iterable, size):
+    """
+    Agrupa um iterável em listas de até `size` itens.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,126 @@
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+# Tipos de recurso que nenhum scraper lê: a URL das imagens continua no DOM (src)
+DEFAULT_BLOCKED_TYPES = frozenset({"image", "media", "font"})
+
+# Domínios próprios de cada loja; qualquer outro domínio (ads, trackers, widgets)
+# é bloqueado para tudo que não seja a navegação principal
+STORE_ALLOWED_DOMAINS = {
+    "kabum": ("kabum.com.br",),
+    "terabyte": ("terabyteshop.com.br",),
+    "amazon": (
+        "amazon.com.br",
+        "media-amazon.com",
+        "ssl-images-amazon.com",
+    ),
+}
+
+# Tamanho médio estimado por tipo de recurso, em bytes. Requisições abortadas
+# não têm tamanho conhecido, então a economia é uma estimativa.
+ESTIMATED_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 80_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+class ResourceBlocker:
+    """
+    Intercepta as requisições de uma página/contexto do Playwright e aborta
+    os tipos de recurso e domínios de terceiros desnecessários para a extração.
+    Mantém contadores de requisições e bytes (estimados) economizados.
+    Pode ser compartilhado entre threads e usado com a API síncrona ou assíncrona.
+    """
+
+    def __init__(
+        self,
+        allowed_domains=None,
+        blocked_types=DEFAULT_BLOCKED_TYPES,
+    ):
+        # None: não filtra por domínio, só por tipo
+        self.allowed_domains = tuple(allowed_domains) if allowed_domains else None
+        self.blocked_types = frozenset(blocked_types)
+        self.blocked = Counter()
+        self.allowed = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_store(cls, store, **kwargs):
+        return cls(allowed_domains=STORE_ALLOWED_DOMAINS.get(store.lower()), **kwargs)
+
+    def is_third_party(self, url):
+        if self.allowed_domains is None:
+            return False
+        host = urlparse(url).hostname or ""
+        return not any(
+            host == domain or host.endswith(f".{domain}")
+            for domain in self.allowed_domains
+        )
+
+    def should_block(self, request):
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            return False
+        return request.resource_type in self.blocked_types or self.is_third_party(
+            request.url,
+        )
+
+    def record(self, request, blocked):
+        with self._lock:
+            if blocked:
+                self.blocked[request.resource_type] += 1
+                self.bytes_saved += ESTIMATED_BYTES.get(
+                    request.resource_type,
+                    DEFAULT_ESTIMATED_BYTES,
+                )
+            else:
+                self.allowed += 1
+
+    def handle(self, route):
+        blocked = self.should_block(route.request)
+        self.record(route.request, blocked)
+        if blocked:
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route):
+        blocked = self.should_block(route.request)
+        self.record(route.request, blocked)
+        if blocked:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def attach(self, target):
+        """
+        Ativa o bloqueio numa Page ou BrowserContext (API síncrona).
+        """
+        target.route("**/*", self.handle)
+        return target
+
+    async def attach_async(self, target):
+        await target.route("**/*", self.handle_async)
+        return target
+
+    def summary(self):
+        with self._lock:
+            return {
+                "requests_allowed": self.allowed,
+                "requests_blocked": sum(self.blocked.values()),
+                "blocked_by_type": dict(self.blocked),
+                "estimated_bytes_saved": self.bytes_saved,
+            }
+
+    def print_summary(self, label=""):
+        summary = self.summary()
+        print(
+            f"🧹 {label} {summary['requests_blocked']} requisições bloqueadas "
+            f"(~{summary['estimated_bytes_saved'] / 1_000_000:.1f} MB), "
+            f"{summary['requests_allowed']} liberadas.",
+        )
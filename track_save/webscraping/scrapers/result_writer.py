@@ -0,0 +1,114 @@
+import gzip
+import json
+import threading
+from collections import Counter
+from pathlib import Path
+
+from .record_stream import chunked
+
+RESULT_SUFFIX = ".ndjson.gz"
+RESULT_FLUSH_SIZE = 100
+
+
+def iter_written(path):
+    """
+    Registros de um arquivo do ResultWriter, um por vez. Aceita arquivos de
+    coletas interrompidas: a última linha incompleta e o fim do gzip cortado
+    são ignorados.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                if not line.endswith("\n"):
+                    return
+                if line.strip():
+                    yield json.loads(line)
+        except EOFError:
+            return
+
+
+class ResultWriter:
+    """
+    Grava os produtos de uma coleta à medida que são capturados, em NDJSON
+    comprimido (gzip) e só com append: cada registro é descarregado no disco
+    na hora, então uma coleta que cair no meio pode ser recuperada com
+    replay(). Com um sink, a cada `flush_size` registros o lote é entregue a
+    ele (ver sinks.py) e descartado da memória.
+
+    `transform(lote) -> lote` converte os registros antes do sink (ex.: os
+    produtos crus da Terabyte/Amazon para o formato de ingest_products); o
+    arquivo guarda sempre o registro original. write() pode ser chamado de
+    várias threads.
+    """
+
+    def __init__(
+        self,
+        path,
+        sink=None,
+        flush_size=RESULT_FLUSH_SIZE,
+        transform=None,
+        append=False,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.sink = sink
+        self.flush_size = flush_size
+        self.transform = transform
+        self.count = 0
+        self.summary = Counter()
+        self.pending = []
+        self.lock = threading.Lock()
+        # Fica aberto durante a coleta; fechado por close() / __exit__
+        self.file = gzip.open(  # noqa: SIM115
+            self.path,
+            "at" if append else "wt",
+            encoding="utf-8",
+        )
+
+    def write(self, record):
+        with self.lock:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.file.flush()
+            self.count += 1
+            if self.sink is not None:
+                self.pending.append(record)
+                if len(self.pending) >= self.flush_size:
+                    self.send_pending()
+
+    def send_pending(self):
+        records, self.pending = self.pending, []
+        if self.transform is not None:
+            records = self.transform(records)
+        if records:
+            self.summary.update(self.sink.write(records))
+
+    def flush(self):
+        with self.lock:
+            self.file.flush()
+            if self.sink is not None and self.pending:
+                self.send_pending()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        if self.count:
+            print(f"🗂️ {self.count} produtos gravados em {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def replay(path, sink, chunk_size=RESULT_FLUSH_SIZE, transform=None):
+        """
+        Reenvia ao sink os registros de um arquivo já gravado (por exemplo, de
+        uma coleta interrompida antes de entregar tudo). Retorna o resumo.
+        """
+        summary = Counter()
+        for chunk in chunked(iter_written(path), chunk_size):
+            records = transform(chunk) if transform is not None else chunk
+            if records:
+                summary.update(sink.write(records))
+        return dict(summary)
@@ -1,83 +1,155 @@
-import time
-
+from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import sync_playwright
 
 from track_save.webscraping.enums import Categories
 
+from .page_archive import ArchiveRouter
+from .request_filter import ResourceBlocker
+from .sinks import default_sink
+from .waiting import WaitStats
+from .waiting import wait_for
+from .waiting import wait_for_any
+from .waiting import wait_gone
+
 
 class Scraper:
+    # Loja usada para escolher a allowlist de domínios do ResourceBlocker
+    store_name = None
+    # Aborta imagens, fontes, mídia e domínios de terceiros durante a coleta
+    block_resources = True
+    # Latência das esperas; recriado a cada init_browser
+    wait_stats = None
+    # RateLimiter opcional (orçamento de requisições da loja), usado por goto()
+    rate_limiter = None
+    # ResultSink que recebe os produtos; None: default_sink() no primeiro uso
+    sink = None
+    # PageArchive e modo ("record" grava as páginas visitadas, "replay" as
+    # serve de um FixtureServer local, sem acessar a loja)
+    archive = None
+    archive_mode = "replay"
+    archive_router = None
+
     def init_browser(self, headless=True):
         """Inicializa o navegador com Playwright."""
         self.playwright = sync_playwright().start()
         browser = self.playwright.chromium.launch(headless=headless)
-        page = browser.new_page()
+        self.wait_stats = WaitStats()
+        self.start_routing()
+        page = self.new_page(browser)
         return browser, page
 
+    def archive_tags(self):
+        """
+        Tags gravadas com cada resposta no modo "record".
+        """
+        return {"store": self.store_name}
+
+    def start_routing(self):
+        """
+        Cria o ResourceBlocker e, com self.archive, o ArchiveRouter que
+        new_page aplica às páginas.
+        """
+        self.resource_blocker = (
+            ResourceBlocker.for_store(self.store_name or "")
+            if self.block_resources
+            else None
+        )
+        self.archive_router = (
+            ArchiveRouter(
+                self.archive,
+                self.archive_mode,
+                blocker=self.resource_blocker,
+                tags=self.archive_tags(),
+            )
+            if self.archive is not None
+            else None
+        )
+
+    def stop_routing(self):
+        if getattr(self, "resource_blocker", None) is not None:
+            self.resource_blocker.print_summary(self.store_name or "")
+        if self.archive_router is not None:
+            self.archive_router.close()
+            self.archive_router.print_summary(self.store_name or "")
+
+    def new_page(self, browser):
+        """
+        Abre uma página num contexto novo, com o bloqueio de recursos ativo.
+        O mesmo ResourceBlocker (ou ArchiveRouter) é compartilhado por todas as
+        páginas do scraper.
+        """
+        context = browser.new_context()
+        if self.archive_router is not None:
+            self.archive_router.attach(context)
+        elif getattr(self, "resource_blocker", None) is not None:
+            self.resource_blocker.attach(context)
+        return context.new_page()
+
+    def goto(self, page, url, **kwargs):
+        """
+        page.goto respeitando o rate_limiter do scraper, se houver.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return page.goto(url, **kwargs)
+
+    def get_sink(self):
+        if self.sink is None:
+            self.sink = default_sink()
+        return self.sink
+
     def close_browser(self, browser):
         browser.close()
         self.playwright.stop()
+        self.stop_routing()
+        if self.wait_stats is not None:
+            self.wait_stats.print_summary()
+
+    def wait_for_any(self, locators, timeout=10000, state="visible", name="wait"):
+        """
+        Primeiro dos locators a aparecer (ou None), com latência registrada
+        em self.wait_stats.
+        """
+        return wait_for_any(locators, timeout, state, self.wait_stats, name)
+
+    def wait_for(self, locator, timeout=10000, state="visible", name="wait"):
+        return wait_for(locator, timeout, state, self.wait_stats, name)
+
+    def wait_gone(self, locator, timeout=10000, name="wait_gone"):
+        return wait_gone(locator, timeout, self.wait_stats, name)
 
     def element_visible(self, locator):
-        result = False
         try:
-            for i in range(locator.count()):
-                if locator.nth(i).is_visible():
-                    result = True
-                    break
-        except:  # noqa: E722
-            pass
-        return result
+            return locator.filter(visible=True).count() > 0
+        except PlaywrightError:
+            return False
 
     def any_elements_visible(self, locators=[]):  # noqa: B006
-        result = False
-        try:
-            for i in range(len(locators)):
-                try:
-                    for j in range(locators[i].count()):
-                        if locators[i].nth(j).is_visible():
-                            result = True
-                except:  # noqa: E722
-                    pass
-                if result:
-                    break
-        except:  # noqa: E722
-            pass
-        return result
+        return any(self.element_visible(locator) for locator in locators)
 
     def wait_element_and_click(  # noqa: PLR0913
         self,
         page,
         locator,
         timeout=10000,
-        timeout_before=100,
+        timeout_before=0,
         force=False,
         no_wait_after=False,
     ):
-        page.wait_for_timeout(timeout_before)
+        if timeout_before:
+            page.wait_for_timeout(timeout_before)
         if self.wait_element(locator, timeout=timeout):
             locator.click(force=force, no_wait_after=no_wait_after)
             return True
         return False
 
     def wait_element(self, locator, timeout=10000, visible=True):
-        find_result = False
-
-        current_timeout = 0
-        while current_timeout <= timeout and not find_result:
-            try:
-                if visible:
-                    locator.first.wait_for(state="visible", timeout=500)
-                    find_result = True
-                else:
-                    time.sleep(0.5)
-                    if locator.count() > 0:
-                        find_result = True
-                    else:
-                        current_timeout = current_timeout + 500
-            except:  # noqa: E722
-                current_timeout = current_timeout + 500
-
-        return find_result
+        return self.wait_for(
+            locator,
+            timeout=timeout,
+            state="visible" if visible else "attached",
+            name="wait_element",
+        )
 
     def wait_elements(
         self,
@@ -87,51 +159,20 @@ class Scraper:
         return_locator=False,
         visible=True,
     ):
-        time_count = 0
-        find_result = False
-        locator = None
-        while not find_result and time_count < timeout:
-            for i in range(len(locators)):
-                try:
-                    for j in range(locators[i].count()):
-                        if visible:
-                            if locators[i].nth(j).is_visible():
-                                find_result = True
-                                locator = locators[i].nth(j)
-                            break
-                        if locators[i].nth(j).count() > 0:
-                            find_result = True
-                            locator = locators[i].nth(j)
-                            break
-                except AttributeError:
-                    pass
-                time_count = time_count + 500
-                try:
-                    page.wait_for_timeout(500)
-                except:  # noqa: E722
-                    time.sleep(0.5)
-
+        locator = self.wait_for_any(
+            locators,
+            timeout=timeout,
+            state="visible" if visible else "attached",
+            name="wait_elements",
+        )
         if return_locator:
             return locator
-        return find_result
+        return locator is not None
 
-    def wait_element_disappear(self, page, locator, timeout=60000, timeout_page=1000):
-        try:
+    def wait_element_disappear(self, page, locator, timeout=60000, timeout_page=0):
+        if timeout_page:
             page.wait_for_timeout(timeout_page)
-        except TimeoutError:
-            time.sleep(0.1)
-
-        current_timeout = 0
-        while current_timeout <= timeout:
-            try:
-                if locator.count() == 1:
-                    locator.wait_for(state="hidden", timeout=500)
-                elif locator.count() > 1:
-                    for i in range(locator.count()):
-                        locator.nth(i).wait_for(state="hidden", timeout=500)
-                        break
-            except:  # noqa: E722
-                current_timeout = current_timeout + 500
+        return self.wait_gone(locator, timeout=timeout, name="wait_element_disappear")
 
     def parse_category(
         self,
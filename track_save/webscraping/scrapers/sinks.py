@@ -0,0 +1,184 @@
+import asyncio
+import importlib
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .record_stream import chunked
+
+try:
+    from django.apps import apps
+    from django.db import connections
+except ImportError:  # scraper avulso, sem o Django instalado: só RemoteBulkSink
+    apps = None
+    connections = None
+
+DEFAULT_API_URL = "http://localhost:8001/api/"
+DEFAULT_CHUNK_SIZE = 500
+HTTP_STATUS_OK = 200
+
+
+def ingest_controller():
+    """
+    api.controllers.ingest_controller, importado só quando o OrmBulkSink grava:
+    importar os models exige o Django configurado, e os scrapers também rodam
+    fora dele (RemoteBulkSink).
+    """
+    return importlib.import_module("api.controllers.ingest_controller")
+
+
+class ResultSink:
+    """
+    Destino dos produtos coletados por um Scraper.
+
+    write(records) grava uma lista de produtos e devolve o resumo da ingestão
+    ({"created", "updated", "unchanged", "error", "prices_created"});
+    sweep_prices(store, prices) atualiza só preços (ver ingest_controller.sweep_prices)
+    e devolve o resultado, ou None em caso de erro.
+    """
+
+    def write(self, records):
+        raise NotImplementedError
+
+    def sweep_prices(self, store, prices):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_outside_event_loop(func, *args):
+    """
+    Chama func(*args) numa thread própria se houver um event loop rodando
+    nesta thread (a API síncrona do Playwright mantém um), já que o ORM do
+    Django recusa chamadas síncronas nesse contexto.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return func(*args)
+
+    def call():
+        try:
+            return func(*args)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(call).result()
+
+
+class OrmBulkSink(ResultSink):
+    """
+    Grava direto pelo ORM, em lotes, via ingest_products (mesmo processo,
+    sem HTTP). Exige o Django configurado (comandos, worker de jobs).
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def write(self, records):
+        ingest = ingest_controller()
+        summary = Counter()
+        for chunk in chunked(records, self.chunk_size):
+            summary.update(
+                ingest.summarize_outcomes(
+                    run_outside_event_loop(ingest.ingest_products, chunk),
+                ),
+            )
+            print(f"🚀 Lote de {len(chunk)} produtos gravado: {dict(summary)}")
+        return dict(summary)
+
+    def sweep_prices(self, store, prices):
+        try:
+            return run_outside_event_loop(
+                ingest_controller().sweep_prices,
+                store,
+                prices,
+            )
+        except ValueError as e:
+            print(f"⚠️ Erro ao atualizar preços: {e}")
+            return None
+
+
+class RemoteBulkSink(ResultSink):
+    """
+    Envia para a API (products/bulk/ e prices/sweep/) em lotes, numa única
+    requests.Session: as conexões ficam abertas (keep-alive) entre os lotes e
+    falhas de conexão/5xx são repetidas com backoff.
+    A URL base vem de `base_url`, da variável SCRAPER_API_URL ou DEFAULT_API_URL.
+    """
+
+    def __init__(self, base_url=None, chunk_size=DEFAULT_CHUNK_SIZE, timeout=120):
+        self.base_url = (
+            base_url or os.environ.get("SCRAPER_API_URL") or DEFAULT_API_URL
+        ).rstrip("/") + "/"
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            # a ingestão é idempotente (hash do produto, preço só quando muda)
+            allowed_methods=frozenset({"POST"}),
+        )
+        self.session.mount("http://", HTTPAdapter(max_retries=retry))
+        self.session.mount("https://", HTTPAdapter(max_retries=retry))
+
+    def post(self, path, payload):
+        try:
+            response = self.session.post(
+                self.base_url + path,
+                json=payload,
+                timeout=self.timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Erro de conexão com a API ({path}): {e}")
+            return None
+        if response.status_code != HTTP_STATUS_OK:
+            print(
+                f"⚠️ Erro da API ({path}): {response.status_code} - {response.text}",
+            )
+            return None
+        return response.json()
+
+    def write(self, records):
+        summary = Counter()
+        for chunk in chunked(records, self.chunk_size):
+            data = self.post("products/bulk/", chunk)
+            if data is None:
+                summary["error"] += len(chunk)
+                continue
+            summary.update(data["summary"])
+            print(f"🚀 Lote de {len(chunk)} produtos enviado à API: {data['summary']}")
+        return dict(summary)
+
+    def sweep_prices(self, store, prices):
+        return self.post("prices/sweep/", {"store": store, "prices": prices})
+
+    def close(self):
+        self.session.close()
+
+
+def default_sink():
+    """
+    OrmBulkSink quando o Django está carregado neste processo (comandos,
+    worker de jobs), senão RemoteBulkSink. SCRAPER_SINK=orm|remote força um deles.
+    """
+    choice = os.environ.get("SCRAPER_SINK")
+    if choice is None:
+        choice = "orm" if apps is not None and apps.ready else "remote"
+    if choice == "orm":
+        return OrmBulkSink()
+    return RemoteBulkSink()
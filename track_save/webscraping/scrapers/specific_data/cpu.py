@@ -2,85 +2,37 @@ import re
 
 from playwright.sync_api import Locator
 
+from .snapshot import SpecSnapshot
 
-def get_integrated_video(section: Locator) -> str:  # noqa: C901
+
+def parse_integrated_video(snapshot: SpecSnapshot) -> str:
     """
     Retorna Integrated Video no formato "Intel® UHD Graphics 770"
     """
-    integrated_video = ""
-
     # 1º método: procura por "Gráficos" em <p> com <strong>
     # ex: <p><strong>Gráficos</strong></p> <p>- GDDR6 16 GB</p>
-    headings = section.locator("p:has(strong:has-text('Gráficos'))").all()
-    for p in headings:
-        strong_txt = p.locator("strong").inner_text().strip().rstrip(":").lower()
-        if (
-            "gráficos" not in strong_txt
-            # or "relógio" in strong_txt
-            # or "velocidade" in strong_txt
-        ):
+    for heading, sibling in snapshot.headings:
+        if "gráficos" not in heading.strip().rstrip(":").lower() or not sibling:
             continue
-
-        try:
-            sib = p.locator(
-                "xpath=following-sibling::p[normalize-space()][1]",
-            ).first
-            integrated_video_raw = sib.inner_text(
-                timeout=500,
-            ).strip()  # ex: "- 16 GB GDDR6"
-            return integrated_video_raw.lstrip("- ").strip()  # → "16 GB GDDR6"
-        except AttributeError:
-            integrated_video = ""
+        return sibling.lstrip("- ").strip()  # "- Intel® UHD Graphics 770"
 
     # 2º método: procura por "Gráficos do processador" em <span> ou <p>
     # ex: <p>- Gráficos do processador ‡: Intel® UHD Graphics 770</p>
-    candidates = [
-        "span:has-text('Gráficos do processador')",
-        "p:has-text('Gráficos do processador')",
-    ]
+    for line in snapshot.lines_containing("Gráficos do processador"):
+        integrated_video_clean = line.lstrip("- ").strip()
+        # só aceita se começar realmente com "Gráficos do processador:" (ou "‡:")
+        integrated_video = re.match(
+            r"Gráficos do processador(?: ‡)?:\s*(.+)$",
+            integrated_video_clean,
+            flags=re.IGNORECASE,
+        )
+        if integrated_video:
+            return integrated_video.group(1).strip()
 
-    for sel in candidates:
-        locs = section.locator(sel)
-        for i in range(locs.count()):
-            try:
-                integrated_video_raw = locs.nth(i).inner_text(timeout=500).strip()
-            except AttributeError:
-                integrated_video = ""
-            # só prossegue se começar realmente com "- Gráficos do processador:"
-            integrated_video_clean = integrated_video_raw.lstrip(
-                "- ",
-            ).strip()  # ex: "- Gráficos do processador‡: Intel® UHD Graphics 770"
-            if re.match(
-                r"^Gráficos do processador:",
-                integrated_video_clean,
-                flags=re.IGNORECASE,
-            ):
-                integrated_video = re.match(
-                    r"Gráficos do processador:\s*(.+)$",
-                    integrated_video_clean,
-                    flags=re.IGNORECASE,
-                )
-                if integrated_video:
-                    return integrated_video.group(1).strip()
-            elif re.match(
-                r"^Gráficos do processador ‡:",
-                integrated_video_clean,
-                flags=re.IGNORECASE,
-            ):
-                integrated_video = re.match(
-                    r"Gráficos do processador ‡:\s*(.+)$",
-                    integrated_video_clean,
-                    flags=re.IGNORECASE,
-                )
-                if integrated_video:
-                    return integrated_video.group(1).strip()
-            else:
-                continue
-
-    return integrated_video or ""
+    return ""
 
 
-def get_socket(section: Locator) -> str:
+def parse_socket(snapshot: SpecSnapshot) -> str:
     """
     Retorna o socket no formato "LGA1200", "1700", "AM4", etc.
     """
@@ -93,23 +45,10 @@ def get_socket(section: Locator) -> str:
         r"Soquete da CPU:",
     ]
 
-    for pat in patterns:
-        # usa text=/…/i para casar qualquer linha que comece com o label
-        loc = section.locator(f"text=/{pat}/i")
-        if not loc.count():
-            continue
-        txt = loc.first.inner_text().strip()
-        # remove prefixos tipo "-" ou espaços
-        cleaned = re.sub(r"^[-\s]*", "", txt)
-        # captura tudo após ":"
-        m = re.search(r":\s*(.+)$", cleaned)
-        if m:
-            return m.group(1).strip()
-
-    return ""
+    return snapshot.value_after(patterns)
 
 
-def get_core_number(section: Locator) -> str:
+def parse_core_number(snapshot: SpecSnapshot) -> str:
     """
     Retorna o número de núcleos no formato:
     - "20"
@@ -123,21 +62,10 @@ def get_core_number(section: Locator) -> str:
         r"Nº de núcleos de CPU:",
     ]
 
-    for pat in patterns:
-        loc = section.locator(f"text=/{pat}/i")
-        if not loc.count():
-            continue
-        txt = loc.first.inner_text().strip()
-        # limpa o "-", espaços, quebras de linha…
-        cleaned = re.sub(r"^[-\s]*", "", txt)
-        # extrai tudo que vier depois do “:”
-        m = re.search(r":\s*(.+)$", cleaned)
-        if m:
-            return m.group(1).strip()
-    return ""
+    return snapshot.value_after(patterns)
 
 
-def get_threads(section: Locator) -> str:
+def parse_threads(snapshot: SpecSnapshot) -> str:
     """
     Retorna o número de threads no formato:
     - "16"
@@ -151,19 +79,10 @@ def get_threads(section: Locator) -> str:
         r"Nº de threads:",
     ]
 
-    for pat in patterns:
-        loc = section.locator(f"text=/{pat}/i")
-        if not loc.count():
-            continue
-        txt = loc.first.inner_text().strip()
-        cleaned = re.sub(r"^[-\s]*", "", txt)
-        m = re.search(r":\s*(\d+)", cleaned)
-        if m:
-            return m.group(1)
-    return ""
+    return snapshot.value_after(patterns, value=r":\s*(\d+)")
 
 
-def get_frequency(section: Locator, name: str) -> str:
+def parse_frequency(snapshot: SpecSnapshot, name: str) -> str:
     frequency = ""
 
     # 1) tente achar no HTML alguma linha que fale de "base" ou "básico"
@@ -173,10 +92,9 @@ def get_frequency(section: Locator, name: str) -> str:
         r"Rel[oó]gio b[aá]sico[:\s–-]*([\d,]+\s*GHz)",
     ]
     for pat in patterns:
-        # usar o text selector com regex para encontrar o parágrafo inteiro
-        loc = section.locator(f"text=/{pat}/i")
-        if loc.count():
-            txt = loc.first.inner_text().strip()
+        # primeira linha que casa com o regex
+        txt = snapshot.find_line(pat)
+        if txt:
             m = re.search(pat, txt, flags=re.IGNORECASE)
             if m:
                 # normaliza vírgula para ponto e retorna só o número + unidade
@@ -199,14 +117,14 @@ def get_frequency(section: Locator, name: str) -> str:
     return frequency or ""
 
 
-def get_mem_speed(section: Locator) -> str:
+def parse_mem_speed(snapshot: SpecSnapshot) -> str:
     """
     Extrai todas as velocidades de memória (DDR4 e DDR5)
     de dentro da seção técnica, seja num parágrafo com <br>
     ou em vários <p> abaixo de um <strong>.
     Retorna algo como "DDR5 4800 | DDR4 3200 | DDR4 2933 | DDR4 2667"
     """
-    text = section.inner_text().strip()
+    text = snapshot.text
 
     raw = re.findall(
         r"(DDR[45])[-\s]?(\d{3,4})(?:\s*MT/s)?",
@@ -223,3 +141,27 @@ def get_mem_speed(section: Locator) -> str:
             out.append(speed)
 
     return " | ".join(out)
+
+
+def get_integrated_video(section: Locator) -> str:
+    return parse_integrated_video(SpecSnapshot.from_locator(section))
+
+
+def get_socket(section: Locator) -> str:
+    return parse_socket(SpecSnapshot.from_locator(section))
+
+
+def get_core_number(section: Locator) -> str:
+    return parse_core_number(SpecSnapshot.from_locator(section))
+
+
+def get_threads(section: Locator) -> str:
+    return parse_threads(SpecSnapshot.from_locator(section))
+
+
+def get_frequency(section: Locator, name: str) -> str:
+    return parse_frequency(SpecSnapshot.from_locator(section), name)
+
+
+def get_mem_speed(section: Locator) -> str:
+    return parse_mem_speed(SpecSnapshot.from_locator(section))
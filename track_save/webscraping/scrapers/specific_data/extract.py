@@ -0,0 +1,133 @@
+import re
+
+from track_save.webscraping.enums import Categories
+
+from . import cpu
+from . import gpu
+from . import keyboard
+from . import mouse
+from . import ram
+from .snapshot import SpecSnapshot
+
+
+def parse_model(snapshot: SpecSnapshot) -> str:
+    model_name = next(iter(snapshot.lines_containing("Modelo")), "")
+    if not model_name:
+        return ""
+
+    model = re.search(r"Modelo:\s*(.+)$", model_name, flags=re.IGNORECASE)
+    return model.group(1) if model else ""
+
+
+def specific_data_from_snapshot(  # noqa: PLR0911
+    category: Categories,
+    snapshot: SpecSnapshot,
+    name: str,
+) -> dict:
+    if category == Categories.MOTHERBOARD:
+        return {
+            "socket": "AM4/AM5/LGA1200",
+            "model": parse_model(snapshot),
+            "chipset": gpu.get_chipset(name=name),
+            "form_type": "ATX/ITX",
+            "max_ram_capacity": "64GB",
+            "ram_type": "DDR4/DDR5",
+            "ram_slots": "4",
+            "pcie_slots": "2",
+            "sata_ports": "6",
+            "m2_slot": "1",
+        }
+
+    if category == Categories.GPU:
+        return {
+            "model": parse_model(snapshot),
+            "vram": gpu.parse_vram(snapshot),
+            "chipset": gpu.get_chipset(name=name),
+            "max_resolution": gpu.parse_max_resolution(snapshot),
+            "output": gpu.parse_output(snapshot),
+            "tech_support": gpu.parse_tech_support(snapshot),
+        }
+
+    if category == Categories.CPU:
+        return {
+            "model": parse_model(snapshot),
+            "integrated_video": cpu.parse_integrated_video(snapshot),
+            "socket": cpu.parse_socket(snapshot),
+            "core_number": cpu.parse_core_number(snapshot),
+            "thread_number": cpu.parse_threads(snapshot),
+            "frequency": cpu.parse_frequency(snapshot, name=name),
+            "mem_speed": cpu.parse_mem_speed(snapshot),
+        }
+
+    if category == Categories.STORAGE:
+        return {
+            "capacity_gb": "256/512/1024",
+            "storage_type": "SSD/HDD",
+            "interface": "SATA/PCIe NVMe",
+            "form_factor": '2.5"/M.2',
+            "read_speed": "500MB/s",
+            "write_speed": "450MB/s",
+        }
+
+    if category == Categories.KEYBOARD:
+        return {
+            "model": parse_model(snapshot),
+            "key_type": keyboard.parse_key_type(snapshot, name),
+            "layout": keyboard.parse_layout(snapshot),
+            "connectivity": keyboard.parse_connectivity(snapshot),
+            "dimension": keyboard.parse_dimension(snapshot),
+        }
+
+    if category == Categories.MOUSE:
+        return {
+            "model": parse_model(snapshot),
+            "dpi": mouse.parse_dpi(snapshot),
+            "connectivity": mouse.parse_connectivity(snapshot),
+            "color": mouse.parse_color(snapshot),
+        }
+
+    if category == Categories.MONITOR:
+        return {
+            "model": parse_model(snapshot),
+            "inches": '24"/27"',
+            "panel_type": "IPS/TN",
+            "proportion": "16:9/21:9",
+            "resolution": "1920x1080/2560x1440",
+            "refresh_rate": "60Hz/144Hz",
+            "color_support": "16.7M/1.07B",
+            "output": "HDMI/DisplayPort/VGA",
+        }
+
+    if category == Categories.RAM:
+        return {
+            "model": parse_model(snapshot),
+            "capacity": ram.parse_capacity(snapshot),
+            "ddr": ram.parse_ddr(snapshot),
+            "speed": ram.parse_speed(snapshot),
+        }
+
+    if category == Categories.COMPUTER:
+        return {
+            "is_notebook": False,
+            "motherboard": "B550/B550M",
+            "cpu": "AMD Ryzen 5/Intel Core i5",
+            "ram": "16GB DDR4",
+            "storage": "512GB SSD/1TB HDD",
+            "gpu": "AMD Radeon RX 6600/NVIDIA GeForce GTX 1660",
+            "inches": '24"/27"',
+            "panel_type": "IPS/TN",
+            "resolution": "1920x1080/2560x1440",
+            "refresh_rate": "60Hz/144Hz",
+            "color_support": "16.7M/1.07B",
+            "output": "HDMI/DisplayPort/VGA",
+        }
+
+    return {}
+
+
+def extract_specific_data(category: Categories, html: str, name: str) -> dict:
+    """
+    Parsing completo a partir do HTML de #technicalInfoSection.
+    Função de módulo e argumentos picklable: pode ser enviada a um ProcessPoolExecutor.
+    """
+    return specific_data_from_snapshot(category, SpecSnapshot.from_html(html), name)
@@ -1,10 +1,11 @@
 import re
-import unicodedata
 
 from playwright.sync_api import Locator
 
+from .snapshot import SpecSnapshot
 
-def get_vram(section: Locator) -> str:  # noqa: C901, PLR0911, PLR0912
+
+def parse_vram(snapshot: SpecSnapshot) -> str:
     """
     Retorna VRAM no formato "8GB GDDR6", cobrindo ambos os layouts só com <p>:
       - vários <p> com "- Chave: Valor"
@@ -15,21 +16,7 @@ def get_vram(section: Locator) -> str:  # noqa: C901, PLR0911, PLR0912
 
     # 1º método: procura por "Capacidade" ou "Tamanho" em <p> com "- Chave: Valor"
     # ex: <p>- Capacidade: 8 GB</p> ou <p>- Tamanho máximo da memória: 8 GB</p>
-    vram = ""
-
-    specs = {}
-    paras = section.locator("p")
-    for i in range(paras.count()):
-        try:
-            text = paras.nth(i).inner_text().strip()
-            # limpa traço e espaços
-            text = text.lstrip("- ").strip()
-            if ":" not in text:
-                continue
-            key, val = [s.strip() for s in text.split(":", 1)]
-            specs[key] = val
-        except AttributeError:
-            vram = ""
+    specs = snapshot.specs
 
     vram_size = (
         specs.get("Capacidade")
@@ -49,83 +36,35 @@ def get_vram(section: Locator) -> str:  # noqa: C901, PLR0911, PLR0912
 
     # 2º método: procura por "Memória" em <p> com <strong>
     # ex: <p><strong>Memória</strong></p> <p>- GDDR6 16 GB</p>
-    headings = section.locator("p:has(strong)").all()
-    for p in headings:
-        strong_txt = p.locator("strong").inner_text().strip().rstrip(":").lower()
+    for heading, sibling in snapshot.headings:
+        strong_txt = heading.strip().rstrip(":").lower()
         if (
             "memória" not in strong_txt
             or "relógio" in strong_txt
             or "velocidade" in strong_txt
+            or not sibling
         ):
             continue
-
-        try:
-            sib = p.locator(
-                "xpath=following-sibling::p[normalize-space()][1]",
-            ).first
-            vram_raw = sib.inner_text(timeout=500).strip()  # ex: "- 16 GB GDDR6"
-            return vram_raw.lstrip("- ").strip()  # → "16 GB GDDR6"
-        except AttributeError:
-            vram = ""
+        return sibling.lstrip("- ").strip()  # "- 16 GB GDDR6" → "16 GB GDDR6"
 
     # 3º método: procura por "Memória" em <span> com "Memória:"
     # ex: <p><span>- Memória: 12 GB GDDR7</span></p>
-    candidates = [
-        "span:has-text('Memória')",
-        "p:has-text('Memória')",
+    labels = [
+        r"Memória:",
+        r"Tamanho da Memória:",
+        r"Tamanho da memória/barramento:",
+        r"Tamanho da memória",
     ]
-
-    for sel in candidates:
-        locs = section.locator(sel)
-        for i in range(locs.count()):
-            try:
-                vram_raw = locs.nth(i).inner_text(timeout=500).strip()
-            except AttributeError:
-                vram = ""
-            # só prossegue se começar realmente com "- Memória:"
-            vram_clean = vram_raw.lstrip(
-                "- ",
-            ).strip()  # ex: "- Memória: 8 GB GDDR6"
-            if re.match(r"^Memória:", vram_clean, flags=re.IGNORECASE):
-                vram = re.match(
-                    r"Memória:\s*(.+)$",
-                    vram_clean,
-                    flags=re.IGNORECASE,
-                )
-                if vram:
-                    return vram.group(1).strip()
-            elif re.match(r"^Tamanho da Memória:", vram_clean, flags=re.IGNORECASE):
-                vram = re.match(
-                    r"Tamanho da Memória:\s*(.+)$",
-                    vram_clean,
-                    flags=re.IGNORECASE,
-                )
-                if vram:
-                    return vram.group(1).strip()
-            elif re.match(
-                r"^Tamanho da memória/barramento:",
-                vram_clean,
-                flags=re.IGNORECASE,
-            ):
-                vram = re.match(
-                    r"Tamanho da memória/barramento:\s*(.+)$",
-                    vram_clean,
-                    flags=re.IGNORECASE,
-                )
+    for line in snapshot.lines_containing("Memória"):
+        vram_clean = line.lstrip("- ").strip()  # ex: "- Memória: 8 GB GDDR6"
+        for label in labels:
+            if re.match(rf"^{label}", vram_clean, flags=re.IGNORECASE):
+                vram = re.match(rf"{label}\s*(.+)$", vram_clean, flags=re.IGNORECASE)
                 if vram:
                     return vram.group(1).strip()
-            elif re.match(r"^Tamanho da memória", vram_clean, flags=re.IGNORECASE):
-                vram = re.match(
-                    r"Tamanho da memória\s*(.+)$",
-                    vram_clean,
-                    flags=re.IGNORECASE,
-                )
-                if vram:
-                    return vram.group(1).strip()
-            else:
-                continue
+                break
 
-    return vram or ""
+    return ""
 
 
 def get_chipset(name: str) -> str:
@@ -140,27 +79,12 @@ def get_chipset(name: str) -> str:
     return "Desconhecido"
 
 
-def normalize_key(s: str) -> str:
-    # tira acentos, coloca em lowercase e remove espaços extras
-    nf = unicodedata.normalize("NFKD", s)
-    no_accents = "".join(c for c in nf if not unicodedata.combining(c))
-    return re.sub(r"\s+", " ", no_accents).strip().lower()
-
-
-def get_max_resolution(section: Locator) -> str:
+def parse_max_resolution(snapshot: SpecSnapshot) -> str:
     """
     Retorna a resolução máxima no formato "7680 x 4320".
     Procura em parágrafos "Chave: Valor" e, se falhar, faz regex genérico.
     """
-    specs = {}
-    paras = section.locator("p")
-    for i in range(paras.count()):
-        text = paras.nth(i).inner_text().strip()
-        text = text.lstrip("- ").strip()
-        if ":" not in text:
-            continue
-        key, val = [part.strip() for part in text.split(":", 1)]
-        specs[normalize_key(key)] = val
+    specs = snapshot.normalized_specs
 
     # aliases de chave que queremos capturar
     aliases = [
@@ -177,7 +101,7 @@ def get_max_resolution(section: Locator) -> str:
             return re.sub(r"\s*x\s*", " x ", val).strip()
 
     # fallback: busca qualquer "1234 x 5678" no texto completo
-    full = section.inner_text()
+    full = snapshot.text
     m = re.search(r"(\d{3,4})\s*[x×]\s*(\d{3,4})", full)  # noqa: RUF001
     if m:
         return f"{m.group(1)} x {m.group(2)}"
@@ -185,23 +109,23 @@ def get_max_resolution(section: Locator) -> str:
     return ""
 
 
-def get_output(section: Locator) -> str:
+def parse_output(snapshot: SpecSnapshot) -> str:
     """
     Retorna todas as saídas de vídeo da GPU,
     ex: "HDMI, DisplayPort, DVI".
     """
-    text = section.inner_text().lower()
+    text = snapshot.text.lower()
     candidates = ["HDMI", "DisplayPort", "VGA", "DVI"]
     found = [c for c in candidates if c.lower() in text]
     return ", ".join(found)
 
 
-def get_tech_support(section: Locator) -> str:
+def parse_tech_support(snapshot: SpecSnapshot) -> str:
     """
     Retorna todos os suportes técnicos detectados na GPU,
     ex: "DLSS, Ray Tracing, FreeSync".
     """
-    text = section.inner_text().lower()
+    text = snapshot.text.lower()
     SUPPORT_MAP = {
         "dlss": "DLSS",
         "ray tracing": "Ray Tracing",
@@ -214,3 +138,19 @@ def get_tech_support(section: Locator) -> str:
     }
     found = [pretty for key, pretty in SUPPORT_MAP.items() if key in text]
     return ", ".join(found)
+
+
+def get_vram(section: Locator) -> str:
+    return parse_vram(SpecSnapshot.from_locator(section))
+
+
+def get_max_resolution(section: Locator) -> str:
+    return parse_max_resolution(SpecSnapshot.from_locator(section))
+
+
+def get_output(section: Locator) -> str:
+    return parse_output(SpecSnapshot.from_locator(section))
+
+
+def get_tech_support(section: Locator) -> str:
+    return parse_tech_support(SpecSnapshot.from_locator(section))
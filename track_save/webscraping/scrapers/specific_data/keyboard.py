@@ -2,14 +2,16 @@ import re
 
 from playwright.sync_api import Locator
 
+from .snapshot import SpecSnapshot
 
-def get_key_type(section: Locator, product_name: str) -> str:  # noqa: C901
+
+def parse_key_type(snapshot: SpecSnapshot, product_name: str) -> str:  # noqa: C901
     """
     Retorna o tipo de tecla. Se for mecânico, tenta identificar o switch.
     Possui fallbacks para buscar no texto e no nome do produto.
     Ex: "Mecânico, Switch: Gateron G Pro 3.0 Brown", "Mecânico", "Membrana".
     """
-    section_text = section.inner_text()
+    section_text = snapshot.text
     key_type = ""
     switch_info = ""
 
@@ -50,12 +52,12 @@ def get_key_type(section: Locator, product_name: str) -> str:  # noqa: C901
     return key_type
 
 
-def get_layout(section: Locator) -> str:
+def parse_layout(snapshot: SpecSnapshot) -> str:
     """
     Retorna o layout, extraindo o padrão principal (ex: ABNT2, ANSI).
     Possui fallback para buscar padrões conhecidos no texto.
     """
-    section_text = section.inner_text()
+    section_text = snapshot.text
 
     # 1. Extração direta
     layout_match = re.search(r"Layout:\s*([^\s,]+)", section_text, re.IGNORECASE)
@@ -71,13 +73,12 @@ def get_layout(section: Locator) -> str:
     return ""
 
 
-def get_connectivity(section: Locator) -> str:
+def parse_connectivity(snapshot: SpecSnapshot) -> str:
     """
     Retorna a conectividade, ex: "USB", "USB-C", "Wireless", "Bluetooth", "Cabeado" etc.
     """
-    loc = section.locator("text=/Conectividade:|Connectivity:/i")
-    if loc.count():
-        txt = loc.first.inner_text().strip()
+    txt = snapshot.find_line(r"Conectividade:|Connectivity:")
+    if txt:
         cleaned = re.sub(r"^[-\s]*", "", txt)
         m = re.search(
             r"(?:Conectividade|Connectivity):\s*(.+)$",
@@ -88,7 +89,7 @@ def get_connectivity(section: Locator) -> str:
             return m.group(1).strip()
 
     # fallback: pega todos os matches no texto e junta com " / "
-    all_text = section.inner_text()
+    all_text = snapshot.text
     found = re.findall(
         r"\bUSB(?:-C)?\b|\bWireless\b|\bBluetooth\b|\bCabeado\b",
         all_text,
@@ -105,12 +106,12 @@ def get_connectivity(section: Locator) -> str:
     return " / ".join(out)
 
 
-def get_dimension(section: Locator) -> str:
+def parse_dimension(snapshot: SpecSnapshot) -> str:
     """
     Retorna a dimensão, priorizando a junção de Comprimento, Largura e Altura.
     Ex: "153 mm x 360,5 mm x 34,3 mm" ou "292 x 102 x 39 mm".
     """
-    section_text = section.inner_text()
+    section_text = snapshot.text
 
     # 1. Padrão prioritário: busca por Comprimento, Largura e Altura separados
     comprimento_match = re.search(
@@ -145,3 +146,19 @@ def get_dimension(section: Locator) -> str:
         return fallback_match.group(1).strip()
 
     return ""
+
+
+def get_key_type(section: Locator, product_name: str) -> str:
+    return parse_key_type(SpecSnapshot.from_locator(section), product_name)
+
+
+def get_layout(section: Locator) -> str:
+    return parse_layout(SpecSnapshot.from_locator(section))
+
+
+def get_connectivity(section: Locator) -> str:
+    return parse_connectivity(SpecSnapshot.from_locator(section))
+
+
+def get_dimension(section: Locator) -> str:
+    return parse_dimension(SpecSnapshot.from_locator(section))
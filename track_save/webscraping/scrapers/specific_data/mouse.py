@@ -2,14 +2,15 @@ import re
 
 from playwright.sync_api import Locator
 
+from .snapshot import SpecSnapshot
 
-def get_dpi(section: Locator) -> str:
+
+def parse_dpi(snapshot: SpecSnapshot) -> str:
     """
     Retorna o DPI no formato "8000 DPI", "10000 DPI", etc.
     """
-    loc = section.locator("text=/DPI:/i")
-    if loc.count():
-        txt = loc.first.inner_text().strip()
+    txt = snapshot.find_line(r"DPI:")
+    if txt:
         cleaned = re.sub(r"^[-\s]*", "", txt)
         m = re.search(r"DPI:\s*(\d{1,3}(?:[.,]\d{1,3})?)", cleaned, flags=re.IGNORECASE)
         if m:
@@ -17,7 +18,7 @@ def get_dpi(section: Locator) -> str:
             return f"{m.group(1).replace(',', '.')} DPI"
 
     # fallback: varre todo o texto da seção e captura a primeira ocorrência "NNNN DPI"
-    all_text = section.inner_text()
+    all_text = snapshot.text
     m2 = re.search(
         r"\b(\d{1,3}(?:[.,]\d{1,3})?)\s*DPI\b",
         all_text,
@@ -29,13 +30,12 @@ def get_dpi(section: Locator) -> str:
     return ""
 
 
-def get_connectivity(section: Locator) -> str:
+def parse_connectivity(snapshot: SpecSnapshot) -> str:
     """
     Retorna a conectividade, ex: "USB", "USB-C", "Wireless", "Bluetooth", "Caboado" etc.
     """
-    loc = section.locator("text=/Conectividade:|Connectivity:/i")
-    if loc.count():
-        txt = loc.first.inner_text().strip()
+    txt = snapshot.find_line(r"Conectividade:|Connectivity:")
+    if txt:
         cleaned = re.sub(r"^[-\s]*", "", txt)
         m = re.search(
             r"(?:Conectividade|Connectivity):\s*(.+)$",
@@ -46,7 +46,7 @@ def get_connectivity(section: Locator) -> str:
             return m.group(1).strip()
 
     # fallback: pega todos os matches no texto e junta com " / "
-    all_text = section.inner_text()
+    all_text = snapshot.text
     found = re.findall(
         r"\bUSB(?:-C)?\b|\bWireless\b|\bBluetooth\b|\bCabeado\b",
         all_text,
@@ -63,7 +63,7 @@ def get_connectivity(section: Locator) -> str:
     return " / ".join(out)
 
 
-def get_color(section: Locator) -> str:
+def parse_color(snapshot: SpecSnapshot) -> str:
     """
     Retorna a cor, ex: "Preto", "RGB Redragon Chroma Mk.II" etc.
     """
@@ -72,12 +72,23 @@ def get_color(section: Locator) -> str:
         r"Color:",
     ]
     for pat in patterns:
-        loc = section.locator(f"text=/{pat}/i")
-        if not loc.count():
+        txt = snapshot.find_line(pat)
+        if not txt:
             continue
-        txt = loc.first.inner_text().strip()
         cleaned = re.sub(r"^[-\s]*", "", txt)
         m = re.search(rf"{pat}\s*(.+)$", cleaned, flags=re.IGNORECASE)
         if m:
             return m.group(1).strip()
     return ""
+
+
+def get_dpi(section: Locator) -> str:
+    return parse_dpi(SpecSnapshot.from_locator(section))
+
+
+def get_connectivity(section: Locator) -> str:
+    return parse_connectivity(SpecSnapshot.from_locator(section))
+
+
+def get_color(section: Locator) -> str:
+    return parse_color(SpecSnapshot.from_locator(section))
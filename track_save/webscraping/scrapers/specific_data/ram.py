@@ -2,13 +2,15 @@ import re
 
 from playwright.sync_api import Locator
 
+from .snapshot import SpecSnapshot
 
-def get_capacity(section: Locator) -> str:
+
+def parse_capacity(snapshot: SpecSnapshot) -> str:
     """
     Extrai a capacidade da memória RAM, como "16GB".
     Busca por padrões como "Capacidade: 16GB (1x 16GB)" ou apenas "16GB".
     """
-    section_text = section.inner_text()
+    section_text = snapshot.text
 
     # 1. Extração direta, focando no valor principal (ex: 16GB)
     capacity_match = re.search(r"Capacidade:\s*(\d+GB)", section_text, re.IGNORECASE)
@@ -23,12 +25,12 @@ def get_capacity(section: Locator) -> str:
     return ""
 
 
-def get_ddr(section: Locator) -> str:
+def parse_ddr(snapshot: SpecSnapshot) -> str:
     """
     Extrai o tipo de memória, como "DDR5".
     Busca por padrões como "Tipo de memória: DDR5" ou apenas "DDR5".
     """
-    section_text = section.inner_text()
+    section_text = snapshot.text
 
     # 1. Extração direta
     ddr_match = re.search(r"Tipo de memória:\s*(DDR[345])", section_text, re.IGNORECASE)
@@ -43,14 +45,14 @@ def get_ddr(section: Locator) -> str:
     return ""
 
 
-def get_speed(section: Locator) -> str:
+def parse_speed(snapshot: SpecSnapshot) -> str:
     """
     Extrai a velocidade da memória, como "4800MHz".
     Busca por "Velocidade: 4800 Mhz" e tem fallback para outros padrões.
     4800MT/s
     DDR5-5200
     """
-    section_text = section.inner_text()
+    section_text = snapshot.text
 
     # 1. Extração direta, priorizando a linha "Velocidade:"
     speed_match = re.search(r"Velocidade:\s*(\d+\s*MHz)", section_text, re.IGNORECASE)
@@ -73,3 +75,15 @@ def get_speed(section: Locator) -> str:
         return f"{ddr_match.group(1)}MHz"
 
     return ""
+
+
+def get_capacity(section: Locator) -> str:
+    return parse_capacity(SpecSnapshot.from_locator(section))
+
+
+def get_ddr(section: Locator) -> str:
+    return parse_ddr(SpecSnapshot.from_locator(section))
+
+
+def get_speed(section: Locator) -> str:
+    return parse_speed(SpecSnapshot.from_locator(section))
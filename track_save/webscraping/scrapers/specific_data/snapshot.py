@@ -0,0 +1,170 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from dataclasses import field
+
+import lxml.html
+
+# Elementos que quebram linha no innerText do navegador
+BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "br",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "footer",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "ol",
+        "p",
+        "section",
+        "table",
+        "tr",
+        "ul",
+    },
+)
+CELL_TAGS = frozenset({"td", "th"})
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template"})
+
+# Uma ida ao navegador: HTML da seção (vazio se ela não existir, sem esperar)
+OUTER_HTML_JS = "elements => elements.map(element => element.outerHTML).join('')"
+
+
+def normalize_key(s: str) -> str:
+    # tira acentos, coloca em lowercase e remove espaços extras
+    nf = unicodedata.normalize("NFKD", s)
+    no_accents = "".join(c for c in nf if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", no_accents).strip().lower()
+
+
+def clean_line(line: str) -> str:
+    return re.sub(r"[^\S\n]+", " ", line).strip()
+
+
+def render_text(element, parts):
+    """
+    Aproxima o innerText: blocos e <br> viram quebras de linha, células viram tab.
+    """
+    tag = element.tag if isinstance(element.tag, str) else None
+    if tag is not None and tag not in SKIP_TAGS:
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            render_text(child, parts)
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+        elif tag in CELL_TAGS:
+            parts.append("\t")
+    if element.tail:
+        parts.append(element.tail)
+
+
+@dataclass(frozen=True)
+class SpecSnapshot:
+    """
+    Cópia em memória da seção de especificações técnicas.
+
+    O HTML é lido do navegador uma única vez e todos os extratores (parse_*)
+    trabalham sobre as linhas/dicionário daqui, sem novas idas ao Playwright.
+    É picklable, então o parsing pode rodar num ProcessPoolExecutor.
+    """
+
+    lines: tuple[str, ...] = ()
+    # "Chave: Valor" de cada linha (a última ocorrência vence)
+    specs: dict[str, str] = field(default_factory=dict)
+    # (texto do <strong> de um <p>, texto do próximo <p> não vazio)
+    headings: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_html(cls, html: str) -> "SpecSnapshot":
+        if not html or not html.strip():
+            return cls()
+        root = lxml.html.fragment_fromstring(html, create_parent="div")
+
+        parts = []
+        render_text(root, parts)
+        lines = tuple(
+            line
+            for line in (clean_line(raw) for raw in "".join(parts).split("\n"))
+            if line
+        )
+
+        specs = {}
+        for line in lines:
+            text = line.lstrip("- ").strip()
+            if ":" in text:
+                key, val = [part.strip() for part in text.split(":", 1)]
+                specs[key] = val
+
+        headings = []
+        for paragraph in root.iter("p"):
+            strong = paragraph.find(".//strong")
+            if strong is None:
+                continue
+            sibling = paragraph.xpath("following-sibling::p[normalize-space()][1]")
+            headings.append(
+                (
+                    clean_line(strong.text_content()),
+                    clean_line(sibling[0].text_content()) if sibling else "",
+                ),
+            )
+
+        return cls(lines=lines, specs=specs, headings=tuple(headings))
+
+    @classmethod
+    def from_locator(cls, section) -> "SpecSnapshot":
+        return cls.from_html(section_html(section))
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    @property
+    def normalized_specs(self) -> dict[str, str]:
+        return {normalize_key(key): val for key, val in self.specs.items()}
+
+    def find_line(self, pattern: str) -> str:
+        """
+        Primeira linha que casa com o regex (equivale a locator("text=/.../i")).
+        """
+        regex = re.compile(pattern, flags=re.IGNORECASE)
+        return next((line for line in self.lines if regex.search(line)), "")
+
+    def lines_containing(self, text: str) -> list[str]:
+        """
+        Linhas que contêm o texto, sem diferenciar maiúsculas (equivale a :has-text).
+        """
+        text = text.lower()
+        return [line for line in self.lines if text in line.lower()]
+
+    def value_after(self, patterns, value=r":\s*(.+)$") -> str:
+        """
+        Valor da primeira linha rotulada por algum dos padrões, ex.: "- Socket: AM4".
+        """
+        for pat in patterns:
+            line = self.find_line(pat)
+            if not line:
+                continue
+            m = re.search(value, re.sub(r"^[-\s]*", "", line))
+            if m:
+                return m.group(1).strip()
+        return ""
+
+
+def section_html(section) -> str:
+    return section.evaluate_all(OUTER_HTML_JS)
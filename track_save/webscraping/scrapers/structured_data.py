@@ -0,0 +1,192 @@
+import contextlib
+import json
+from decimal import Decimal
+from decimal import InvalidOperation
+from html import escape
+from urllib.parse import urlparse
+
+# Dados estruturados embutidos na página (JSON-LD e hidratação do Next.js),
+# lidos numa única chamada ao navegador
+STRUCTURED_DATA_JS = """
+    () => ({
+        json_ld: Array.from(
+            document.querySelectorAll('script[type="application/ld+json"]'),
+        ).map(script => script.textContent),
+        next_data: document.getElementById("__NEXT_DATA__")?.textContent || null,
+    })
+"""
+
+# Campos comuns que os scrapers esperam de uma página de produto
+COMMON_FIELDS = ("name", "value", "image_url", "brand", "description", "rating")
+
+# Chaves do produto no __NEXT_DATA__ da Kabum
+NEXT_PRICE_KEYS = ("priceWithDiscount", "price")
+NEXT_TECHNICAL_KEYS = ("technicalInformation", "technicalSpecifications")
+
+IN_STOCK = ("InStock", "LimitedAvailability", "OnlineOnly")
+MAX_DEPTH = 12
+
+
+def load_json(text):
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_nodes(value, depth=0):
+    """
+    Percorre o JSON em profundidade devolvendo os objetos (dicts). Strings que
+    contêm JSON (o Next.js serializa pageProps.data assim) também são abertas.
+    """
+    if depth > MAX_DEPTH:
+        return
+    if isinstance(value, str) and value[:1] in ("{", "["):
+        value = load_json(value)
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from iter_nodes(child, depth + 1)
+    elif isinstance(value, list):
+        for child in value:
+            yield from iter_nodes(child, depth + 1)
+
+
+def first(value):
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def belongs_to(node, url):
+    """
+    Confere se o nó descreve o produto da URL atual. Na navegação client-side o
+    __NEXT_DATA__ continua sendo o da página anterior.
+    """
+    path = urlparse(url).path.rstrip("/")
+    offer = first(node.get("offers"))
+    candidates = [node.get(key) for key in ("url", "@id", "sku", "productID", "code")]
+    if isinstance(offer, dict):
+        candidates.append(offer.get("url"))
+    for candidate in candidates:
+        if candidate in (None, ""):
+            continue
+        text = str(candidate)
+        if urlparse(text).path.rstrip("/") == path or f"/{text}/" in f"{path}/":
+            return True
+    return False
+
+
+def json_ld_product(texts):
+    for text in texts or []:
+        for node in iter_nodes(load_json(text)):
+            types = node.get("@type")
+            if "Product" in (types if isinstance(types, list) else [types]):
+                return node
+    return None
+
+
+def next_data_product(text):
+    for node in iter_nodes(load_json(text)):
+        if (
+            isinstance(node.get("name"), str)
+            and any(key in node for key in NEXT_PRICE_KEYS)
+            and ("manufacturer" in node or "code" in node)
+        ):
+            return node
+    return None
+
+
+def normalize_price(value):
+    """
+    Preço no formato usado pelos scrapers ("1299.99"); "" se não for numérico.
+    """
+    try:
+        return f"{Decimal(str(value)):.2f}" if value not in (None, "") else ""
+    except InvalidOperation:
+        return ""
+
+
+def name_of(value):
+    value = first(value)
+    if isinstance(value, dict):
+        return value.get("name") or ""
+    return value or ""
+
+
+def image_of(value):
+    value = first(value)
+    if isinstance(value, dict):
+        return value.get("url") or value.get("contentUrl") or ""
+    return value or ""
+
+
+def technical_html(ld, nd):
+    """
+    HTML das especificações técnicas, no formato aceito por extract_specific_data:
+    o HTML do __NEXT_DATA__ ou os additionalProperty do JSON-LD como
+    "<p>Chave: Valor</p>".
+    """
+    for key in NEXT_TECHNICAL_KEYS:
+        if isinstance(nd.get(key), str) and nd[key].strip():
+            return nd[key]
+    properties = [
+        prop
+        for prop in ld.get("additionalProperty") or []
+        if isinstance(prop, dict) and prop.get("name")
+    ]
+    if properties:
+        return "".join(
+            f"<p>{escape(str(prop['name']))}: {escape(str(prop.get('value', '')))}</p>"
+            for prop in properties
+        )
+    return None
+
+
+def parse_structured_product(json_ld, next_data, url):
+    """
+    Une JSON-LD (schema.org/Product) e __NEXT_DATA__ da página num dict com os
+    campos encontrados: name, value, brand, image_url, description, rating,
+    available e technical_html. Campos ausentes ficam de fora para o scraper
+    buscá-los no DOM. Dados que não forem do produto da `url` são ignorados.
+    """
+    ld = json_ld_product(json_ld) or {}
+    nd = next_data_product(next_data) or {}
+    if ld and not belongs_to(ld, url):
+        ld = {}
+    if nd and not belongs_to(nd, url):
+        nd = {}
+    if not ld and not nd:
+        return {}
+
+    offer = first(ld.get("offers"))
+    offer = offer if isinstance(offer, dict) else {}
+    rating = first(ld.get("aggregateRating"))
+    rating = rating if isinstance(rating, dict) else {}
+    data = {
+        "name": (ld.get("name") or nd.get("name") or "").strip(),
+        "value": normalize_price(
+            offer.get("price")
+            or offer.get("lowPrice")
+            or next((nd.get(key) for key in NEXT_PRICE_KEYS if nd.get(key)), None),
+        ),
+        "brand": name_of(ld.get("brand")) or name_of(nd.get("manufacturer")),
+        "image_url": image_of(ld.get("image")) or image_of(nd.get("photos")),
+        "description": (ld.get("description") or "").strip(),
+        "technical_html": technical_html(ld, nd),
+    }
+
+    rating_value = rating.get("ratingValue")
+    if rating_value is None:
+        rating_value = nd.get("rating")
+    # Produto sem avaliações não traz aggregateRating: nota 0
+    with contextlib.suppress(TypeError, ValueError):
+        data["rating"] = float(rating_value) if rating_value is not None else 0.0
+
+    availability = offer.get("availability")
+    if availability:
+        data["available"] = str(availability).rsplit("/", 1)[-1] in IN_STOCK
+    elif isinstance(nd.get("available"), bool):
+        data["available"] = nd["available"]
+
+    return {key: value for key, value in data.items() if value not in (None, "")}
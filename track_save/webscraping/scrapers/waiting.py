@@ -0,0 +1,149 @@
+import threading
+import time
+from functools import reduce
+
+from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# Esperas baseadas no auto-waiting do Playwright: em vez de consultar os locators
+# a cada 500 ms, os seletores são combinados com `or_` e o navegador avisa assim
+# que o primeiro deles satisfaz o estado pedido.
+
+WAIT_STATES = ("visible", "attached")
+
+
+class WaitStats:
+    """
+    Latência por nome de espera (chamadas, encontrados, timeouts, total/máx em ms).
+    Pode ser compartilhado entre threads.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, elapsed_ms, found):
+        with self._lock:
+            entry = self.calls.setdefault(
+                name,
+                {"calls": 0, "found": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0},
+            )
+            entry["calls"] += 1
+            entry["found" if found else "timeouts"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def summary(self):
+        with self._lock:
+            return {
+                name: {
+                    **entry,
+                    "total_ms": round(entry["total_ms"], 1),
+                    "max_ms": round(entry["max_ms"], 1),
+                    "avg_ms": round(entry["total_ms"] / entry["calls"], 1),
+                }
+                for name, entry in self.calls.items()
+            }
+
+    def print_summary(self):
+        for name, entry in sorted(self.summary().items()):
+            print(
+                f"⏱️ {name}: {entry['calls']} esperas, média {entry['avg_ms']} ms, "
+                f"máx {entry['max_ms']} ms, {entry['timeouts']} timeouts",
+            )
+
+
+def combined_locator(locators, state="visible"):
+    """
+    Um único locator que casa com qualquer um dos `locators`
+    (só elementos visíveis quando state="visible").
+    """
+    if state not in WAIT_STATES:
+        msg = f"state deve ser um de: {', '.join(WAIT_STATES)}."
+        raise ValueError(msg)
+    if state == "visible":
+        locators = [locator.filter(visible=True) for locator in locators]
+    return locators, reduce(lambda a, b: a.or_(b), locators)
+
+
+def wait_for_any(locators, timeout=10000, state="visible", stats=None, name="wait"):
+    """
+    Espera o primeiro dos `locators` a aparecer e devolve o elemento encontrado
+    (`.first` do locator vencedor), ou None no timeout.
+    """
+    started = time.perf_counter()
+    candidates, combined = combined_locator(locators, state)
+    found = None
+    try:
+        combined.first.wait_for(state="attached", timeout=timeout)
+        found = next(
+            (candidate.first for candidate in candidates if candidate.count()),
+            None,
+        )
+    except PlaywrightTimeoutError:
+        pass
+    if stats is not None:
+        stats.record(name, (time.perf_counter() - started) * 1000, found is not None)
+    return found
+
+
+def wait_for(locator, timeout=10000, state="visible", stats=None, name="wait"):
+    return wait_for_any([locator], timeout, state, stats, name) is not None
+
+
+def wait_gone(locator, timeout=10000, stats=None, name="wait_gone"):
+    """
+    Espera até não haver nenhum elemento visível do locator. True se sumiu.
+    """
+    started = time.perf_counter()
+    gone = True
+    try:
+        locator.filter(visible=True).first.wait_for(state="detached", timeout=timeout)
+    except PlaywrightTimeoutError:
+        gone = False
+    if stats is not None:
+        stats.record(name, (time.perf_counter() - started) * 1000, gone)
+    return gone
+
+
+async def wait_for_any_async(
+    locators,
+    timeout=10000,  # noqa: ASYNC109
+    state="visible",
+    stats=None,
+    name="wait",
+):
+    started = time.perf_counter()
+    candidates, combined = combined_locator(locators, state)
+    found = None
+    try:
+        await combined.first.wait_for(state="attached", timeout=timeout)
+        for candidate in candidates:
+            if await candidate.count():
+                found = candidate.first
+                break
+    except AsyncPlaywrightTimeoutError:
+        pass
+    if stats is not None:
+        stats.record(name, (time.perf_counter() - started) * 1000, found is not None)
+    return found
+
+
+async def wait_gone_async(
+    locator,
+    timeout=10000,  # noqa: ASYNC109
+    stats=None,
+    name="wait_gone",
+):
+    started = time.perf_counter()
+    gone = True
+    try:
+        await locator.filter(visible=True).first.wait_for(
+            state="detached",
+            timeout=timeout,
+        )
+    except AsyncPlaywrightTimeoutError:
+        gone = False
+    if stats is not None:
+        stats.record(name, (time.perf_counter() - started) * 1000, gone)
+    return gone
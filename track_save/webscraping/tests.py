@@ -1,3 +1,87 @@
+from concurrent.futures import Future
+
+from api.entities.scrape_job import ScrapeJob
+from django.test import SimpleTestCase
 from django.test import TestCase
+from django.urls import reverse
+
+from track_save.webscraping.enums import Categories
+from track_save.webscraping.scrapers.kabum import SPECS_FUTURE_KEY
+from track_save.webscraping.scrapers.kabum import KabumScraper
+
+
+class ListWriter:
+    def __init__(self):
+        self.written = []
+
+    def write(self, product_data):
+        self.written.append(product_data)
+
+
+class KabumEmitTests(SimpleTestCase):
+    def test_specs_finished_out_of_order_keep_listing_order(self):
+        scraper = KabumScraper(Categories.GPU)
+        scraper.writer = ListWriter()
+        first, second = Future(), Future()
+
+        scraper.emit({"name": "A", SPECS_FUTURE_KEY: first})
+        scraper.emit({"name": "B", SPECS_FUTURE_KEY: second})
+        # o segundo produto fica pronto antes e espera o primeiro
+        second.set_result({"memory": "8GB"})
+        scraper.resolve_pending_specs(wait=False)
+        self.assertEqual(scraper.writer.written, [])
+
+        first.set_result({"memory": "12GB"})
+        scraper.resolve_pending_specs(wait=False)
+
+        self.assertEqual(
+            scraper.writer.written,
+            [{"name": "A", "memory": "12GB"}, {"name": "B", "memory": "8GB"}],
+        )
+
+
+class ScrapeByCategoryAPIViewTests(TestCase):
+    url = reverse("webscraping:api-run-scraper")
+
+    def post(self, **data):
+        return self.client.post(
+            self.url,
+            {"store": "kabum", "category": "GPU", **data},
+            content_type="application/json",
+        )
+
+    def test_valid_request_queues_a_job(self):
+        response = self.post(workers=4, parse_workers=2, mode="sweep")
+
+        self.assertEqual(response.status_code, 202)
+        job = ScrapeJob.objects.get()
+        self.assertEqual(
+            job.options,
+            {"workers": 4, "parse_workers": 2, "mode": "sweep"},
+        )
+
+    def test_options_have_defaults(self):
+        self.assertEqual(self.post().status_code, 202)
+        self.assertEqual(
+            ScrapeJob.objects.get().options,
+            {"workers": 1, "parse_workers": 0, "mode": "full"},
+        )
+
+    def test_invalid_workers_are_rejected(self):
+        for workers in ("abc", 0, -1, 500, 2.5, None):
+            with self.subTest(workers=workers):
+                self.assertEqual(self.post(workers=workers).status_code, 400)
+        self.assertFalse(ScrapeJob.objects.exists())
+
+    def test_invalid_parse_workers_are_rejected(self):
+        for parse_workers in ("abc", -1, 5, 1.5, True):
+            with self.subTest(parse_workers=parse_workers):
+                response = self.post(parse_workers=parse_workers)
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(ScrapeJob.objects.exists())
+
+    def test_invalid_mode_is_a_bad_request(self):
+        self.assertEqual(self.post(mode="turbo").status_code, 400)
 
-# Create your tests here.
+    def test_unknown_store_is_not_found(self):
+        self.assertEqual(self.post(store="amazonas").status_code, 404)
@@ -2,10 +2,16 @@ from django.urls import path
 
 from .views import ScrapeAllAPIView
 from .views import ScrapeByCategoryAPIView
+from .views import ScrapeJobAPIView
 
 app_name = "webscraping"
 
 urlpatterns = [
     path("scrape/", ScrapeByCategoryAPIView.as_view(), name="api-run-scraper"),
     path("scrape/all/", ScrapeAllAPIView.as_view(), name="api-run-scraper-all"),
+    path(
+        "scrape/jobs/<int:job_id>/",
+        ScrapeJobAPIView.as_view(),
+        name="api-scrape-job",
+    ),
 ]
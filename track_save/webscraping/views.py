@@ -1,10 +1,64 @@
+from api.controllers.scrape_job_controller import enqueue_scrape_job
+from api.controllers.scrape_job_controller import job_to_dict
+from api.entities.scrape_job import ScrapeJob
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from track_save.webscraping.enums import Categories
+from track_save.webscraping.scrapers.result_writer import iter_written
+from track_save.webscraping.webscraping_factory import SCRAPERS
 from track_save.webscraping.webscraping_factory import get_scraper
 
+# Cada worker abre um Chromium próprio no worker de jobs
+MAX_SCRAPE_WORKERS = 8
+# Processos para o parsing das specs (0: na própria thread do navegador)
+MAX_PARSE_WORKERS = 4
+
+
+def bad_request(detail):
+    return Response({"detail": detail}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def unknown_store(store):
+    return Response(
+        {"detail": f"Scraper '{store}' não encontrado"},
+        status=status.HTTP_404_NOT_FOUND,
+    )
+
+
+def parse_count(name, value, minimum, maximum):
+    """
+    Opção inteira pedida pelo cliente (workers, parse_workers), entre minimum e
+    maximum. Raises ValueError se for inválida.
+    """
+    msg = f'"{name}" deve ser um inteiro entre {minimum} e {maximum}.'
+    if isinstance(value, bool | float):
+        raise ValueError(msg)  # noqa: TRY004
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(msg) from None
+    if not minimum <= count <= maximum:
+        raise ValueError(msg)
+    return count
+
+
+def accepted(request, job):
+    """
+    Resposta 202 com o id do job e a URL para acompanhar o progresso.
+    """
+    return Response(
+        {
+            **job_to_dict(job),
+            "status_url": request.build_absolute_uri(
+                reverse("webscraping:api-scrape-job", args=[job.pk]),
+            ),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
 
 class ScrapeByCategoryAPIView(APIView):
     def post(self, request):
@@ -12,9 +66,12 @@ class ScrapeByCategoryAPIView(APIView):
         Espera um JSON:
           {
             "store": "kabum",
-            "category": "GPU"
+            "category": "GPU",
+            "workers": 4  (opcional: abas em paralelo)
+            "parse_workers": 2  (opcional: processos para o parsing das specs)
+            "mode": "sweep"  (opcional: só preços da listagem para produtos conhecidos)
           }
-        Retorna a lista de produtos já em JSON.
+        Enfileira a coleta e retorna 202 com o id do job (ver ScrapeJobAPIView).
         """
         store = request.data.get("store")
         category = request.data.get("category")
@@ -25,34 +82,39 @@ class ScrapeByCategoryAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if store not in SCRAPERS:
+            return unknown_store(store)
+
         # valida categoria
         try:
-            cat_enum = Categories[category.upper()]
+            cat_enum = Categories[str(category).upper()]
         except KeyError:
-            return Response(
-                {"detail": f'Categoria "{category}" inválida.'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+            return bad_request(f'Categoria "{category}" inválida.')
 
-        # instancia o scraper
+        data = request.data
         try:
-            scraper = get_scraper(store, category=cat_enum)
+            options = {
+                "workers": parse_count(
+                    "workers",
+                    data.get("workers", 1),
+                    1,
+                    MAX_SCRAPE_WORKERS,
+                ),
+                "parse_workers": parse_count(
+                    "parse_workers",
+                    data.get("parse_workers", 0),
+                    0,
+                    MAX_PARSE_WORKERS,
+                ),
+                "mode": data.get("mode", "full"),
+            }
+            # instancia o scraper só para validar as opções antes de enfileirar
+            get_scraper(store, category=cat_enum, **options)
         except ValueError as e:
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+            return bad_request(str(e))
 
-        # executa e captura erros
-        try:
-            data = scraper.run()
-        except RuntimeError as e:
-            return Response(
-                {"detail": f"Erro no scraper: {e}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
-        return Response(data, status=status.HTTP_200_OK)
+        job = enqueue_scrape_job(store, [cat_enum.name], options)
+        return accepted(request, job)
 
 
 class ScrapeAllAPIView(APIView):
@@ -62,7 +124,7 @@ class ScrapeAllAPIView(APIView):
           {
             "store": "kabum"
           }
-        Retorna a lista de produtos já em JSON.
+        Enfileira a coleta de todas as categorias e retorna 202 com o id do job.
         """
         store = request.data.get("store")
 
@@ -72,22 +134,31 @@ class ScrapeAllAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # instancia o scraper
-        try:
-            scraper = get_scraper(store)
-        except ValueError as e:
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        if store not in SCRAPERS:
+            return unknown_store(store)
+        categories = list(Categories)
 
-        # executa e captura erros
-        try:
-            data = scraper.run()
-        except RuntimeError as e:
+        job = enqueue_scrape_job(store, [category.name for category in categories])
+        return accepted(request, job)
+
+
+class ScrapeJobAPIView(APIView):
+    def get(self, request, job_id):
+        """
+        Status, progresso e (com ?results=1) os produtos coletados pelo job.
+        """
+        job = ScrapeJob.objects.filter(pk=job_id).first()
+        if job is None:
             return Response(
-                {"detail": f"Erro no scraper: {e}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"detail": f"Job {job_id} não encontrado."},
+                status=status.HTTP_404_NOT_FOUND,
             )
-
+        data = job_to_dict(job)
+        if request.query_params.get("results") in ("1", "true"):
+            # produtos gravados pelos scrapers em arquivos NDJSON durante o job
+            data["results"] = job.results + [
+                record
+                for path in job.progress.get("result_files", [])
+                for record in iter_written(path)
+            ]
         return Response(data, status=status.HTTP_200_OK)
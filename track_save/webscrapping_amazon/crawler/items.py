@@ -0,0 +1,26 @@
+import scrapy
+
+
+class StoreProductItem(scrapy.Item):
+    """
+    Produto coletado no mesmo formato dos resultados do scraper com Playwright
+    (resultados_terabyte / resultados_amazon), para reaproveitar o mapeamento
+    de armazena_tera_amazon.
+    """
+
+    loja = scrapy.Field()  # "Terabyte" ou "Amazon"
+    tipo_produto = scrapy.Field()
+    sku = scrapy.Field()
+    nome = scrapy.Field()
+    preco = scrapy.Field()
+    nota = scrapy.Field()
+    url = scrapy.Field()
+    imagem = scrapy.Field()
+    # Terabyte
+    descricao = scrapy.Field()
+    tecnica = scrapy.Field()
+    # Amazon
+    descricao_curta = scrapy.Field()
+    descricao_detalhada = scrapy.Field()
+    descricao_tecnica = scrapy.Field()
+    detalhes_adicionais = scrapy.Field()
@@ -0,0 +1,82 @@
+from itertools import pairwise
+
+from scrapy.exceptions import IgnoreRequest
+from scrapy.exceptions import NotConfigured
+from scrapy.responsetypes import responsetypes
+
+from track_save.webscraping.scrapers.page_archive import ARCHIVE_MODES
+from track_save.webscraping.scrapers.page_archive import PageArchive
+
+
+class PageArchiveMiddleware:
+    """
+    Grava as respostas baixadas num PageArchive (PAGE_ARCHIVE_MODE="record")
+    ou as devolve do archive sem acessar a rede ("replay"). Requisições que
+    não foram gravadas são ignoradas no replay. Desligado sem PAGE_ARCHIVE_DIR.
+
+    Fica abaixo do HttpCompressionMiddleware (590): grava o corpo já
+    descomprimido, como o ArchiveRouter do Playwright.
+    """
+
+    def __init__(self, archive, mode, stats):
+        self.archive = archive
+        self.mode = mode
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        root = crawler.settings.get("PAGE_ARCHIVE_DIR")
+        if not root:
+            raise NotConfigured
+        mode = crawler.settings.get("PAGE_ARCHIVE_MODE", "replay")
+        if mode not in ARCHIVE_MODES:
+            msg = f"PAGE_ARCHIVE_MODE deve ser um de: {', '.join(ARCHIVE_MODES)}."
+            raise ValueError(msg)
+        return cls(PageArchive(root), mode, crawler.stats)
+
+    def process_request(self, request, spider):
+        if self.mode != "replay":
+            return None
+        entry = self.archive.get(request.method, request.url, request.body)
+        if entry is None:
+            self.stats.inc_value("archive/miss", spider=spider)
+            msg = f"Fora do arquivo: {request.url}"
+            raise IgnoreRequest(msg)
+        self.stats.inc_value("archive/hit", spider=spider)
+        body = self.archive.read_body(entry)
+        cls = responsetypes.from_args(
+            headers=entry["headers"],
+            url=request.url,
+            body=body,
+        )
+        return cls(
+            url=request.url,
+            status=entry["status"],
+            headers=entry["headers"],
+            body=body,
+            request=request,
+        )
+
+    def process_response(self, request, response, spider):
+        if self.mode != "record":
+            return response
+        tags = {"store": spider.name}
+        # Abaixo do RedirectMiddleware só chega a resposta final: cada salto do
+        # redirecionamento é gravado como um 302 para o próximo endereço
+        hops = [*request.meta.get("redirect_urls", []), request.url]
+        for source, target in pairwise(hops):
+            self.archive.put("GET", source, 302, {"Location": target}, b"", tags=tags)
+        self.archive.put(
+            request.method,
+            request.url,
+            response.status,
+            {
+                name.decode(): b", ".join(values).decode("latin-1")
+                for name, values in response.headers.items()
+            },
+            response.body,
+            request.body,
+            tags,
+        )
+        self.stats.inc_value("archive/recorded", spider=spider)
+        return response
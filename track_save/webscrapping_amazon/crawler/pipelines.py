@@ -0,0 +1,67 @@
+from api.controllers.ingest_controller import ingest_products
+from api.controllers.ingest_controller import summarize_outcomes
+from django.db import close_old_connections
+from itemadapter import ItemAdapter
+from twisted.internet.threads import deferToThread
+
+from track_save.webscrapping_amazon.scraper.armazena_tera_amazon import (
+    amazon_spec_fields,
+)
+from track_save.webscrapping_amazon.scraper.armazena_tera_amazon import ingest_record
+from track_save.webscrapping_amazon.scraper.armazena_tera_amazon import (
+    terabyte_spec_fields,
+)
+
+SPEC_FIELDS = {
+    "Terabyte": terabyte_spec_fields,
+    "Amazon": amazon_spec_fields,
+}
+
+
+class IngestPipeline:
+    """
+    Converte os itens para o formato de ingest_products e grava em lotes.
+
+    A gravação roda numa thread (deferToThread): o ORM do Django não pode ser
+    chamado de dentro do loop asyncio do reactor do Scrapy. O crawler roda pelo
+    comando crawl_stores, com o Django já configurado.
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.buffer = []
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls(crawler.settings.getint("INGEST_BATCH_SIZE", 200))
+        pipeline.stats = crawler.stats
+        return pipeline
+
+    def process_item(self, item, spider):
+        produto = ItemAdapter(item).asdict()
+        spec_fields = SPEC_FIELDS[produto["loja"]](produto)
+        if spec_fields is None:
+            self.stats.inc_value("ingest/unmapped")
+            return item
+
+        produto["spec_fields"] = spec_fields
+        self.buffer.append(ingest_record(produto))
+        if len(self.buffer) < self.batch_size:
+            return item
+
+        batch, self.buffer = self.buffer, []
+        return deferToThread(self.ingest, batch).addCallback(lambda _: item)
+
+    def close_spider(self, spider):
+        if self.buffer:
+            batch, self.buffer = self.buffer, []
+            return deferToThread(self.ingest, batch)
+        return None
+
+    def ingest(self, records):
+        try:
+            summary = summarize_outcomes(ingest_products(records))
+        finally:
+            close_old_connections()
+        for key, value in summary.items():
+            self.stats.inc_value(f"ingest/{key}", value)
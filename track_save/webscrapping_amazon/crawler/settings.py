@@ -0,0 +1,55 @@
+# Configuração do Scrapy para a coleta sem navegador da Terabyte e da Amazon.
+# Usada pelo comando `python manage.py crawl_stores`.
+
+BOT_NAME = "track_save"
+
+SPIDER_MODULES = ["track_save.webscrapping_amazon.crawler.spiders"]
+NEWSPIDER_MODULE = "track_save.webscrapping_amazon.crawler.spiders"
+
+ROBOTSTXT_OBEY = True
+
+# Concorrência global alta; o limite real é por domínio (DOWNLOAD_SLOTS)
+CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS_PER_DOMAIN = 4
+DOWNLOAD_SLOTS = {
+    "www.terabyteshop.com.br": {"concurrency": 4, "delay": 0.25},
+    "www.amazon.com.br": {"concurrency": 2, "delay": 1.0},
+}
+DOWNLOAD_TIMEOUT = 30
+
+# AutoThrottle ajusta o delay de cada domínio pela latência observada
+AUTOTHROTTLE_ENABLED = True
+AUTOTHROTTLE_START_DELAY = 1.0
+AUTOTHROTTLE_MAX_DELAY = 15.0
+AUTOTHROTTLE_TARGET_CONCURRENCY = 2.0
+
+RETRY_TIMES = 3
+RETRY_HTTP_CODES = [429, 500, 502, 503, 504, 522, 524, 408]
+
+COOKIES_ENABLED = False
+DEFAULT_REQUEST_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+}
+
+# User-Agent aleatório (scrapy-fake-useragent), trocado também nas tentativas
+DOWNLOADER_MIDDLEWARES = {
+    "scrapy.downloadermiddlewares.useragent.UserAgentMiddleware": None,
+    "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
+    "scrapy_fake_useragent.middleware.RandomUserAgentMiddleware": 400,
+    "scrapy_fake_useragent.middleware.RetryUserAgentMiddleware": 401,
+    "track_save.webscrapping_amazon.crawler.middlewares.PageArchiveMiddleware": 580,
+}
+# Diretório de um PageArchive para gravar ("record") ou reproduzir ("replay")
+# a coleta sem rede; vazio desliga o PageArchiveMiddleware
+PAGE_ARCHIVE_DIR = None
+PAGE_ARCHIVE_MODE = "replay"
+
+ITEM_PIPELINES = {
+    "track_save.webscrapping_amazon.crawler.pipelines.IngestPipeline": 300,
+}
+# Itens gravados por chamada de ingest_products
+INGEST_BATCH_SIZE = 200
+
+LOG_LEVEL = "INFO"
+FEED_EXPORT_ENCODING = "utf-8"
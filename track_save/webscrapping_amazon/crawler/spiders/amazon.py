@@ -0,0 +1,84 @@
+import re
+from urllib.parse import quote
+
+import scrapy
+
+from track_save.webscrapping_amazon.crawler.items import StoreProductItem
+from track_save.webscrapping_amazon.scraper.armazena_tera_amazon import (
+    MAP_CATEGORIAS_AMAZON,
+)
+
+SEARCH_URL = "https://www.amazon.com.br/s?k={termo}&page={page}"
+# Resultados da busca que não são o produto procurado
+IGNORED_TERMS = ("cooler", "captura", "suporte")
+
+
+def text_of(selection):
+    return re.sub(r"\s+", " ", " ".join(selection.css("::text").getall())).strip()
+
+
+class AmazonSpider(scrapy.Spider):
+    """
+    Busca da Amazon por termo e página de detalhe de cada resultado, só com HTTP.
+    Equivale a scrape_amazon + scrape_amazon_product.
+    """
+
+    name = "amazon"
+    allowed_domains = ["www.amazon.com.br"]
+
+    def __init__(self, termos=None, pages=2, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.termos = termos.split(",") if termos else list(MAP_CATEGORIAS_AMAZON)
+        self.pages = int(pages)
+
+    async def start(self):
+        for termo in self.termos:
+            for page in range(1, self.pages + 1):
+                yield scrapy.Request(
+                    SEARCH_URL.format(termo=quote(termo, safe=""), page=page),
+                    callback=self.parse,
+                    cb_kwargs={"termo": termo},
+                )
+
+    def parse(self, response, termo):
+        for link in response.css("a.s-no-outline"):
+            href = link.attrib.get("href")
+            nome = link.css("img::attr(alt)").get() or ""
+            if not href or any(term in nome.lower() for term in IGNORED_TERMS):
+                continue
+            yield response.follow(
+                href,
+                callback=self.parse_product,
+                cb_kwargs={"termo": termo},
+            )
+
+    def parse_product(self, response, termo):
+        nome = text_of(response.css("#productTitle"))
+        if not nome:
+            return
+
+        descricao_tecnica = {
+            text_of(row.css("th")): text_of(row.css("td"))
+            for row in response.css("table#productDetails_techSpec_section_1 tr")
+        }
+        if not descricao_tecnica:
+            texto = text_of(response.css("div#productDetails_detailBullets_sections1"))
+            descricao_tecnica = {"técnica_unificada": texto} if texto else {}
+
+        yield StoreProductItem(
+            loja="Amazon",
+            tipo_produto=termo,
+            nome=nome,
+            preco=response.css(".a-price .a-offscreen::text").get()
+            or "Preço não encontrado",
+            nota=response.css("span.a-icon-alt::text").get() or "Sem nota",
+            descricao_curta=text_of(response.css("#feature-bullets")),
+            descricao_detalhada=text_of(response.css("#productDescription")),
+            descricao_tecnica=descricao_tecnica,
+            detalhes_adicionais={
+                text_of(row.css("th")): text_of(row.css("td"))
+                for row in response.css("table.a-keyvalue.prodDetTable tbody tr")
+            },
+            url=response.url,
+            imagem=response.css("img#landingImage::attr(src)").get() or "",
+        )
@@ -0,0 +1,94 @@
+import re
+
+import scrapy
+
+from track_save.webscrapping_amazon.crawler.items import StoreProductItem
+from track_save.webscrapping_amazon.scraper.armazena_tera_amazon import MAP_CATEGORIAS
+
+BASE_URL = "https://www.terabyteshop.com.br"
+
+
+class TerabyteSpider(scrapy.Spider):
+    """
+    Listagem de cada categoria da Terabyte e página de detalhe dos produtos,
+    só com HTTP (sem navegador). Equivale a scrape_terabyte + get_product_details.
+    """
+
+    name = "terabyte"
+    allowed_domains = ["www.terabyteshop.com.br"]
+
+    def __init__(self, categorias=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # ex.: -a categorias=perifericos/mouse,monitores
+        self.categorias = categorias.split(",") if categorias else list(MAP_CATEGORIAS)
+
+    async def start(self):
+        for categoria in self.categorias:
+            yield scrapy.Request(
+                f"{BASE_URL}/{categoria}",
+                callback=self.parse,
+                cb_kwargs={"categoria": categoria},
+            )
+
+    def parse(self, response, categoria):
+        for card in response.css(".product-item__box"):
+            preco = card.css(".product-item__new-price span::text").get()
+            url = card.css("a.product-item__name::attr(href)").get()
+            if not preco or not url:
+                continue
+            url = response.urljoin(url)
+            sku_match = re.search(r"/produto/([^/]+)", url)
+            yield response.follow(
+                url,
+                callback=self.parse_product,
+                cb_kwargs={
+                    "listing": {
+                        "sku": sku_match.group(1) if sku_match else "N/A",
+                        "nome": (
+                            card.css(".product-item__name h2::text").get() or "N/A"
+                        ).strip(),
+                        "preco": preco.strip(),
+                        "url": url,
+                        "tipo_produto": categoria,
+                    },
+                },
+            )
+
+    def parse_product(self, response, listing):
+        descricao = ""
+        for selector in (
+            "div.descricao section.bg_branco p",
+            "div.descricao section.bg_preto p",
+            "div.descricao section.bg_preto div[style*='margin'] *",
+        ):
+            descricao = " ".join(
+                text.strip()
+                for text in response.css(f"{selector} ::text").getall()
+                if text.strip()
+            )
+            if descricao:
+                break
+
+        tecnica = {}
+        for paragraph in response.css("div.tecnicas > p"):
+            text = re.sub(r"\s+", " ", " ".join(paragraph.css("::text").getall()))
+            text = text.strip()
+            if not text:
+                continue
+            if ":" in text:
+                key, val = text.split(":", 1)
+                tecnica[key.strip()] = val.strip().strip('"')
+            else:
+                tecnica[text] = ""
+
+        yield StoreProductItem(
+            loja="Terabyte",
+            **listing,
+            descricao=descricao.strip(),
+            tecnica=tecnica,
+            imagem=(
+                response.css("img.zoomImg::attr(src)").get()
+                or response.css("meta[property='og:image']::attr(content)").get()
+                or ""
+            ),
+        )
@@ -1,20 +1,65 @@
 import asyncio
-import json
+import contextlib
 import os
 import re
 import time
 import urllib.parse
+from functools import partial
 
 from playwright.async_api import async_playwright
 
+from track_save.webscraping.scrapers.browser_pool import ContextPool
+from track_save.webscraping.scrapers.browser_pool import DomainThrottle
+from track_save.webscraping.scrapers.page_archive import ArchiveRouter
+from track_save.webscraping.scrapers.page_archive import FixtureServer
+from track_save.webscraping.scrapers.request_filter import ResourceBlocker
+from track_save.webscraping.scrapers.result_writer import RESULT_SUFFIX
+from track_save.webscraping.scrapers.result_writer import ResultWriter
+from track_save.webscraping.scrapers.result_writer import iter_written
+from track_save.webscraping.scrapers.sinks import default_sink
+from track_save.webscraping.scrapers.waiting import WaitStats
+from track_save.webscraping.scrapers.waiting import wait_for_any_async
+from track_save.webscraping.scrapers.waiting import wait_gone_async
+from track_save.webscrapping_amazon.scraper.armazena_tera_amazon import ingest_records
+
 AMAZON = "https://www.amazon.com.br/s?k="
 OUTPUT_DIR = "resultados_amazon"
 OUTPUT_DIR_TERA = "resultados_terabyte"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR_TERA, exist_ok=True)
+# Listagens de cada execução, gravadas à medida que são coletadas e lidas de
+# volta, uma a uma, pela etapa de detalhes
+AMAZON_LISTING = os.path.join(OUTPUT_DIR, f"amazon_produtos{RESULT_SUFFIX}")
+TERABYTE_LISTING = os.path.join(OUTPUT_DIR_TERA, f"terabyte_produtos{RESULT_SUFFIX}")
+
+# Bloqueio de imagens/fontes/mídia e domínios de terceiros, com contadores por loja
+# A Terabyte mantém imagens: o img.zoomImg só é criado depois que a foto carrega
+terabyte_blocker = ResourceBlocker.for_store("terabyte", blocked_types={"media", "font"})
+amazon_blocker = ResourceBlocker.for_store("amazon")
+# Latência das esperas (Terabyte e Amazon)
+wait_stats = WaitStats()
+
+# Um único Chromium para a execução toda, com um pool de contextos por loja.
+# Páginas em paralelo por loja e intervalo mínimo (s) entre navegações por domínio
+AMAZON_CONCURRENCY = 3
+TERABYTE_CONCURRENCY = 4
+POLITENESS_DELAYS = {
+    "www.amazon.com.br": 1.0,
+    "www.terabyteshop.com.br": 0.25,
+}
+TERABYTE_CONTEXT = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36",
+}
+throttle = DomainThrottle(POLITENESS_DELAYS)
 
-banco_produtos_terabyte = []
-banco_produtos_amazon = []
+REMOVE_BANNER_POP = """
+    () => {
+        const banner = document.getElementById('bannerPop');
+        if (banner) banner.remove();
+        document.querySelectorAll('.modal-backdrop, .fade.in').forEach(e => e.remove());
+    }
+"""
 
 produtos_terabyte = {
     "teclado": "perifericos/teclado",
@@ -25,132 +70,120 @@ produtos_terabyte = {
 }
 
 
-async def scrape_terabyte(termo_pesquisa):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
+async def scrape_terabyte(page, termo_pesquisa, writer, throttle=throttle):
+    try:
+        print("🛒 Acessando Terabyte Shop...")
+        await throttle.goto(
+            page,
+            f"https://www.terabyteshop.com.br/{termo_pesquisa}",
+            timeout=60000,
         )
-        page = await context.new_page()
 
-        try:
-            print("🛒 Acessando Terabyte Shop...")
-            await page.goto(
-                f"https://www.terabyteshop.com.br/{termo_pesquisa}", timeout=60000
-            )
+        print("⏳ Aguardando carregamento dos produtos...")
+        await wait_for_any_async(
+            [page.locator(".product-item__box")],
+            timeout=30000,
+            stats=wait_stats,
+            name="terabyte.listing",
+        )
 
-            print("⏳ Aguardando carregamento dos produtos...")
-            await page.wait_for_selector(".product-item__box", timeout=30000)
+        print("🔄 Rolando página para carregar mais produtos...")
+        await page.evaluate("""
+            window.scrollTo(0, document.body.scrollHeight);
+            setTimeout(() => window.scrollTo(0, 0), 500);
+        """)
+        # Espera o lazy-load disparado pela rolagem em vez de 2 s fixos
+        with contextlib.suppress(Exception):
+            await page.wait_for_load_state("networkidle", timeout=5000)
 
-            print("🔄 Rolando página para carregar mais produtos...")
-            await page.evaluate("""
-                window.scrollTo(0, document.body.scrollHeight);
-                setTimeout(() => window.scrollTo(0, 0), 500);
-            """)
-            await asyncio.sleep(2)
+        print("🔍 Coletando dados dos produtos...")
+        total = 0
+        items = await page.query_selector_all(".product-item__box")
+        print(f"✅ Encontrados {len(items)} produtos na página inicial")
 
-            print("🔍 Coletando dados dos produtos...")
-            produtos = []
-            items = await page.query_selector_all(".product-item__box")
-            print(f"✅ Encontrados {len(items)} produtos na página inicial")
+        for item in items:
+            try:
+                nome_element = await item.query_selector(".product-item__name h2")
+                nome = await nome_element.inner_text() if nome_element else "N/A"
 
-            for item in items:
-                try:
-                    nome_element = await item.query_selector(".product-item__name h2")
-                    nome = await nome_element.inner_text() if nome_element else "N/A"
+                preco_element = await item.query_selector(
+                    ".product-item__new-price span"
+                )
+                preco = await preco_element.inner_text() if preco_element else "N/A"
 
-                    preco_element = await item.query_selector(
-                        ".product-item__new-price span"
-                    )
-                    preco = await preco_element.inner_text() if preco_element else "N/A"
+                url_element = await item.query_selector("a.product-item__name")
+                url = (
+                    await url_element.get_attribute("href")
+                    if url_element
+                    else "N/A"
+                )
 
-                    url_element = await item.query_selector("a.product-item__name")
-                    url = (
-                        await url_element.get_attribute("href")
-                        if url_element
-                        else "N/A"
+                sku = "N/A"
+                if url and "produto/" in url:
+                    with contextlib.suppress(IndexError):
+                        sku = url.split("/produto/")[1].split("/")[0]
+
+                promo_element = await item.query_selector(".product-item__labels")
+                promocao = "Sim" if promo_element else "Não"
+
+                if url and not url.startswith("http"):
+                    url = "https://www.terabyteshop.com.br" + url
+                if preco.strip() != "N/A":
+                    writer.write(
+                        {
+                            "sku": sku,
+                            "nome": nome.strip(),
+                            "preco": preco.strip(),
+                            "url": url if url else "N/A",
+                            "promocao": promocao,
+                            "tipo_produto": termo_pesquisa,
+                        }
                     )
+                    total += 1
+            except Exception as e:
+                print(f"⚠️ Erro em um produto: {str(e)}")
+                continue
 
-                    sku = "N/A"
-                    if url and "produto/" in url:
-                        try:
-                            sku = url.split("/produto/")[1].split("/")[0]
-                        except:
-                            pass
-
-                    promo_element = await item.query_selector(".product-item__labels")
-                    promocao = "Sim" if promo_element else "Não"
-
-                    if url and not url.startswith("http"):
-                        url = "https://www.terabyteshop.com.br" + url
-                    if preco.strip() != "N/A":
-                        produtos.append(
-                            {
-                                "sku": sku,
-                                "nome": nome.strip(),
-                                "preco": preco.strip(),
-                                "url": url if url else "N/A",
-                                "promocao": promocao,
-                                "tipo_produto": termo_pesquisa,
-                            }
-                        )
-                except Exception as e:
-                    print(f"⚠️ Erro em um produto: {str(e)}")
-                    continue
-
-            banco_produtos_terabyte.extend(produtos)
-
-            if "/" in termo_pesquisa:
-                termo_pesquisa = termo_pesquisa.split("/")[1]
-            filename = f"terabyte_produtos_{termo_pesquisa}.json"
-            output_path = os.path.join(OUTPUT_DIR_TERA, filename)
-
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(produtos, f, ensure_ascii=False, indent=2)
-
-            print(f"\n✅ Sucesso! {len(produtos)} produtos salvos em '{filename}'")
-            return filename
-
-        except Exception as e:
-            print(f"\n❌ Erro durante scraping: {str(e)}")
-            return None
+        print(f"\n✅ Sucesso! {total} produtos de '{termo_pesquisa}' gravados")
+        return total
 
-        finally:
-            await browser.close()
+    except Exception as e:
+        print(f"\n❌ Erro durante scraping: {str(e)}")
+        return None
 
 
-async def scrape_amazon(url: str, termo):
+async def scrape_amazon(page, url: str, termo, throttle=throttle):
     produtos = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url)
-
-        items = await page.query_selector_all("a.s-no-outline")
-
-        for item in items:
-            href = await item.get_attribute("href")
-            nome = await item.query_selector("img")
-            nome_texto = await nome.get_attribute("alt") if nome else ""
-
-            preco_element = await item.query_selector("span.a-price span.a-offscreen")
-            preco = await preco_element.inner_text() if preco_element else ""
-
-            nota_element = await item.query_selector("span.a-icon-alt")
-            nota = await nota_element.inner_text() if nota_element else ""
-            if "cooler" not in nome_texto.lower() and "captura" not in nome_texto.lower() and "suporte" not in nome_texto.lower():
-                produtos.append(
-                    {
-                        "url": "https://www.amazon.com.br" + href if href else "",
-                        "name": nome_texto,
-                        "price": preco,
-                        "rating": nota[:3] if nota else "",
-                        "tipo_produto": termo,
-                    }
-                )
+    await throttle.goto(page, url)
+    await wait_for_any_async(
+        [page.locator("a.s-no-outline")],
+        stats=wait_stats,
+        name="amazon.search",
+    )
+
+    items = await page.query_selector_all("a.s-no-outline")
+
+    for item in items:
+        href = await item.get_attribute("href")
+        nome = await item.query_selector("img")
+        nome_texto = await nome.get_attribute("alt") if nome else ""
+
+        preco_element = await item.query_selector("span.a-price span.a-offscreen")
+        preco = await preco_element.inner_text() if preco_element else ""
+
+        nota_element = await item.query_selector("span.a-icon-alt")
+        nota = await nota_element.inner_text() if nota_element else ""
+        if "cooler" not in nome_texto.lower() and "captura" not in nome_texto.lower() and "suporte" not in nome_texto.lower():
+            produtos.append(
+                {
+                    "url": "https://www.amazon.com.br" + href if href else "",
+                    "name": nome_texto,
+                    "price": preco,
+                    "rating": nota[:3] if nota else "",
+                    "tipo_produto": termo,
+                }
+            )
 
-        await browser.close()
     return produtos
 
 
@@ -167,285 +200,403 @@ def montar_url(termo_pesquisa):
     return urllib.parse.quote(termo_pesquisa, safe="")
 
 
-async def search():
-    todos_amazon = []
+async def search(amazon_pool, terabyte_pool, throttle=throttle):
+    """
+    Buscas da Amazon (2 páginas por termo) e listagens da Terabyte em paralelo,
+    limitadas pelo tamanho de cada pool e pelo intervalo mínimo por domínio.
+    Os produtos de cada listagem são gravados em AMAZON_LISTING e
+    TERABYTE_LISTING assim que coletados (os arquivos são recriados a cada
+    execução).
+    """
+    buscas = []
     for termo in lista_produtos:
         for page_num in range(1, 3):
             url = f"{AMAZON}{montar_url(termo)}&page={page_num}"
             print(f"[+] Buscando: {url}")
-            resultados = await scrape_amazon(url,termo)
-            if resultados:
-                todos_amazon.extend(resultados)
-            await asyncio.sleep(1)
-
-        if todos_amazon:
-            filename = f"amazon_{termo}.json"
-            path = os.path.join(OUTPUT_DIR, filename)
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(todos_amazon, f, ensure_ascii=False, indent=2)
-            print(f"✅ Amazon: {len(todos_amazon)} produtos salvos em {filename}")
-            banco_produtos_amazon.extend(todos_amazon)
-            todos_amazon.clear()
-
-        await scrape_terabyte(produtos_terabyte[termo])
-
-
-async def scrape_amazon_product(url, termo):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url)
-
-        # 1) Botão "Continuar comprando"
-        try:
-            continuar_btn = page.locator("button.a-button-text", has_text="Continuar comprando")
-            if await continuar_btn.is_visible():
-                await continuar_btn.click()
-                await page.wait_for_timeout(1000)
-        except Exception:
-            pass
-
-        # 2) Expande todas as seções colapsáveis (Características, Especificações etc.)
-        try:
-            expanders = page.locator("a.a-expander-header")
-            count = await expanders.count()
-            for i in range(count):
-                expander = expanders.nth(i)
-                if await expander.is_visible():
-                    aria = await expander.get_attribute("aria-expanded")
-                    if aria in (None, "false"):
-                        await expander.click()
-                        await page.wait_for_timeout(500)
-        except Exception:
-            pass
-
-        # 3) Título
-        try:
-            await page.wait_for_selector("#productTitle", timeout=15000)
-            nome = (await page.locator("#productTitle").inner_text()).strip()
-        except Exception:
-            nome = ""
-
-        # 4) Preço
-        try:
-            preco = await page.locator(".a-price .a-offscreen").first.inner_text()
-        except Exception:
-            preco = "Preço não encontrado"
-
-        # 5) Nota
-        try:
-            nota = await page.locator("span.a-icon-alt").first.inner_text()
-        except Exception:
-            nota = "Sem nota"
-
-        # 6) Descrição curta
-        try:
-            descricao_curta = await page.locator("#feature-bullets").inner_text()
-        except Exception:
-            descricao_curta = "Descrição curta não encontrada"
+            buscas.append((url, termo))
+
+    # Cada página de busca da Amazon é gravada assim que termina
+    amazon_writer = ResultWriter(AMAZON_LISTING)
+    terabyte_writer = ResultWriter(TERABYTE_LISTING)
+
+    async def buscar_amazon(page, busca):
+        url, termo = busca
+        resultados = await scrape_amazon(page, url, termo, throttle)
+        for produto in resultados:
+            amazon_writer.write(produto)
+        print(f"✅ Amazon: {len(resultados)} produtos de {url}")
+
+    async def listar_terabyte(page, termo_pesquisa):
+        return await scrape_terabyte(
+            page,
+            termo_pesquisa,
+            terabyte_writer,
+            throttle,
+        )
 
-        # 7) Descrição detalhada
+    try:
+        resultados_amazon, _ = await asyncio.gather(
+            amazon_pool.map(buscar_amazon, buscas),
+            terabyte_pool.map(
+                listar_terabyte,
+                [produtos_terabyte[termo] for termo in lista_produtos],
+            ),
+        )
+    finally:
+        amazon_writer.close()
+        terabyte_writer.close()
+
+    for (url, _termo), resultado in zip(buscas, resultados_amazon, strict=True):
+        if isinstance(resultado, Exception):
+            print(f"⚠️ Erro na busca {url}: {resultado}")
+
+
+async def scrape_amazon_product(page, url, termo, throttle=throttle):
+    await throttle.goto(page, url)
+
+    # 1) Botão "Continuar comprando"
+    try:
+        continuar_btn = page.locator("button.a-button-text", has_text="Continuar comprando")
+        if await continuar_btn.is_visible():
+            await continuar_btn.click()
+            await wait_gone_async(
+                continuar_btn,
+                timeout=5000,
+                stats=wait_stats,
+                name="amazon.continuar",
+            )
+    except Exception:
+        pass
+
+    # 2) Expande todas as seções colapsáveis (Características, Especificações etc.)
+    try:
+        expanders = page.locator("a.a-expander-header")
+        count = await expanders.count()
+        for i in range(count):
+            expander = expanders.nth(i)
+            if await expander.is_visible():
+                aria = await expander.get_attribute("aria-expanded")
+                if aria in (None, "false"):
+                    await expander.click()
+    except Exception:
+        pass
+
+    # 3) Título
+    try:
+        titulo = await wait_for_any_async(
+            [page.locator("#productTitle")],
+            timeout=15000,
+            stats=wait_stats,
+            name="amazon.title",
+        )
+        nome = (await titulo.inner_text()).strip() if titulo else ""
+    except Exception:
+        nome = ""
+
+    # 4) Preço
+    try:
+        preco = await page.locator(".a-price .a-offscreen").first.inner_text()
+    except Exception:
+        preco = "Preço não encontrado"
+
+    # 5) Nota
+    try:
+        nota = await page.locator("span.a-icon-alt").first.inner_text()
+    except Exception:
+        nota = "Sem nota"
+
+    # 6) Descrição curta
+    try:
+        descricao_curta = await page.locator("#feature-bullets").inner_text()
+    except Exception:
+        descricao_curta = "Descrição curta não encontrada"
+
+    # 7) Descrição detalhada
+    try:
+        descricao_detalhada = await page.locator("#productDescription").inner_text()
+    except Exception:
+        descricao_detalhada = "Descrição detalhada não encontrada"
+
+    # 8) Descrição técnica (Especificações Técnicas)
+    try:
+        descricao_tecnica = {}
+        tech_rows = page.locator("table#productDetails_techSpec_section_1 tr")
+        tech_count = await tech_rows.count()
+        for i in range(tech_count):
+            key = (await tech_rows.nth(i).locator("th").inner_text()).strip()
+            val = (await tech_rows.nth(i).locator("td").inner_text()).strip()
+            descricao_tecnica[key] = val
+    except Exception:
+        # fallback para outro layout de specs
         try:
-            descricao_detalhada = await page.locator("#productDescription").inner_text()
+            texto = await page.locator("div#productDetails_detailBullets_sections1").inner_text()
+            descricao_tecnica = {"técnica_unificada": texto.strip()}
         except Exception:
-            descricao_detalhada = "Descrição detalhada não encontrada"
-
-        # 8) Descrição técnica (Especificações Técnicas)
-        try:
             descricao_tecnica = {}
-            tech_rows = page.locator("table#productDetails_techSpec_section_1 tr")
-            tech_count = await tech_rows.count()
-            for i in range(tech_count):
-                key = (await tech_rows.nth(i).locator("th").inner_text()).strip()
-                val = (await tech_rows.nth(i).locator("td").inner_text()).strip()
-                descricao_tecnica[key] = val
-        except Exception:
-            # fallback para outro layout de specs
-            try:
-                texto = await page.locator("div#productDetails_detailBullets_sections1").inner_text()
-                descricao_tecnica = {"técnica_unificada": texto.strip()}
-            except Exception:
-                descricao_tecnica = {}
 
-        # 9) Detalhes adicionais (tabela a-keyvalue prodDetTable)
+    # 9) Detalhes adicionais (tabela a-keyvalue prodDetTable)
+    detalhes = {}
+    try:
+        linhas = page.locator("table.a-keyvalue.prodDetTable tbody tr")
+        count = await linhas.count()
+        for i in range(count):
+            th = linhas.nth(i).locator("th")
+            td = linhas.nth(i).locator("td")
+            chave = (await th.inner_text()).strip()
+            valor = (await td.inner_text()).strip()
+            detalhes[chave] = valor
+    except Exception:
         detalhes = {}
-        try:
-            linhas = page.locator("table.a-keyvalue.prodDetTable tbody tr")
-            count = await linhas.count()
-            for i in range(count):
-                th = linhas.nth(i).locator("th")
-                td = linhas.nth(i).locator("td")
-                chave = (await th.inner_text()).strip()
-                valor = (await td.inner_text()).strip()
-                detalhes[chave] = valor
-        except Exception:
-            detalhes = {}
-
-        # 10) Imagem principal
-        try:
-            imagem = await page.locator("img#landingImage").get_attribute("src")
-        except Exception:
-            imagem = ""
-
-        await browser.close()
-
-        # Monta e retorna o dicionário final
-        if nome:
-            return {
-                "nome": nome,
-                "preco": preco,
-                "nota": nota,
-                "descricao_curta": descricao_curta,
-                "descricao_detalhada": descricao_detalhada,
-                "descricao_tecnica": descricao_tecnica,
-                "detalhes_adicionais": detalhes,
-                "url": url,
-                "tipo_produto": termo,
-                "imagem": imagem
-            }
-        return None
-
 
-async def search_details_amazon():
-    output = []
-    for produto in banco_produtos_amazon:
-        results = await scrape_amazon_product(produto["url"], produto["tipo_produto"])
-        output.append(results)
-
-    filename = "amazon_perfeito.json"
-    path = os.path.join(OUTPUT_DIR, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    print(f"✅ Amazon: {len(output)} produtos salvos em {filename}")
-
-
-async def get_product_details(url):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36",
-            viewport={"width": 1280, "height": 800},
+    # 10) Imagem principal
+    try:
+        imagem = await page.locator("img#landingImage").get_attribute("src")
+    except Exception:
+        imagem = ""
+
+    # Monta e retorna o dicionário final
+    if nome:
+        return {
+            "nome": nome,
+            "preco": preco,
+            "nota": nota,
+            "descricao_curta": descricao_curta,
+            "descricao_detalhada": descricao_detalhada,
+            "descricao_tecnica": descricao_tecnica,
+            "detalhes_adicionais": detalhes,
+            "url": url,
+            "tipo_produto": termo,
+            "imagem": imagem
+        }
+    return None
+
+
+def details_writer(output_dir, loja, sink):
+    """
+    Writer dos produtos detalhados de uma loja (ex.: amazon_perfeito.ndjson.gz):
+    cada produto é gravado assim que fica pronto e, em lotes já convertidos
+    por ingest_records, enviado ao sink durante a coleta.
+    """
+    return ResultWriter(
+        os.path.join(output_dir, f"{loja}_perfeito{RESULT_SUFFIX}"),
+        sink=sink,
+        transform=partial(ingest_records, loja),
+    )
+
+
+async def search_details_amazon(pool, sink, throttle=throttle):
+    writer = details_writer(OUTPUT_DIR, "amazon", sink)
+
+    async def detalhar(page, produto):
+        result = await scrape_amazon_product(
+            page,
+            produto["url"],
+            produto["tipo_produto"],
+            throttle,
         )
-        page = await context.new_page()
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(2000)
-
-        try:
-            await page.wait_for_selector("#bannerPop", timeout=5000)
-            await page.evaluate("""
-                () => {
-                    const banner = document.getElementById('bannerPop');
-                    if (banner) banner.remove();
-                    document.querySelectorAll('.modal-backdrop, .fade.in').forEach(e => e.remove());
-                }
-            """)
-        except:
-            pass
+        if result is not None:
+            # write() pode enviar um lote ao sink: fora do event loop
+            await asyncio.to_thread(writer.write, result)
+
+    try:
+        failures = await pool.each(detalhar, iter_written(AMAZON_LISTING))
+    finally:
+        await asyncio.to_thread(writer.close)
+    for produto, error in failures:
+        print(produto["url"])
+        print(error)
+    print(f"✅ Amazon: {writer.count} produtos detalhados, enviados: {dict(writer.summary)}")
+
+
+async def get_product_details(page, url, throttle=throttle):
+    # O popup pode surgir a qualquer momento: o Playwright o remove antes
+    # de cada ação em vez de esperarmos por ele com tempo fixo
+    async def remove_banner_pop():
+        await page.evaluate(REMOVE_BANNER_POP)
+
+    await page.add_locator_handler(page.locator("#bannerPop"), remove_banner_pop)
+    await throttle.goto(page, url, timeout=60000)
+    await wait_for_any_async(
+        [page.locator('a[href="#esptec"]'), page.locator("div.tecnicas")],
+        timeout=20000,
+        stats=wait_stats,
+        name="terabyte.product_page",
+    )
+    with contextlib.suppress(Exception):
+        await page.evaluate(REMOVE_BANNER_POP)
+
+    try:
+        await page.evaluate(
+            "document.querySelector('a[href=\"#esptec\"]').scrollIntoView()"
+        )
+        await page.click('a[href="#esptec"]')
+    except:
+        pass
 
+    try:
+        await page.evaluate(
+            "document.querySelector('a[href=\"#cg\"]').scrollIntoView()"
+        )
+        await page.click('a[href="#cg"]')
+        await wait_for_any_async(
+            [page.locator("div#cg")],
+            stats=wait_stats,
+            name="terabyte.descricao",
+        )
+    except:
+        pass
+
+    descricao = ""
+    try:
+        el = await page.query_selector("div.descricao section.bg_branco p")
+        if el:
+            descricao = await el.inner_text()
+    except:
+        pass
+
+    if not descricao:
         try:
-            await page.evaluate(
-                "document.querySelector('a[href=\"#esptec\"]').scrollIntoView()"
-            )
-            await page.click('a[href="#esptec"]')
+            el = await page.query_selector("div.descricao section.bg_preto p")
+            if el:
+                descricao = await el.inner_text()
         except:
             pass
 
+    if not descricao:
         try:
-            await page.evaluate(
-                "document.querySelector('a[href=\"#cg\"]').scrollIntoView()"
+            el = await page.query_selector(
+                "div.descricao section.bg_preto div[style*='margin']"
             )
-            await page.click('a[href="#cg"]')
-            await page.wait_for_selector("div#cg", state="visible", timeout=10000)
-        except:
-            pass
-
-        descricao = ""
-        try:
-            el = await page.query_selector("div.descricao section.bg_branco p")
             if el:
-                descricao = await el.inner_text()
-        except:
-            pass
-
-        if not descricao:
-            try:
-                el = await page.query_selector("div.descricao section.bg_preto p")
-                if el:
-                    descricao = await el.inner_text()
-            except:
-                pass
-
-        if not descricao:
-            try:
-                el = await page.query_selector(
-                    "div.descricao section.bg_preto div[style*='margin']"
+                textos = await page.eval_on_selector_all(
+                    "div.descricao section.bg_preto div[style*='margin'] *",
+                    "elements => elements.map(e => e.innerText).filter(Boolean).join(' ')",
                 )
-                if el:
-                    textos = await page.eval_on_selector_all(
-                        "div.descricao section.bg_preto div[style*='margin'] *",
-                        "elements => elements.map(e => e.innerText).filter(Boolean).join(' ')",
-                    )
-                    descricao = textos
-            except:
-                pass
-
-        specs_dict = {}
-        try:
-            await page.wait_for_selector("div.tecnicas", timeout=20000)
-            p_tags = await page.query_selector_all("div.tecnicas > p")
-            for ptag in p_tags:
-                text = await ptag.inner_text()
-                text = re.sub(r"\s+", " ", text).strip()
-                if not text:
-                    continue
-
-                if ":" in text:
-                    parts = text.split(":", 1)
-                    key = parts[0].strip()
-                    val = parts[1].strip().strip('"')
-                    specs_dict[key] = val
-                else:
-                    specs_dict[text] = ""
+                descricao = textos
         except:
             pass
 
-        image_url = ""
+    specs_dict = {}
+    try:
+        await wait_for_any_async(
+            [page.locator("div.tecnicas")],
+            timeout=20000,
+            state="attached",
+            stats=wait_stats,
+            name="terabyte.tecnicas",
+        )
+        p_tags = await page.query_selector_all("div.tecnicas > p")
+        for ptag in p_tags:
+            text = await ptag.inner_text()
+            text = re.sub(r"\s+", " ", text).strip()
+            if not text:
+                continue
+
+            if ":" in text:
+                parts = text.split(":", 1)
+                key = parts[0].strip()
+                val = parts[1].strip().strip('"')
+                specs_dict[key] = val
+            else:
+                specs_dict[text] = ""
+    except:
+        pass
+
+    image_url = ""
+    try:
+        img_element = await page.query_selector("img.zoomImg")
+        if img_element:
+            image_url = await img_element.get_attribute("src")
+    except:
+        pass
+
+    return descricao.strip(), specs_dict, image_url
+
+
+async def search_details(pool, sink, throttle=throttle):
+    writer = details_writer(OUTPUT_DIR_TERA, "terabyte", sink)
+
+    async def detalhar(page, produto):
+        desc, esp, img = await get_product_details(page, produto["url"], throttle)
+        produto["descricao"] = desc
+        produto["tecnica"] = esp
+        produto["imagem"] = img
+        # write() pode enviar um lote ao sink: fora do event loop
+        await asyncio.to_thread(writer.write, produto)
+
+    try:
+        failures = await pool.each(detalhar, iter_written(TERABYTE_LISTING))
+    finally:
+        await asyncio.to_thread(writer.close)
+    for produto, error in failures:
+        print(produto["url"])
+        print(error)
+    print(f"✅ Terabyte: {writer.count} produtos detalhados, enviados: {dict(writer.summary)}")
+
+
+async def main(archive=None, archive_mode="replay", sink=None):
+    """
+    Coleta completa (buscas e detalhes) da Terabyte e da Amazon.
+
+    Com um PageArchive, as páginas são gravadas nele (archive_mode="record")
+    ou servidas dele por um FixtureServer local ("replay"), sem acessar as
+    lojas. Retorna {loja: ArchiveRouter} (vazio sem archive), usado pelo
+    benchmark para contar as páginas.
+    """
+    # API remota (SCRAPER_API_URL) ou ORM, conforme o processo; ver default_sink
+    sink = sink or default_sink()
+    blockers = {"terabyte": terabyte_blocker, "amazon": amazon_blocker}
+    server = None
+    routers = {}
+    run_throttle = throttle
+    if archive is not None:
+        if archive_mode == "replay":
+            server = FixtureServer(archive).start()
+            # Offline não há loja para poupar: sem intervalo entre navegações,
+            # só nesta execução (o throttle do módulo continua valendo)
+            run_throttle = DomainThrottle()
+        routers = {
+            loja: ArchiveRouter(
+                archive,
+                archive_mode,
+                blocker=blocker,
+                server=server,
+                tags={"store": loja},
+            )
+            for loja, blocker in blockers.items()
+        }
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
         try:
-            img_element = await page.query_selector("img.zoomImg")
-            if img_element:
-                image_url = await img_element.get_attribute("src")
-        except:
-            pass
-
-        await browser.close()
-        return descricao.strip(), specs_dict, image_url
-
-
-async def search_details():
-    if banco_produtos_terabyte:
-        for produto in banco_produtos_terabyte:
-            try:
-                desc, esp, img = await get_product_details(produto["url"])
-                produto["descricao"] = desc
-                produto["tecnica"] = esp
-                produto["imagem"] = img
-                print(desc)
-            except Exception as e:
-                print(produto["url"])
-                print(e)
-
-    filename = "terabyte_perfeito.json"
-    path = os.path.join(OUTPUT_DIR_TERA, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(banco_produtos_terabyte, f, ensure_ascii=False, indent=2)
-    print(f"✅ Terabyte: {len(banco_produtos_terabyte)} produtos salvos em {filename}")
-
-
-async def main():
-    await search()
-    print("buscar detalhes")
-    await search_details()
-    await search_details_amazon()
+            amazon_pool = ContextPool(
+                browser,
+                size=AMAZON_CONCURRENCY,
+                blocker=routers.get("amazon", amazon_blocker),
+            )
+            terabyte_pool = ContextPool(
+                browser,
+                size=TERABYTE_CONCURRENCY,
+                blocker=routers.get("terabyte", terabyte_blocker),
+                context_options=TERABYTE_CONTEXT,
+            )
+            async with amazon_pool, terabyte_pool:
+                await search(amazon_pool, terabyte_pool, run_throttle)
+                print("buscar detalhes")
+                await asyncio.gather(
+                    search_details(terabyte_pool, sink, run_throttle),
+                    search_details_amazon(amazon_pool, sink, run_throttle),
+                )
+        finally:
+            await browser.close()
+            sink.close()
+            if server is not None:
+                server.stop()
+    terabyte_blocker.print_summary("Terabyte")
+    amazon_blocker.print_summary("Amazon")
+    for loja, router in routers.items():
+        router.print_summary(loja.capitalize())
+    wait_stats.print_summary()
+    return routers
 
 
 if __name__ == "__main__":